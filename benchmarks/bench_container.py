@@ -0,0 +1,81 @@
+"""
+요청마다 객체를 새로 만드는 방식(Factory)과 앱 수명 동안 재사용하는 방식(Resource/Singleton)의
+요청당 오버헤드 비교
+
+사용법:
+    python -m benchmarks.bench_container --requests 200
+"""
+import argparse
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+from langchain_openai import OpenAIEmbeddings
+
+from llm.model import llm
+from llm.recommend import QueryInfoExtractor
+from llm.vector_store import VectorStoreManager
+
+QUERY = "Python 백엔드 개발자"
+
+
+def build_per_request(persist_directory: str):
+    """기존 Factory 방식: 요청마다 임베딩 클라이언트, Chroma, 파서 체인 생성"""
+    embeddings = OpenAIEmbeddings(openai_api_key=os.getenv("OPENAI_API_KEY", "sk-benchmark"))
+    vector_store_manager = VectorStoreManager(embeddings=embeddings, persist_directory=persist_directory)
+    query_info_extractor = QueryInfoExtractor(llm=llm)
+    return vector_store_manager, query_info_extractor
+
+
+def serve(vector_store_manager: VectorStoreManager):
+    """요청 하나에 해당하는 작업. 임베딩 API 호출이 없도록 BM25 검색만 사용"""
+    vector_store_manager.count()
+    vector_store_manager.search_resumes(QUERY, mode="lexical")
+
+
+def percentile(samples: list[float], q: float) -> float:
+    return statistics.quantiles(samples, n=100)[int(q) - 1]
+
+
+def run(requests: int, source_directory: str) -> dict:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        persist_directory = os.path.join(tmp_dir, "db")
+        shutil.copytree(source_directory, persist_directory)
+
+        per_request = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            vector_store_manager, _ = build_per_request(persist_directory)
+            serve(vector_store_manager)
+            per_request.append((time.perf_counter() - start) * 1000)
+
+        vector_store_manager, _ = build_per_request(persist_directory)
+        vector_store_manager.warm_up()
+        # 첫 검색에서 생기는 BM25/메타데이터 비트맵 동기화가 측정에 들어가지 않도록 타이머 전에 한 번 검색
+        serve(vector_store_manager)
+        reused = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            serve(vector_store_manager)
+            reused.append((time.perf_counter() - start) * 1000)
+        vector_store_manager.close()
+
+    return {
+        "per_request_p50_ms": statistics.median(per_request),
+        "per_request_p95_ms": percentile(per_request, 95),
+        "reused_p50_ms": statistics.median(reused),
+        "reused_p95_ms": percentile(reused, 95),
+    }
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="컨테이너 객체 재사용 벤치마크")
+    arg_parser.add_argument("--requests", type=int, default=200)
+    arg_parser.add_argument("--db", default="db", help="복사해서 사용할 Chroma 디렉토리")
+    args = arg_parser.parse_args()
+
+    result = run(args.requests, args.db)
+    for key, value in result.items():
+        print(f"{key}: {value:.2f}")
@@ -0,0 +1,82 @@
+"""
+pdf_data/ 이력서 PDF를 백엔드별로 파싱해 처리량과 페이지별 소요 시간 비교
+
+설치되지 않은 백엔드(pypdfium2, pymupdf)는 건너뛴다.
+
+사용법:
+    python -m benchmarks.bench_pdf_parse --directory pdf_data --workers 4 --output parse.json
+"""
+import argparse
+import glob
+import json
+import os
+import statistics
+import time
+
+from preprocess.pdf_engine import PDF_BACKENDS, ParallelPDFParser
+
+
+def percentile(samples: list[float], q: float) -> float:
+    if len(samples) < 2:
+        return samples[0] if samples else 0.0
+    return statistics.quantiles(samples, n=100)[int(q) - 1]
+
+
+def run_backend(backend: str, file_paths: list[str], workers: int, max_pages: int) -> dict:
+    parser = ParallelPDFParser(backend=backend, workers=workers, max_pages=max_pages)
+    try:
+        # 프로세스 풀 시작 비용은 제외
+        parser.parse_pdf(file_paths[0])
+
+        document_ms, page_ms, pages, failed_pages, characters = [], [], 0, 0, 0
+        start = time.perf_counter()
+        for file_path in file_paths:
+            documents, report = parser.parse_with_report(file_path)
+            document_ms.append(report.elapsed_ms)
+            page_ms.extend(page.elapsed_ms for page in report.pages)
+            pages += len(report.pages)
+            failed_pages += len(report.failed_pages)
+            characters += sum(len(doc.page_content) for doc in documents)
+        elapsed = time.perf_counter() - start
+    finally:
+        parser.close()
+
+    return {
+        "documents": len(file_paths),
+        "pages": pages,
+        "failed_pages": failed_pages,
+        "characters": characters,
+        "pages_per_second": pages / elapsed,
+        "document_p50_ms": statistics.median(document_ms),
+        "document_p95_ms": percentile(document_ms, 95),
+        "page_p50_ms": statistics.median(page_ms),
+        "page_p95_ms": percentile(page_ms, 95),
+        "page_max_ms": max(page_ms),
+    }
+
+
+def run(directory: str, backends: list[str], workers: int, max_pages: int) -> dict:
+    file_paths = sorted(glob.glob(os.path.join(directory, "*.pdf")))
+    results = {}
+    for backend in backends:
+        try:
+            results[backend] = run_backend(backend, file_paths, workers, max_pages)
+        except ImportError as e:
+            results[backend] = {"skipped": str(e)}
+    return results
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="PDF 파서 백엔드 벤치마크")
+    arg_parser.add_argument("--directory", default="pdf_data")
+    arg_parser.add_argument("--backends", nargs="+", default=list(PDF_BACKENDS))
+    arg_parser.add_argument("--workers", type=int, default=4)
+    arg_parser.add_argument("--max-pages", type=int, default=30)
+    arg_parser.add_argument("--output", help="결과 JSON 파일 경로")
+    args = arg_parser.parse_args()
+
+    result = run(args.directory, args.backends, args.workers, args.max_pages)
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(result, file, indent=2, ensure_ascii=False)
@@ -0,0 +1,252 @@
+"""
+pdf_data/ 이력서로 실제 파이프라인 단계를 네트워크 없이 돌려 성능 회귀를 비교하는 벤치마크
+
+LLM, 임베딩, Cross-Encoder는 Container override로 결정적 가짜 모델(benchmarks.fakes)을 넣고,
+저장소는 임시 디렉토리에 만든다. 결과 JSON을 커밋마다 저장해 비교한다.
+
+- parse: 페이지/초 (bench_pdf_parse와 같은 측정)
+- extraction: LLM 시간을 뺀 추출 오버헤드 (압축, 라우팅, 섹션 분할, 체인 실행)
+- ingest: BulkIngestor 처리량 (파싱 -> 추출 -> 임베딩/저장)
+- search: 코퍼스 크기별 search_resumes QPS (dense/lexical/hybrid)
+- rerank: RerankFilter 지연 시간 (점수 캐시 미스/히트)
+
+사용법:
+    python -m benchmarks.bench_pipeline --directory pdf_data --sizes 100 1000 5000 --output pipeline.json
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+from benchmarks.bench_pdf_parse import percentile, run_backend
+from benchmarks.fakes import offline_container
+from llm.ingest import BulkIngestor, collect_local_pdfs
+from llm.result_filter import RerankFilter, SearchResult
+from preprocess.pdf_engine import ParallelPDFParser
+
+QUERIES = [
+    "Python 백엔드 개발 3년 경력",
+    "React TypeScript 프론트엔드",
+    "Spring Boot Kafka MSA",
+    "AWS 클라우드 인프라 운영 경험",
+    "머신러닝 모델 서빙",
+    "Java 서버 개발자",
+    "데이터 파이프라인 구축",
+    "모바일 앱 Kotlin",
+]
+SEARCH_MODES = ["dense", "lexical", "hybrid"]
+
+
+def latency_summary(samples_ms: list[float]) -> dict:
+    return {
+        "p50_ms": statistics.median(samples_ms),
+        "p95_ms": percentile(samples_ms, 95),
+        "max_ms": max(samples_ms),
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_extraction(container, file_paths: list[str], workers: int, max_pages: int) -> tuple[dict, list]:
+    """가짜 LLM은 바로 응답하므로 측정 시간은 LLM을 뺀 추출 경로의 오버헤드"""
+    parser = ParallelPDFParser(
+        backend=container.config.pdf_backend(), workers=workers, max_pages=max_pages
+    )
+    try:
+        parsed = [parser.parse_pdf(file_path) for file_path in file_paths]
+    finally:
+        parser.close()
+
+    content_extractor = container.content_extractor()
+    document_ms, routes, tokens_saved, contents = [], Counter(), 0, []
+    start = time.perf_counter()
+    for documents in parsed:
+        document_start = time.perf_counter()
+        content = content_extractor.extract_content(documents)
+        document_ms.append((time.perf_counter() - document_start) * 1000)
+        contents.append(content)
+        if content.get("route") is not None:
+            routes[content["route"].chain] += 1
+        if content.get("compaction") is not None:
+            tokens_saved += content["compaction"].tokens_saved
+    elapsed = time.perf_counter() - start
+
+    return {
+        "documents": len(parsed),
+        "documents_per_second": len(parsed) / elapsed,
+        **latency_summary(document_ms),
+        "routes": dict(routes),
+        "tokens_saved": tokens_saved,
+    }, contents
+
+
+def run_ingest(container, file_paths: list[str], workers: int, batch_size: int) -> dict:
+    ingestor = BulkIngestor(
+        content_extractor=container.content_extractor(),
+        vector_store_manager=container.vector_store_manager(),
+        document_store=container.document_store(),
+        parse_workers=workers,
+        batch_size=batch_size,
+    )
+    start = time.perf_counter()
+    report = ingestor.ingest(file_paths)
+    elapsed = time.perf_counter() - start
+    return {
+        "documents": report.total,
+        "ingested": report.ingested,
+        "failed": len(report.failed),
+        "documents_per_second": report.ingested / elapsed,
+        "elapsed_s": elapsed,
+    }
+
+
+def synthetic_corpus(contents: list, size: int) -> list[dict]:
+    """추출 결과를 size개가 될 때까지 복제. 복제본마다 본문 끝을 바꿔 임베딩이 겹치지 않게 한다"""
+    resumes = []
+    for i in range(size):
+        content = contents[i % len(contents)]
+        summary = content["summary"] if isinstance(content["summary"], str) else "\n".join(content["summary"])
+        resume_info = content["resume_info"]
+        resumes.append({
+            "content": f"{summary}\n#{i}",
+            "resume_id": f"bench-{i}",
+            "applicant_name": resume_info.applicant_name,
+            "job_category": resume_info.job_category,
+            "years": resume_info.years,
+            "language": resume_info.language,
+        })
+    return resumes
+
+
+def run_search(data_dir: str, contents: list, size: int, queries: int, embedding_size: int,
+               batch_size: int = 256) -> dict:
+    container = offline_container(data_dir, embedding_size)
+    try:
+        vector_store_manager = container.vector_store_manager()
+        resumes = synthetic_corpus(contents, size)
+        start = time.perf_counter()
+        for i in range(0, len(resumes), batch_size):
+            vector_store_manager.add_resumes(resumes[i:i + batch_size])
+        result = {"index_s": time.perf_counter() - start}
+
+        for mode in SEARCH_MODES:
+            samples = []
+            start = time.perf_counter()
+            for i in range(queries):
+                query_start = time.perf_counter()
+                vector_store_manager.search_resumes(QUERIES[i % len(QUERIES)], k=10, mode=mode)
+                samples.append((time.perf_counter() - query_start) * 1000)
+            result[mode] = {"qps": queries / (time.perf_counter() - start), **latency_summary(samples)}
+        return result
+    finally:
+        container.shutdown_resources()
+
+
+def run_rerank(result_filter, contents: list, queries: int, candidates: int) -> dict:
+    """질의마다 candidates개 후보를 재정렬. 처음 보는 쌍(cold)과 점수 캐시에 있는 쌍(warm)을 나눠 잰다"""
+    def make_batch(offset: int) -> list[SearchResult]:
+        return [
+            SearchResult(
+                metadata={"resume_id": f"bench-{offset + j}"},
+                content=str(contents[(offset + j) % len(contents)]["summary"]),
+            )
+            for j in range(candidates)
+        ]
+
+    # warm에서 쓸 (질의, 후보) 쌍은 미리 한 번씩 점수를 계산해 캐시에 올려둔다
+    for query in QUERIES:
+        result_filter.filter(make_batch(0), query=query, top_k=5)
+
+    results = {}
+    for phase in ("cold", "warm"):
+        samples = []
+        for i in range(queries):
+            # cold는 질의마다 다른 후보 묶음을 써서 캐시에 없는 쌍만 계산하게 한다
+            batch = make_batch((i + 1) * candidates if phase == "cold" else 0)
+            start = time.perf_counter()
+            result_filter.filter(batch, query=QUERIES[i % len(QUERIES)], top_k=5)
+            samples.append((time.perf_counter() - start) * 1000)
+        results[phase] = latency_summary(samples)
+    return results
+
+
+def run(directory: str, sizes: list[int], queries: int, workers: int, max_pages: int, batch_size: int,
+        embedding_size: int, candidates: int, real_reranker: bool) -> dict:
+    file_paths = collect_local_pdfs(directory)
+    result = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "documents": len(file_paths),
+            "llm": "FakeResumeChatModel",
+            "embeddings": f"DeterministicFakeEmbedding({embedding_size})",
+            "reranker": "cross-encoder" if real_reranker else "OverlapCrossEncoder",
+        }
+    }
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        container = offline_container(os.path.join(tmp_dir, "pipeline"), embedding_size)
+        try:
+            result["parse"] = run_backend(container.config.pdf_backend(), file_paths, workers, max_pages)
+            result["extraction"], contents = run_extraction(container, file_paths, workers, max_pages)
+            result["ingest"] = run_ingest(container, file_paths, workers, batch_size)
+        finally:
+            container.shutdown_resources()
+
+        result["search"] = {
+            str(size): run_search(os.path.join(tmp_dir, f"search-{size}"), contents, size, queries, embedding_size)
+            for size in sizes
+        }
+
+    # 가짜 Cross-Encoder는 Container의 result_filter override로, 실제 모델은 설정의 backend로 로드
+    try:
+        result_filter = (
+            RerankFilter(backend=container.config.rerank_backend()) if real_reranker else container.result_filter()
+        )
+    except Exception as e:
+        result["rerank"] = {"skipped": f"{type(e).__name__}: {e}"}
+        return result
+    try:
+        result["rerank"] = run_rerank(result_filter, contents, queries, candidates)
+    finally:
+        result_filter.close()
+    return result
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="오프라인 파이프라인 벤치마크")
+    arg_parser.add_argument("--directory", default="pdf_data")
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000], help="검색 코퍼스 크기")
+    arg_parser.add_argument("--queries", type=int, default=200, help="크기/모드별 검색 질의 수")
+    arg_parser.add_argument("--workers", type=int, default=4, help="파싱 프로세스 수")
+    arg_parser.add_argument("--max-pages", type=int, default=30)
+    arg_parser.add_argument("--batch-size", type=int, default=16, help="적재 배치 크기")
+    arg_parser.add_argument("--embedding-size", type=int, default=256)
+    arg_parser.add_argument("--candidates", type=int, default=20, help="재정렬 후보 수")
+    arg_parser.add_argument("--real-reranker", action="store_true", help="설정의 Cross-Encoder 사용 (모델 필요)")
+    arg_parser.add_argument("--output", help="결과 JSON 파일 경로")
+    args = arg_parser.parse_args()
+
+    # 단계별 로그는 stderr로 보내 stdout에는 결과 JSON만 남긴다
+    with contextlib.redirect_stdout(sys.stderr):
+        result = run(args.directory, args.sizes, args.queries, args.workers, args.max_pages, args.batch_size,
+                     args.embedding_size, args.candidates, args.real_reranker)
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(result, file, indent=2, ensure_ascii=False)
@@ -0,0 +1,146 @@
+"""
+네트워크 없이 파이프라인을 돌리기 위한 결정적 가짜 모델과 Container 설정
+
+- FakeResumeChatModel: section/summarize 모델 대신 프롬프트의 이력서 본문을 그대로 돌려준다
+- fake_refine_model: refine(structured output) 대신 본문 해시로 ResumeInfoResponse를 만든다
+- DeterministicFakeEmbedding: 텍스트 해시로 시드를 둔 임베딩 (langchain_core)
+- OverlapCrossEncoder: 질의/문서의 글자 bigram 겹침으로 점수를 매기는 Cross-Encoder 대용
+"""
+import hashlib
+import os
+import time
+from typing import Any, List, Optional
+
+# llm 모듈은 import 시점에 OpenAI 클라이언트를 만들기 때문에 (호출하지 않는) 자리 표시 키를 채워둔다
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from dependency_injector import providers
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import RunnableLambda
+
+from containers import Container
+from llm.embedding_cache import CachedEmbeddings
+from llm.result_filter import RerankFilter
+from schemas.enums import JobCategory, ProgrammingLanguage, YearsOfExperience
+from schemas.response import ResumeInfoResponse
+
+
+def _digest(text: str) -> int:
+    return int(hashlib.sha1(text.encode("utf-8")).hexdigest(), 16)
+
+
+def _resume_of(text: str) -> str:
+    # 프롬프트의 마지막 "Resume:" 뒤가 이력서 본문
+    marker = text.rfind("Resume")
+    return text[text.find(":", marker) + 1:].strip() if marker >= 0 else text
+
+
+class FakeResumeChatModel(BaseChatModel):
+    """마지막 메시지의 이력서 본문을 max_chars까지 돌려주는 채팅 모델. delay로 LLM 응답 시간을 흉내낼 수 있다"""
+
+    max_chars: int = 4000
+    delay: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-resume"
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if self.delay:
+            time.sleep(self.delay)
+        content = _resume_of(messages[-1].content)[: self.max_chars]
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+
+def fake_resume_info(prompt) -> ResumeInfoResponse:
+    """같은 본문이면 항상 같은 추출 결과"""
+    text = _resume_of(prompt.to_string())
+    value = _digest(text)
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    return ResumeInfoResponse(
+        resume_id=str(value % 10 ** 8),
+        applicant_name=lines[0][:20] if lines else "",
+        job_category=list(JobCategory)[value % len(JobCategory)],
+        years=list(YearsOfExperience)[value // 7 % len(YearsOfExperience)],
+        language=list(ProgrammingLanguage)[value // 11 % len(ProgrammingLanguage)],
+    )
+
+
+fake_refine_model = RunnableLambda(fake_resume_info)
+
+
+class OverlapCrossEncoder:
+    """글자 bigram 겹침 비율을 점수로 쓰는 Cross-Encoder 대용 (CrossEncoder.predict와 같은 호출 형식)"""
+
+    model_name = "fake-overlap"
+
+    @staticmethod
+    def _bigrams(text: str) -> set:
+        return {text[i:i + 2] for i in range(len(text) - 1)}
+
+    def predict(self, pairs, batch_size: int = 32):
+        scores = []
+        for query, content in pairs:
+            query_bigrams = self._bigrams(query)
+            overlap = len(query_bigrams & self._bigrams(content))
+            scores.append(overlap / (len(query_bigrams) or 1))
+        return scores
+
+
+def init_offline_embeddings(size: int, cache_path: str, max_memory_items: int):
+    """실제 앱과 같은 캐시(CachedEmbeddings) 뒤에 결정적 가짜 임베딩을 둔다"""
+    embeddings = CachedEmbeddings(
+        underlying=DeterministicFakeEmbedding(size=size),
+        cache_path=cache_path,
+        max_memory_items=max_memory_items,
+        model_name=f"fake-{size}",
+    )
+    yield embeddings
+    embeddings.close()
+
+
+def init_offline_result_filter(max_batch_size: int, max_wait_ms: float):
+    result_filter = RerankFilter(model=OverlapCrossEncoder(), max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+    yield result_filter
+    result_filter.close()
+
+
+def offline_container(data_dir: str, embedding_size: int = 256, llm_delay: float = 0.0) -> Container:
+    """저장 경로를 data_dir 아래로 옮기고 LLM/임베딩/Cross-Encoder를 가짜로 바꾼 Container"""
+    container = Container()
+    container.config.vector_store_path.override(os.path.join(data_dir, "vector_store"))
+    container.config.resume_cache_path.override(os.path.join(data_dir, "resume_cache.sqlite3"))
+    container.config.document_store_path.override(os.path.join(data_dir, "resume_documents.sqlite3"))
+    container.config.embedding_cache_path.override(os.path.join(data_dir, "embedding_cache.sqlite3"))
+    container.config.s3_cache_dir.override(os.path.join(data_dir, "s3_cache"))
+
+    chat_model = FakeResumeChatModel(delay=llm_delay)
+    container.section_model.override(chat_model)
+    container.summarize_model.override(chat_model)
+    container.refine_model.override(fake_refine_model)
+    container.embeddings.override(
+        providers.Resource(
+            init_offline_embeddings,
+            size=embedding_size,
+            cache_path=container.config.embedding_cache_path,
+            max_memory_items=container.config.embedding_cache_memory_items.as_int(),
+        )
+    )
+    container.result_filter.override(
+        providers.Resource(
+            init_offline_result_filter,
+            max_batch_size=container.config.rerank_max_batch_size.as_int(),
+            max_wait_ms=container.config.rerank_max_wait_ms.as_float(),
+        )
+    )
+    return container
@@ -1,12 +1,23 @@
 from dependency_injector import containers, providers
 from langchain_openai import OpenAIEmbeddings
 from llm.vector_store import VectorStoreManager
-from llm.extract import split_chain, summarize_chain, section_chain
+from llm.extract import split_chain, summarize_chain, section_chain, segmented_section_chain, map_reduce_section_chain
+from llm.extract import build_map_reduce_section_chain, build_segmented_section_chain
+from llm.extract import build_section_chain, build_split_chain, build_summarize_chain
+from llm.extract import section_llm, summarize_llm, refine_llm_with_schema
 from llm.extract import ContentExtractor
+from llm.chain_router import ChainRouter
+from preprocess.compact import ResumeCompactor
 from dotenv import load_dotenv
 import os
 from llm.recommend import QueryInfoExtractor
+from llm.model import llm
 from llm.result_filter import RerankFilter
+from llm.resume_cache import ResumeResultCache
+from llm.embedding_cache import CachedEmbeddings
+from llm.generate_question import QuestionCache
+from llm.document_store import ResumeDocumentStore
+from preprocess.s3_fetch import S3PDFFetcher
 
 load_dotenv()
 
@@ -15,6 +26,8 @@ from typing import Callable, Dict
 class ChainRegistry:
    _chains: Dict[str, Callable] = {
        "section": section_chain,
+       "segmented_section": segmented_section_chain,
+       "map_reduce_section": map_reduce_section_chain,
        "split": split_chain,
        "summarize": summarize_chain
    }
@@ -24,29 +37,173 @@ class ChainRegistry:
            raise ValueError(f"Unknown chain: {chain_name}")
        return cls._chains[chain_name]
 
+def init_content_extractor(chain_type: str, input_compaction: bool, input_max_tokens: int, section_segmenter: bool,
+                           section_map_reduce: bool, section_map_group_chars: int, section_map_concurrency: int,
+                           chain_routing: bool, route_split_max_pages: int, route_split_max_tokens: int,
+                           section_model=section_llm, summarize_model=summarize_llm,
+                           refine_model=refine_llm_with_schema):
+    """
+    설정에 따라 입력 압축, 페이지 병렬 섹션 추출, 규칙 기반 섹션 분할, 문서별 체인 라우팅을 붙인 추출기
+
+    체인은 주어진 모델로 만든다. 기본값은 실제 OpenAI 모델이고, 벤치마크는 가짜 모델을 넣는다.
+    """
+    # 긴 문서를 map-reduce가 처리하면 문서 전체를 자르지 않고 토큰 예산을 페이지 묶음마다 적용한다
+    map_reduce_route = section_map_reduce and (chain_routing or chain_type == "section")
+    compactor = None
+    if input_compaction:
+        compactor = ResumeCompactor(max_tokens=0 if map_reduce_route else input_max_tokens)
+
+    section = build_section_chain(section_model, refine_model)
+    if section_map_reduce:
+        section = build_map_reduce_section_chain(
+            section_map_group_chars, section_map_concurrency, section_model=section_model, refine_model=refine_model,
+            max_group_tokens=input_max_tokens if compactor else None,
+            token_counter=compactor.token_counter if compactor else None,
+        )
+    if section_segmenter:
+        section = build_segmented_section_chain(
+            section, refine_model=refine_model,
+            max_tokens=input_max_tokens if compactor else None,
+            token_counter=compactor.token_counter if compactor else None,
+        )
+    chains = {
+        "section": section,
+        "split": build_split_chain(refine_model),
+        "summarize": build_summarize_chain(summarize_model, refine_model),
+    }
+    chain = chains[chain_type] if chain_type in chains else ChainRegistry.get_chain(chain_type)
+    if section_map_reduce:
+        # 긴 문서도 요약 대신 페이지 병렬 섹션 추출로 처리
+        del chains["summarize"]
+    return ContentExtractor(
+        chain,
+        compactor=compactor,
+        router=ChainRouter(
+            chains=chains,
+            max_split_pages=route_split_max_pages,
+            max_split_tokens=route_split_max_tokens,
+        ) if chain_routing else None,
+    )
+
+
+def init_embeddings(openai_api_key: str, cache_path: str, max_memory_items: int):
+    """임베딩 클라이언트(HTTP 커넥션 풀)와 캐시를 앱 수명 동안 하나만 유지"""
+    embeddings = CachedEmbeddings(
+        underlying=OpenAIEmbeddings(openai_api_key=openai_api_key),
+        cache_path=cache_path,
+        max_memory_items=max_memory_items,
+    )
+    yield embeddings
+    embeddings.close()
+
+
+def init_vector_store_manager(embeddings, persist_directory: str, search_mode: str = "hybrid",
+                              backend: str = "chroma", exact_search_threshold: int = 2000, debug: bool = False,
+                              index_granularity: str = "resume", chunk_aggregation: str = "max"):
+    """벡터 인덱스를 한 번만 열고 시작 시점에 미리 로드"""
+    vector_store_manager = VectorStoreManager(
+        embeddings=embeddings,
+        persist_directory=persist_directory,
+        search_mode=search_mode,
+        backend=backend,
+        exact_search_threshold=exact_search_threshold,
+        debug=debug,
+        index_granularity=index_granularity,
+        chunk_aggregation=chunk_aggregation,
+    )
+    vector_store_manager.warm_up()
+    yield vector_store_manager
+    vector_store_manager.close()
+
+
+def init_result_filter(backend: str, max_batch_size: int, max_wait_ms: float):
+    """Cross-Encoder와 배처 스레드를 앱 수명 동안 하나만 유지"""
+    result_filter = RerankFilter(backend=backend, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+    yield result_filter
+    result_filter.close()
+
+
 class Container(containers.DeclarativeContainer):
     wiring_config = containers.WiringConfiguration(modules=["main"])
     config = providers.Configuration(yaml_files=["config.yml"])
-    
 
-    # content_extractor = providers.Factory(
-    #     ContentExtractor,
-    #     chain=ChainRegistry.get_chain(config.chain_type.as_str())
-    # )
+    # 추출 체인에 쓰는 모델. 네트워크 없이 돌릴 때(벤치마크)는 override로 가짜 모델을 넣는다
+    section_model = providers.Object(section_llm)
+    summarize_model = providers.Object(summarize_llm)
+    refine_model = providers.Object(refine_llm_with_schema)
+
+    content_extractor = providers.Singleton(
+        init_content_extractor,
+        chain_type=config.chain_type,
+        input_compaction=config.input_compaction.as_(bool),
+        input_max_tokens=config.input_max_tokens.as_int(),
+        section_segmenter=config.section_segmenter.as_(bool),
+        section_map_reduce=config.section_map_reduce.as_(bool),
+        section_map_group_chars=config.section_map_group_chars.as_int(),
+        section_map_concurrency=config.section_map_concurrency.as_int(),
+        chain_routing=config.chain_routing.as_(bool),
+        route_split_max_pages=config.route_split_max_pages.as_int(),
+        route_split_max_tokens=config.route_split_max_tokens.as_int(),
+        section_model=section_model,
+        summarize_model=summarize_model,
+        refine_model=refine_model,
+    )
 
-    embeddings = providers.Factory(
-        OpenAIEmbeddings,
-        openai_api_key=os.getenv("OPENAI_API_KEY")
+    # 요청마다 새로 만들던 객체들을 앱 수명 동안 재사용한다.
+    # Resource는 container.init_resources()/shutdown_resources()로 시작/종료된다.
+    embeddings = providers.Resource(
+        init_embeddings,
+        openai_api_key=os.getenv("OPENAI_API_KEY"),
+        cache_path=config.embedding_cache_path,
+        max_memory_items=config.embedding_cache_memory_items.as_int(),
     )
 
-    vector_store_manager = providers.Factory(
-        VectorStoreManager,
+    vector_store_manager = providers.Resource(
+        init_vector_store_manager,
         embeddings=embeddings,
-        persist_directory=config.vector_store_path
+        persist_directory=config.vector_store_path,
+        search_mode=config.search_mode,
+        backend=config.vector_backend,
+        exact_search_threshold=config.exact_search_threshold.as_int(),
+        debug=config.search_debug.as_(bool),
+        index_granularity=config.index_granularity,
+        chunk_aggregation=config.chunk_aggregation,
     )
 
-    query_info_extractor = providers.Factory(
+    result_filter = providers.Resource(
+        init_result_filter,
+        backend=config.rerank_backend,
+        max_batch_size=config.rerank_max_batch_size.as_int(),
+        max_wait_ms=config.rerank_max_wait_ms.as_float(),
+    )
+
+    query_info_extractor = providers.Singleton(
         QueryInfoExtractor,
         llm=llm,
-        result_filter=RerankFilter()
+        result_filter=result_filter
+    )
+
+    resume_cache = providers.Singleton(
+        ResumeResultCache,
+        db_path=config.resume_cache_path,
+        max_size_bytes=config.resume_cache_max_bytes.as_int(),
+    )
+
+    document_store = providers.Singleton(
+        ResumeDocumentStore,
+        db_path=config.document_store_path,
+        cache_size=config.document_store_cache_size.as_int(),
+    )
+
+    s3_fetcher = providers.Singleton(
+        S3PDFFetcher,
+        cache_dir=config.s3_cache_dir,
+        max_cache_bytes=config.s3_cache_max_bytes.as_int(),
+        max_pool_connections=config.s3_max_pool_connections.as_int(),
+        prefetch_workers=config.s3_prefetch_workers.as_int(),
+    )
+
+    question_cache = providers.Singleton(
+        QuestionCache,
+        maxsize=config.question_cache_size.as_int(),
     )
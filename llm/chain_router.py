@@ -0,0 +1,97 @@
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from langchain.schema import Document
+
+from preprocess.compact import TokenCounter
+from preprocess.sections import heading_of
+
+
+@dataclass
+class RouteDecision:
+    chain: str
+    reason: str
+    pages: int
+    tokens: int
+    headings: int
+    fragment_ratio: float
+    elapsed_ms: float
+
+
+class ChainRouter:
+    """
+    문서 길이와 구조를 보고 추출 체인(split/section/summarize)을 고른다
+
+    - split: max_split_pages 페이지, max_split_tokens 토큰 이하이고 섹션 제목이 min_headings개 이상,
+      짧은 조각 줄 비율이 max_fragment_ratio 이하인 정돈된 이력서 (section LLM 호출 없음)
+    - summarize: summarize_pages 페이지 또는 summarize_tokens 토큰을 넘거나 토큰 예산으로 잘린 긴 포트폴리오
+    - section: 그 외 (길거나 구조가 흐트러진 문서)
+    """
+
+    def __init__(
+        self,
+        chains: Dict[str, object],
+        max_split_pages: int = 2,
+        max_split_tokens: int = 2000,
+        min_headings: int = 2,
+        max_fragment_ratio: float = 0.3,
+        summarize_pages: int = 8,
+        summarize_tokens: int = 6000,
+        token_counter: Optional[TokenCounter] = None,
+    ):
+        self.chains = chains
+        self.max_split_pages = max_split_pages
+        self.max_split_tokens = max_split_tokens
+        self.min_headings = min_headings
+        self.max_fragment_ratio = max_fragment_ratio
+        self.summarize_pages = summarize_pages
+        self.summarize_tokens = summarize_tokens
+        self._token_counter = token_counter
+
+    @property
+    def token_counter(self) -> TokenCounter:
+        if self._token_counter is None:
+            self._token_counter = TokenCounter()
+        return self._token_counter
+
+    def route(self, documents: List[Document], resume: str, tokens: Optional[int] = None,
+              truncated: bool = False) -> RouteDecision:
+        """tokens를 넘기지 않으면(압축 보고서가 없을 때) 직접 센다. 토큰 예산으로 잘린 문서는 긴 문서로 본다"""
+        start = time.perf_counter()
+        pages = len(documents)
+        if tokens is None:
+            tokens = self.token_counter.count(resume)
+        lines = [line.strip() for line in resume.splitlines() if line.strip()]
+        is_heading = [heading_of(line) is not None for line in lines]
+        headings = sum(is_heading)
+        # 제목이 아닌 세 글자 이하 줄(글자 단위로 흩어진 추출 결과 등)의 비율
+        fragments = sum(1 for line, heading in zip(lines, is_heading) if len(line) <= 3 and not heading)
+        fragment_ratio = fragments / len(lines) if lines else 1.0
+
+        if truncated or pages > self.summarize_pages or tokens > self.summarize_tokens:
+            chain, reason = "summarize", "long document"
+        elif (
+            pages <= self.max_split_pages
+            and tokens <= self.max_split_tokens
+            and headings >= self.min_headings
+            and fragment_ratio <= self.max_fragment_ratio
+        ):
+            chain, reason = "split", "short and structured"
+        elif headings < self.min_headings or fragment_ratio > self.max_fragment_ratio:
+            chain, reason = "section", "unstructured"
+        else:
+            chain, reason = "section", "long"
+
+        if chain not in self.chains:
+            # 꺼져 있는 체인(map-reduce를 쓰면 summarize)은 section으로 대신하고 이유에 남긴다
+            chain, reason = "section", f"{reason}, {chain} disabled"
+        return RouteDecision(
+            chain=chain,
+            reason=reason,
+            pages=pages,
+            tokens=tokens,
+            headings=headings,
+            fragment_ratio=round(fragment_ratio, 3),
+            elapsed_ms=round((time.perf_counter() - start) * 1000, 3),
+        )
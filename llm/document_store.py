@@ -0,0 +1,121 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Union
+
+from llm.cache import LRUCache
+from schemas.response import ResumeInfoResponse
+
+
+@dataclass
+class StoredResume:
+    resume_id: str
+    summary: Union[str, List[str]]
+    resume_info: ResumeInfoResponse
+    created_at: float
+    updated_at: float
+
+    @property
+    def summary_text(self) -> str:
+        # split_chain은 요약을 청크 리스트로 돌려준다
+        return self.summary if isinstance(self.summary, str) else "\n".join(self.summary)
+
+
+class ResumeDocumentStore:
+    """
+    resume_id를 키로 이력서 요약과 추출 정보를 저장하는 키-값 문서 저장소
+
+    질문 생성처럼 본문만 필요한 조회는 벡터 인덱스의 메타데이터 스캔 대신
+    기본 키 조회(SQLite) 한 번으로 처리하고, 자주 조회되는 이력서는 메모리 LRU에서 바로 돌려준다.
+    다른 워커 프로세스의 수정이 반영되도록 LRU 항목은 cache_ttl초 동안만 사용한다.
+    """
+
+    def __init__(self, db_path: str = "db/resume_documents.sqlite3", cache_size: int = 1024, cache_ttl: float = 60.0):
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.db_path = db_path
+        self.cache = LRUCache(maxsize=cache_size)
+        self.cache_ttl = cache_ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS resume_documents (
+                resume_id TEXT PRIMARY KEY,
+                summary TEXT NOT NULL,
+                resume_info TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, resume_id: str) -> Optional[StoredResume]:
+        cached = self.cache.get(resume_id)
+        if cached is not None and time.monotonic() - cached[1] < self.cache_ttl:
+            return cached[0]
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT summary, resume_info, created_at, updated_at FROM resume_documents WHERE resume_id = ?",
+                (resume_id,),
+            ).fetchone()
+        if row is None:
+            return None
+
+        summary, resume_info, created_at, updated_at = row
+        stored = StoredResume(
+            resume_id=resume_id,
+            summary=json.loads(summary),
+            resume_info=ResumeInfoResponse.model_validate_json(resume_info),
+            created_at=created_at,
+            updated_at=updated_at,
+        )
+        self.cache.put(resume_id, (stored, time.monotonic()))
+        return stored
+
+    def put(self, resume_id: str, summary: Union[str, List[str]], resume_info: ResumeInfoResponse) -> StoredResume:
+        now = time.time()
+        with self._lock:
+            # 처음 저장한 시각(created_at)은 유지하고 수정 시각만 갱신
+            self._conn.execute(
+                """
+                INSERT INTO resume_documents VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(resume_id) DO UPDATE SET
+                    summary = excluded.summary,
+                    resume_info = excluded.resume_info,
+                    updated_at = excluded.updated_at
+                """,
+                (resume_id, json.dumps(summary, ensure_ascii=False), resume_info.model_dump_json(), now, now),
+            )
+            self._conn.commit()
+            (created_at,) = self._conn.execute(
+                "SELECT created_at FROM resume_documents WHERE resume_id = ?", (resume_id,)
+            ).fetchone()
+
+        stored = StoredResume(resume_id, summary, resume_info, created_at, now)
+        self.cache.put(resume_id, (stored, time.monotonic()))
+        return stored
+
+    def delete(self, resume_id: str) -> bool:
+        self.cache.pop(resume_id)
+        with self._lock:
+            deleted = self._conn.execute(
+                "DELETE FROM resume_documents WHERE resume_id = ?", (resume_id,)
+            ).rowcount
+            self._conn.commit()
+        return bool(deleted)
+
+    def stats(self) -> dict:
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM resume_documents").fetchone()
+        return {**self.cache.stats(), "entries": entries}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
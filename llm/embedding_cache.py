@@ -0,0 +1,176 @@
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+from array import array
+from typing import Dict, List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+from llm.cache import LRUCache
+
+
+class EmbeddingDiskStore:
+    """(모델명, 텍스트 해시) -> 임베딩 벡터를 저장하는 SQLite 저장소"""
+
+    def __init__(self, db_path: str = "db/embedding_cache.sqlite3"):
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embedding_cache (
+                model TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                embedding BLOB NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get_many(self, model: str, text_hashes: List[str]) -> Dict[str, List[float]]:
+        if not text_hashes:
+            return {}
+        placeholders = ",".join("?" * len(text_hashes))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT text_hash, embedding FROM embedding_cache "
+                f"WHERE model = ? AND text_hash IN ({placeholders})",
+                (model, *text_hashes),
+            ).fetchall()
+        return {text_hash: array("d", blob).tolist() for text_hash, blob in rows}
+
+    def put_many(self, model: str, items: Dict[str, List[float]]):
+        if not items:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embedding_cache VALUES (?, ?, ?)",
+                [(model, text_hash, array("d", vector).tobytes()) for text_hash, vector in items.items()],
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    임베딩 API 앞단의 2단 캐시 (메모리 LRU -> 디스크)
+
+    키는 (모델명, 텍스트 sha256) 이므로 같은 문서 재색인이나 반복되는 검색 질의는
+    네트워크 호출 없이 바로 벡터를 돌려준다.
+    """
+
+    def __init__(
+        self,
+        underlying: Embeddings,
+        cache_path: str = "db/embedding_cache.sqlite3",
+        max_memory_items: int = 10000,
+        model_name: Optional[str] = None,
+    ):
+        self.underlying = underlying
+        self.model_name = model_name or getattr(underlying, "model", type(underlying).__name__)
+        self.memory = LRUCache(maxsize=max_memory_items)
+        self.disk = EmbeddingDiskStore(cache_path)
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _lookup(self, text_hashes: List[str]) -> Dict[str, List[float]]:
+        """메모리 -> 디스크 순으로 조회. 디스크에서 찾은 항목은 메모리에 올린다"""
+        found = {}
+        for text_hash in set(text_hashes):
+            vector = self.memory.get((self.model_name, text_hash))
+            if vector is not None:
+                found[text_hash] = vector
+
+        remaining = [text_hash for text_hash in set(text_hashes) if text_hash not in found]
+        from_disk = self.disk.get_many(self.model_name, remaining)
+        for text_hash, vector in from_disk.items():
+            self.memory.put((self.model_name, text_hash), vector)
+        self.disk_hits += len(from_disk)
+        found.update(from_disk)
+        return found
+
+    def _store(self, computed: Dict[str, List[float]]):
+        for text_hash, vector in computed.items():
+            self.memory.put((self.model_name, text_hash), vector)
+        self.disk.put_many(self.model_name, computed)
+
+    def _missing_texts(self, texts: List[str], text_hashes: List[str], found: Dict) -> Dict[str, str]:
+        missing = {}
+        for text, text_hash in zip(texts, text_hashes):
+            if text_hash not in found and text_hash not in missing:
+                missing[text_hash] = text
+        self.misses += len(missing)
+        return missing
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        text_hashes = [self.text_hash(text) for text in texts]
+        found = self._lookup(text_hashes)
+        missing = self._missing_texts(texts, text_hashes, found)
+
+        if missing:
+            vectors = self.underlying.embed_documents(list(missing.values()))
+            computed = dict(zip(missing.keys(), vectors))
+            self._store(computed)
+            found.update(computed)
+
+        return [found[text_hash] for text_hash in text_hashes]
+
+    def embed_query(self, text: str) -> List[float]:
+        text_hash = self.text_hash(text)
+        found = self._lookup([text_hash])
+        if text_hash in found:
+            return found[text_hash]
+
+        self.misses += 1
+        vector = self.underlying.embed_query(text)
+        self._store({text_hash: vector})
+        return vector
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        text_hashes = [self.text_hash(text) for text in texts]
+        found = await asyncio.to_thread(self._lookup, text_hashes)
+        missing = self._missing_texts(texts, text_hashes, found)
+
+        if missing:
+            vectors = await self.underlying.aembed_documents(list(missing.values()))
+            computed = dict(zip(missing.keys(), vectors))
+            await asyncio.to_thread(self._store, computed)
+            found.update(computed)
+
+        return [found[text_hash] for text_hash in text_hashes]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        text_hash = self.text_hash(text)
+        found = await asyncio.to_thread(self._lookup, [text_hash])
+        if text_hash in found:
+            return found[text_hash]
+
+        self.misses += 1
+        vector = await self.underlying.aembed_query(text)
+        await asyncio.to_thread(self._store, {text_hash: vector})
+        return vector
+
+    def stats(self) -> dict:
+        memory_hits = self.memory.hits
+        total = memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (memory_hits + self.disk_hits) / total if total else 0.0,
+            "memory_size": len(self.memory),
+        }
+
+    def close(self):
+        self.disk.close()
@@ -1,11 +1,18 @@
+import time
+
 from langchain.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
-from langchain.schema.runnable import RunnableParallel
+from langchain.schema.runnable import RunnableParallel, RunnableLambda, RunnableBranch
+from langchain_core.runnables.config import RunnableConfig, patch_config
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from dotenv import load_dotenv
 from llm.log_callback_handler import LogCallbackHandler
+from llm.metrics import LLM_METRICS
+from llm.chain_router import ChainRouter, RouteDecision
 from langchain.prompts import ChatPromptTemplate
 from preprocess.load_pdf import PDFLoader
+from preprocess.compact import ResumeCompactor, TokenCounter
+from preprocess.sections import SectionSegmenter, merge_sectioned_texts, split_page_groups
 from schemas.response import ResumeInfoResponse
 from langchain.schema import Document
 
@@ -108,42 +115,212 @@ def split_content(content: str)->list[str]:
     return text_splitter.split_text(content)
 
 
-section_chain = (
+def build_section_chain(section_model=section_llm, refine_model=refine_llm_with_schema):
+    return (
             RunnableParallel(
-                question=(section_prompt | section_llm | (lambda x: x.content))
+                question=(section_prompt | section_model | (lambda x: x.content))
             )
             | RunnableParallel(
-                resume_info=refine_prompt | refine_llm_with_schema,
+                resume_info=refine_prompt | refine_model,
                 summary=lambda x: x["question"],
             )
         )
 
-split_chain = (
+
+def build_split_chain(refine_model=refine_llm_with_schema):
+    return (
             RunnableParallel(
-                resume_info=refine_prompt | refine_llm_with_schema,
-                summary=lambda x: split_content(x),  
+                resume_info=refine_prompt | refine_model,
+                summary=lambda x: split_content(x),
             )
         )
 
-summarize_chain = (
+
+def build_summarize_chain(summarize_model=summarize_llm, refine_model=refine_llm_with_schema):
+    return (
             RunnableParallel(
-                question=(summarize_prompt | summarize_llm | (lambda x: x.content))
+                question=(summarize_prompt | summarize_model | (lambda x: x.content))
             )
             | RunnableParallel(
-                resume_info=refine_prompt | refine_llm_with_schema,
+                resume_info=refine_prompt | refine_model,
                 summary=lambda x: x["question"],
             )
         )
 
+
+# 모델을 바꿔 끼울 수 있도록(벤치마크의 가짜 모델 등) 체인은 builder로 만들고, 기본 체인은 실제 모델로 만든다
+section_chain = build_section_chain()
+split_chain = build_split_chain()
+summarize_chain = build_summarize_chain()
+
+
+def build_map_reduce_section_chain(max_group_chars: int = 2000, max_concurrency: int = 8,
+                                   section_model=section_llm, refine_model=refine_llm_with_schema,
+                                   max_group_tokens: int | None = None, token_counter: TokenCounter | None = None):
+    """
+    긴 이력서를 페이지 묶음으로 나눠 section_llm을 동시에 호출(map)하고, 항목별로 합쳐(reduce) refine에 넘기는 체인
+
+    전체 시간이 가장 긴 묶음 하나의 호출 시간에 가까워지고, 한 번에 보내는 입력/출력 길이도 묶음 크기로 제한된다.
+    문서 전체 대신 묶음마다 max_group_tokens 토큰 예산을 적용한다 (한 페이지가 max_group_chars보다 긴 경우 대비).
+    묶음이 하나뿐이면 section_chain과 같다.
+    """
+    section_map = section_prompt | section_model | (lambda x: x.content)
+    if max_group_tokens and token_counter is None:
+        token_counter = TokenCounter()
+
+    def page_groups(resume: str) -> list[str]:
+        groups = split_page_groups(resume, max_group_chars)
+        if not max_group_tokens:
+            return groups
+        return [token_counter.truncate(group, max_group_tokens) for group in groups]
+
+    def map_sections(resume: str, config: RunnableConfig) -> list[str]:
+        return section_map.batch(page_groups(resume), config=patch_config(config, max_concurrency=max_concurrency))
+
+    async def amap_sections(resume: str, config: RunnableConfig) -> list[str]:
+        return await section_map.abatch(page_groups(resume), config=patch_config(config, max_concurrency=max_concurrency))
+
+    return (
+        RunnableLambda(map_sections, afunc=amap_sections)
+        | RunnableLambda(lambda sections: {"question": sections[0] if len(sections) == 1 else merge_sectioned_texts(sections)})
+        | RunnableParallel(
+            resume_info=refine_prompt | refine_model,
+            summary=lambda x: x["question"],
+        )
+    )
+
+
+map_reduce_section_chain = build_map_reduce_section_chain()
+
+
+# 제목이 분명한 이력서는 규칙 기반 분할 결과를 바로 refine에 넘기고(LLM 1회), 애매하면 fallback(section_llm 체인)으로 넘긴다
+section_segmenter = SectionSegmenter()
+
+
+def build_segmented_section_chain(fallback, refine_model=refine_llm_with_schema,
+                                  max_tokens: int | None = None, token_counter: TokenCounter | None = None):
+    """
+    max_tokens가 있으면 규칙으로 분할한 텍스트도 그 예산으로 잘라 refine에 넘긴다
+    (map-reduce를 쓰면 문서 전체를 자르지 않으므로 긴 포트폴리오가 그대로 refine에 가지 않도록)
+    """
+    if max_tokens and token_counter is None:
+        token_counter = TokenCounter()
+
+    def segmented_text(x: dict) -> dict:
+        text = x["segment"].text
+        return {"question": token_counter.truncate(text, max_tokens) if max_tokens else text}
+
+    return (
+            RunnableLambda(lambda x: {"resume": x, "segment": section_segmenter.segment(x)})
+            | RunnableBranch(
+                (
+                    lambda x: x["segment"].confident,
+                    RunnableLambda(segmented_text)
+                    | RunnableParallel(
+                        resume_info=refine_prompt | refine_model,
+                        summary=lambda x: x["question"],
+                    ),
+                ),
+                RunnableLambda(lambda x: x["resume"]) | fallback,
+            )
+        )
+
+
+segmented_section_chain = build_segmented_section_chain(section_chain)
+
+
 class ContentExtractor:
-    def __init__(self, chain):
+    """
+    파싱된 페이지를 체인에 넣어 요약/추출 정보를 얻는다
+
+    compactor가 있으면 체인 호출 전에 입력을 압축하고(머리글/바닥글, 공백, 줄바꿈 정리 + 토큰 예산),
+    결과의 "compaction"에 이력서별 CompactionReport(줄인 토큰 수)를 담는다.
+    router가 있으면 이력서마다 체인을 골라 호출하고, 결정(RouteDecision)을 "route"에 담아 로그로 남긴다.
+    """
+
+    def __init__(self, chain, compactor: ResumeCompactor | None = None, router: ChainRouter | None = None):
         self.chain = chain
+        self.compactor = compactor
+        self.router = router
+
+    def _prepare(self, documents: list[Document]):
+        if self.compactor is None:
+            # 페이지 경계를 빈 줄로 남겨 페이지 단위 처리(map-reduce)가 나눌 수 있게 한다
+            resume, report = '\n\n'.join(doc.page_content for doc in documents), None
+        else:
+            resume, report = self.compactor.compact(documents)
+            LLM_METRICS.observe_tokens_saved("compaction", report.tokens_saved)
+
+        if self.router is None:
+            return resume, report, None
+        if report is None:
+            decision = self.router.route(documents, resume)
+        else:
+            decision = self.router.route(documents, resume, report.compacted_tokens, report.truncated)
+        return resume, report, decision
+
+    def _chain_for(self, decision: RouteDecision | None):
+        return self.chain if decision is None else self.router.chains[decision.chain]
+
+    @staticmethod
+    def _finish(content, report, decision, latency: float):
+        if decision is not None:
+            LLM_METRICS.observe(f"route {decision.chain}", latency)
+            print(
+                f"[체인 라우팅] {decision.chain} ({decision.reason}) pages={decision.pages} "
+                f"tokens={decision.tokens} headings={decision.headings} "
+                f"route={decision.elapsed_ms}ms extract={latency:.2f}s"
+            )
+        if isinstance(content, dict):
+            if report is not None:
+                content = {**content, "compaction": report}
+            if decision is not None:
+                content = {**content, "route": decision}
+        return content
 
     def extract_content(self, documents: list[Document]):
-        resume = ''
-        for doc in documents:
-            resume += doc.page_content
-        return self.chain.invoke(resume)
+        start = time.perf_counter()
+        resume, report, decision = self._prepare(documents)
+        content = self._chain_for(decision).invoke(resume)
+        return self._finish(content, report, decision, time.perf_counter() - start)
+
+    async def aextract_content(self, documents: list[Document]):
+        start = time.perf_counter()
+        resume, report, decision = self._prepare(documents)
+        content = await self._chain_for(decision).ainvoke(resume)
+        return self._finish(content, report, decision, time.perf_counter() - start)
+
+    def extract_contents(self, documents_list: list[list[Document]], max_concurrency: int = 4) -> list:
+        """여러 이력서를 동시 호출 수를 제한해 한 번에 추출. 실패한 이력서는 예외 객체로 반환"""
+        prepared = [self._prepare(documents) for documents in documents_list]
+
+        # 같은 체인으로 라우팅된 이력서끼리 묶어 배치 호출
+        groups: dict[str, list[int]] = {}
+        for i, (_, _, decision) in enumerate(prepared):
+            groups.setdefault(decision.chain if decision else "", []).append(i)
+
+        contents = [None] * len(prepared)
+        for indexes in groups.values():
+            results = self._timed(self._chain_for(prepared[indexes[0]][2])).batch(
+                [prepared[i][0] for i in indexes],
+                config={"max_concurrency": max_concurrency},
+            )
+            for i, (content, latency) in zip(indexes, results):
+                contents[i] = self._finish(content, prepared[i][1], prepared[i][2], latency)
+        return contents
+
+    @staticmethod
+    def _timed(chain) -> RunnableLambda:
+        """배치 안에서도 이력서마다 걸린 시간을 재도록 감싼 체인. (결과 또는 예외 객체, 초)를 반환"""
+        def invoke(resume: str, config: RunnableConfig):
+            start = time.perf_counter()
+            try:
+                content = chain.invoke(resume, config)
+            except Exception as e:
+                content = e
+            return content, time.perf_counter() - start
+
+        return RunnableLambda(invoke)
 
 
 def pdf_to_documents(documents: list[Document]):
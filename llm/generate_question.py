@@ -5,9 +5,13 @@ from langchain.schema.runnable import RunnableParallel, RunnablePassthrough
 from dotenv import load_dotenv
 from llm.log_callback_handler import LogCallbackHandler
 from langchain.prompts import ChatPromptTemplate
-from typing import List
+from typing import AsyncIterator, Dict, List, Optional
+import asyncio
+import hashlib
 
-from schemas.response import InterviewQuestionResponse
+from llm.cache import LRUCache
+from schemas.enums import QuestionType
+from schemas.response import InterviewQuestionResponse, InterviewQuestionListResponse
 
 load_dotenv()
 
@@ -37,22 +41,113 @@ question_llm_with_schema = question_llm.with_structured_output(
 )
 
 
-def generate_question(resume: str):
+batch_question_prompt = ChatPromptTemplate.from_messages(
+    [
+        (
+            "system",
+            "\n"
+            "면접담당관이 전달하는 이력서를 확인하고 다음 주제별로 질문을 하나씩 작성해줘\n"
+            "Subjects: {subjects}\n",
+        ),
+        (
+            "human",
+            "Resume : \n{question}\n",
+        ),
+    ],
+)
+
+question_list_llm_with_schema = question_llm.with_structured_output(
+    InterviewQuestionListResponse
+)
+
+
+class QuestionCache:
+    """
+    resume_id별 생성 질문 캐시
+
+    요약 해시가 달라지면(이력서 재처리) 캐시를 쓰지 않으며,
+    재처리 시점에 invalidate로 명시적으로 지울 수도 있다.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self._cache = LRUCache(maxsize=maxsize)
+
+    @staticmethod
+    def summary_hash(summary: str) -> str:
+        return hashlib.sha256(summary.encode("utf-8")).hexdigest()
+
+    def get(self, resume_id: str, summary: str) -> Optional[List[InterviewQuestionResponse]]:
+        cached = self._cache.get(resume_id)
+        if cached is None or cached[0] != self.summary_hash(summary):
+            return None
+        return cached[1]
+
+    def put(self, resume_id: str, summary: str, questions: List[InterviewQuestionResponse]):
+        self._cache.put(resume_id, (self.summary_hash(summary), list(questions)))
+
+    def invalidate(self, resume_id: str):
+        self._cache.pop(resume_id)
+
+
+def generate_question(resume: str, mode: str = "batch") -> List[InterviewQuestionResponse]:
+    """
+    mode:
+        batch: 네 가지 질문 유형을 한 번의 구조화 출력 호출로 생성 (입력 토큰 1배)
+            응답에 빠진 유형이 있으면 그 유형만 parallel 방식으로 생성하고, 같은 유형이 여러 개면 첫 질문만 쓴다
+        parallel: 질문 유형별로 4번 병렬 호출 (기존 방식)
+    """
+    if mode == "batch":
+        response = (batch_question_prompt | question_list_llm_with_schema).invoke(
+            {
+                "question": resume,
+                "subjects": ", ".join(question_type.value for question_type in QuestionType),
+            }
+        )
+        questions = {}
+        for question in response.questions:
+            questions.setdefault(question.question_type, question)
+        missing = [question_type for question_type in QuestionType if question_type not in questions]
+        if missing:
+            print(f"일괄 생성 응답에 없는 질문 유형을 개별 생성: {[question_type.name for question_type in missing]}")
+            questions.update(generate_questions_parallel(resume, missing))
+        return [questions[question_type] for question_type in QuestionType]
+    if mode != "parallel":
+        raise ValueError(f"Unknown question mode: {mode}")
+
+    return list(generate_questions_parallel(resume, list(QuestionType)).values())
+
+
+def generate_questions_parallel(
+    resume: str, question_types: List[QuestionType]
+) -> Dict[QuestionType, InterviewQuestionResponse]:
+    """질문 유형별 체인을 병렬로 호출"""
     response = RunnableParallel(
-        job_specific=RunnablePassthrough.assign(subject=lambda _: "직군별 질문")
-        | question_prompt
-        | question_llm_with_schema,
-        culture_fit=RunnablePassthrough.assign(subject=lambda _: "컬쳐핏 질문")
-        | question_prompt
-        | question_llm_with_schema,
-        experience=RunnablePassthrough.assign(subject=lambda _: "경험 질문")
-        | question_prompt
-        | question_llm_with_schema,
-        project=RunnablePassthrough.assign(subject=lambda _: "프로젝트 질문")
-        | question_prompt
-        | question_llm_with_schema,
+        {question_type.name: question_chain(question_type) for question_type in question_types}
     ).invoke({"question": resume})
-    return response.values()
+    return {question_type: response[question_type.name] for question_type in question_types}
+
+
+def question_chain(question_type: QuestionType):
+    """질문 유형 하나에 대한 질문 생성 체인"""
+    return (
+        RunnablePassthrough.assign(subject=lambda _: question_type.value)
+        | question_prompt
+        | question_llm_with_schema
+    )
+
+
+async def astream_questions(resume: str) -> AsyncIterator[InterviewQuestionResponse]:
+    """질문 유형별 체인을 동시에 실행하고 먼저 끝난 순서대로 반환"""
+    tasks = [
+        asyncio.ensure_future(question_chain(question_type).ainvoke({"question": resume}))
+        for question_type in QuestionType
+    ]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
 
 
 if __name__ == "__main__":
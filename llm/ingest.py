@@ -0,0 +1,226 @@
+import argparse
+import glob
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional
+from uuid import NAMESPACE_URL, uuid5
+
+from langchain.schema import Document
+
+from llm.extract import ContentExtractor
+from llm.vector_store import VectorStoreManager
+from llm.document_store import ResumeDocumentStore
+from preprocess.load_pdf import PDFLoader
+from preprocess.pdf_engine import ParallelPDFParser
+from preprocess.s3_fetch import S3PDFFetcher
+
+
+def resume_id_from_path(file_path: str, storage_type: str = "local") -> str:
+    """
+    같은 파일을 다시 적재해도 같은 resume_id가 나오도록 경로 기반 UUID 생성
+
+    로컬 경로는 상대 경로·심볼릭 링크·'..'와 관계없이 같은 값이 나오도록 realpath로 정규화한다.
+    S3 키는 키 그대로 사용한다.
+    """
+    if storage_type != "s3":
+        file_path = os.path.realpath(file_path)
+    return str(uuid5(NAMESPACE_URL, file_path))
+
+
+def collect_local_pdfs(directory: str) -> List[str]:
+    if not os.path.isdir(directory):
+        raise FileNotFoundError(f"Directory not found: {directory}")
+    return sorted(glob.glob(os.path.join(directory, "*.pdf")))
+
+
+def read_manifest(manifest_path: str) -> List[str]:
+    """S3 키 목록 파일(한 줄에 하나, #은 주석) 읽기"""
+    with open(manifest_path, "r", encoding="utf-8") as file:
+        return [
+            line.strip()
+            for line in file
+            if line.strip() and not line.strip().startswith("#")
+        ]
+
+
+def _batched(iterable: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+@dataclass
+class IngestReport:
+    total: int = 0
+    ingested: int = 0
+    failed: dict = field(default_factory=dict)  # file_path -> 오류 메시지
+
+
+class BulkIngestor:
+    """
+    대량 이력서 적재 파이프라인
+
+    PDF 로드/파싱(프로세스 풀) -> LLM 추출(동시 호출 수 제한) -> 배치 단위 임베딩/저장
+    순서로 처리한다. 파싱은 풀에서 먼저 진행되므로 추출/저장 단계와 겹쳐서 실행된다.
+    파싱은 ParallelPDFParser(max_pages, page_timeout, document_timeout)로 하므로 손상된 PDF가 워커를 붙잡지 못한다.
+    pdf_parser를 넘기지 않으면 parse_workers개 프로세스의 파서를 만들어 쓰고 적재가 끝나면 닫는다.
+    """
+
+    def __init__(
+        self,
+        content_extractor: ContentExtractor,
+        vector_store_manager: VectorStoreManager,
+        storage_type: str = "local",
+        parse_workers: int = 4,
+        max_concurrency: int = 4,
+        batch_size: int = 16,
+        document_store: Optional[ResumeDocumentStore] = None,
+        s3_fetcher: Optional[S3PDFFetcher] = None,
+        pdf_parser: Optional[ParallelPDFParser] = None,
+    ):
+        self.content_extractor = content_extractor
+        self.vector_store_manager = vector_store_manager
+        self.document_store = document_store
+        self.s3_fetcher = s3_fetcher
+        self.storage_type = storage_type
+        self.parse_workers = parse_workers
+        self.max_concurrency = max_concurrency
+        self.batch_size = batch_size
+        self.pdf_parser = pdf_parser
+
+    def ingest(self, file_paths: List[str]) -> IngestReport:
+        report = IngestReport(total=len(file_paths))
+
+        if self.storage_type != "s3":
+            self._parse_and_ingest(file_paths, report)
+            return report
+
+        if self.s3_fetcher is None:
+            self.s3_fetcher = S3PDFFetcher()
+        # 캐시 한도보다 큰 배치에서 LRU 삭제가 방금 받은 파일을 지우지 않도록 적재가 끝날 때까지 고정한다
+        with self.s3_fetcher.pinned(file_paths):
+            # 파싱이 기다리지 않도록 S3 객체를 커넥션 풀로 동시에 디스크 캐시에 받아둔다
+            report.failed.update(self.s3_fetcher.prefetch(file_paths))
+            file_paths = [file_path for file_path in file_paths if file_path not in report.failed]
+            self._parse_and_ingest(file_paths, report)
+        return report
+
+    def _parse_and_ingest(self, file_paths: List[str], report: IngestReport):
+        pdf_parser = self.pdf_parser or ParallelPDFParser(workers=self.parse_workers)
+        loader = PDFLoader(storage_type=self.storage_type, s3_fetcher=self.s3_fetcher)
+
+        def load_and_parse(file_path: str):
+            # 로드(S3는 고정된 디스크 캐시)는 이 프로세스에서, 파싱은 파서의 프로세스 풀에서 경로로 한다
+            try:
+                with loader.open_pdf(file_path) as pdf_data:
+                    return file_path, pdf_parser.parse_pdf(pdf_data), None
+            except Exception as e:
+                return file_path, None, f"{type(e).__name__}: {e}"
+
+        try:
+            # 파서 풀을 채울 만큼 문서를 동시에 넘긴다
+            with ThreadPoolExecutor(max_workers=self.parse_workers) as executor:
+                parsed = executor.map(load_and_parse, file_paths)
+                for batch in _batched(parsed, self.batch_size):
+                    self._ingest_batch(batch, report)
+        finally:
+            if pdf_parser is not self.pdf_parser:
+                pdf_parser.close()
+
+    def _ingest_batch(self, batch: list, report: IngestReport):
+        parsed_batch: List[tuple[str, List[Document]]] = []
+        for file_path, documents, error in batch:
+            if error is not None:
+                report.failed[file_path] = error
+            else:
+                parsed_batch.append((file_path, documents))
+
+        if not parsed_batch:
+            return
+
+        contents = self.content_extractor.extract_contents(
+            [documents for _, documents in parsed_batch],
+            max_concurrency=self.max_concurrency,
+        )
+
+        resumes, documents = [], []
+        for (file_path, _), content in zip(parsed_batch, contents):
+            if isinstance(content, Exception):
+                report.failed[file_path] = f"{type(content).__name__}: {content}"
+                continue
+            resume_info = content["resume_info"]
+            resume_id = resume_id_from_path(file_path, self.storage_type)
+            documents.append((resume_id, content["summary"], resume_info.model_copy(update={"resume_id": resume_id})))
+            resumes.append(
+                {
+                    "content": content["summary"],
+                    "resume_id": resume_id,
+                    "applicant_name": resume_info.applicant_name,
+                    "job_category": resume_info.job_category,
+                    "years": resume_info.years,
+                    "language": resume_info.language,
+                    "additional_metadata": {"source": file_path},
+                }
+            )
+
+        if not resumes:
+            return
+
+        # 배치 전체를 한 번의 임베딩 요청으로 upsert
+        try:
+            self.vector_store_manager.add_resumes(resumes)
+            if self.document_store is not None:
+                for resume_id, summary, resume_info in documents:
+                    self.document_store.put(resume_id, summary, resume_info)
+            report.ingested += len(resumes)
+        except Exception as e:
+            for resume in resumes:
+                report.failed[resume["additional_metadata"]["source"]] = f"{type(e).__name__}: {e}"
+
+
+if __name__ == "__main__":
+    from containers import Container
+
+    arg_parser = argparse.ArgumentParser(description="이력서 PDF 대량 적재")
+    source = arg_parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--directory", help="로컬 PDF 디렉토리 (예: pdf_data)")
+    source.add_argument("--manifest", help="S3 키 목록 파일")
+    arg_parser.add_argument("--workers", type=int, default=4, help="파싱 프로세스 수")
+    arg_parser.add_argument("--concurrency", type=int, default=4, help="LLM 동시 호출 수")
+    arg_parser.add_argument("--batch-size", type=int, default=16, help="임베딩/저장 배치 크기")
+    args = arg_parser.parse_args()
+
+    if args.directory:
+        storage_type, file_paths = "local", collect_local_pdfs(args.directory)
+    else:
+        storage_type, file_paths = "s3", read_manifest(args.manifest)
+
+    container = Container()
+    pdf_parser = ParallelPDFParser(
+        backend=container.config.pdf_backend(),
+        workers=args.workers,
+        max_pages=container.config.pdf_max_pages(),
+        page_timeout=container.config.pdf_page_timeout(),
+        document_timeout=container.config.pdf_document_timeout(),
+    )
+    ingestor = BulkIngestor(
+        content_extractor=container.content_extractor(),
+        vector_store_manager=container.vector_store_manager(),
+        document_store=container.document_store(),
+        s3_fetcher=container.s3_fetcher() if storage_type == "s3" else None,
+        storage_type=storage_type,
+        parse_workers=args.workers,
+        max_concurrency=args.concurrency,
+        batch_size=args.batch_size,
+        pdf_parser=pdf_parser,
+    )
+    try:
+        report = ingestor.ingest(file_paths)
+    finally:
+        pdf_parser.close()
+
+    print(f"적재 완료: {report.ingested}/{report.total}")
+    for file_path, error in report.failed.items():
+        print(f"실패: {file_path} - {error}")
@@ -0,0 +1,169 @@
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from langchain_core.documents import Document
+
+
+# 명사 뒤에 자주 붙는 조사/어미. 긴 것부터 검사한다
+JOSA_SUFFIXES = sorted(
+    [
+        "으로부터", "에서부터", "으로서", "으로써", "에게서", "까지는", "에서는", "에서의",
+        "으로", "에서", "에게", "까지", "부터", "처럼", "보다", "하고", "이나", "라는", "이라는",
+        "은", "는", "이", "가", "을", "를", "에", "의", "와", "과", "로", "도", "만", "랑",
+    ],
+    key=len,
+    reverse=True,
+)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]|[가-힣]+")
+
+
+def _strip_josa(word: str) -> str:
+    for suffix in JOSA_SUFFIXES:
+        if len(word) > len(suffix) + 1 and word.endswith(suffix):
+            return word[: -len(suffix)]
+    return word
+
+
+def words(text: str) -> List[str]:
+    """영문/숫자 기술 용어(c++, node.js 포함)와 조사를 뗀 한글 단어 목록"""
+    result = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        if "가" <= token[0] <= "힣":
+            # "Kafka를"처럼 영문 뒤에 붙은 조사는 따로 떨어져 나오므로 버린다
+            if token in JOSA_SUFFIXES:
+                continue
+            token = _strip_josa(token)
+        result.append(token)
+    return result
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    색인/검색용 토큰
+
+    한글 단어는 단어 자체에 더해 글자 bigram을 추가해
+    "백엔드개발자" 같은 복합어도 "백엔드"로 찾을 수 있게 한다.
+    """
+    tokens = []
+    for word in words(text):
+        tokens.append(word)
+        if "가" <= word[0] <= "힣" and len(word) > 2:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+def _matches(metadata: dict, filter_metadata: Optional[Dict]) -> bool:
+    if not filter_metadata:
+        return True
+    return all(metadata.get(key) == value for key, value in filter_metadata.items())
+
+
+class BM25Index:
+    """
+    이력서 요약에 대한 메모리 BM25 역색인
+
+    add/remove로 문서 단위 증분 갱신이 가능하며, 검색 결과는 Document(id 포함)로 돌려준다.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = defaultdict(dict)  # term -> {doc_id: tf}
+        self._doc_lengths: Dict[str, int] = {}
+        self._documents: Dict[str, Document] = {}
+        self._total_length = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._documents
+
+    def add(self, ids: Sequence[str], documents: Sequence[Document]):
+        with self._lock:
+            for doc_id, document in zip(ids, documents):
+                if doc_id in self._documents:
+                    self._remove(doc_id)
+                term_counts = Counter(tokenize(document.page_content))
+                for term, count in term_counts.items():
+                    self._postings[term][doc_id] = count
+                length = sum(term_counts.values())
+                self._doc_lengths[doc_id] = length
+                self._total_length += length
+                self._documents[doc_id] = Document(
+                    id=doc_id, page_content=document.page_content, metadata=document.metadata
+                )
+
+    def remove(self, ids: Iterable[str]):
+        with self._lock:
+            for doc_id in ids:
+                if doc_id in self._documents:
+                    self._remove(doc_id)
+
+    def _remove(self, doc_id: str):
+        for term in set(tokenize(self._documents[doc_id].page_content)):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._doc_lengths.pop(doc_id)
+        del self._documents[doc_id]
+
+    def clear(self):
+        with self._lock:
+            self._postings.clear()
+            self._doc_lengths.clear()
+            self._documents.clear()
+            self._total_length = 0
+
+    def is_keyword_query(self, query: str, max_words: int = 5) -> bool:
+        """짧고 모든 단어가 색인에 있는 질의(예: "Spring Boot Kafka MSA")인지 여부"""
+        query_words = words(query)
+        if not query_words or len(query_words) > max_words:
+            return False
+        return all(word in self._postings for word in query_words)
+
+    def search(self, query: str, k: int = 5, filter_metadata: Optional[Dict] = None) -> List[Document]:
+        with self._lock:
+            total_docs = len(self._documents)
+            if total_docs == 0:
+                return []
+            average_length = self._total_length / total_docs
+
+            scores: Dict[str, float] = defaultdict(float)
+            for term in set(tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (total_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[doc_id] / average_length)
+                    scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+            results = []
+            for doc_id, _ in ranked:
+                document = self._documents[doc_id]
+                if _matches(document.metadata, filter_metadata):
+                    results.append(document)
+                    if len(results) == k:
+                        break
+            return results
+
+
+def reciprocal_rank_fusion(result_lists: Sequence[List[Document]], k: int = 60) -> List[Document]:
+    """여러 검색 결과를 순위 역수 합(RRF)으로 합친다. 같은 문서는 Document.id로 식별"""
+    scores: Dict[str, float] = defaultdict(float)
+    documents: Dict[str, Document] = {}
+    for results in result_lists:
+        for rank, document in enumerate(results):
+            key = document.id or document.page_content
+            scores[key] += 1 / (k + rank + 1)
+            documents.setdefault(key, document)
+    return [documents[key] for key, _ in sorted(scores.items(), key=lambda item: item[1], reverse=True)]
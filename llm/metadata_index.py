@@ -0,0 +1,98 @@
+import heapq
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from llm.vector_index import FILTER_FIELDS
+
+
+class MetadataBitmapIndex:
+    """
+    enum 메타데이터(job_category/years/language) 값별 비트맵 역색인
+
+    문서마다 고정된 행 번호를 주고, (필드, 값)마다 해당 행 비트를 켠 정수 비트맵을 둔다.
+    필터 조건은 비트맵 AND 한 번으로 후보 집합이 되므로, 검색 전에 후보 수(선택도)를 알 수 있다.
+    삭제된 행은 비트를 모두 지우고 다음 추가에서 가장 작은 번호부터 다시 쓰므로,
+    delete/upsert가 반복돼도 비트맵 길이는 동시에 살아 있는 문서 수를 넘지 않는다.
+    """
+
+    def __init__(self, fields: Sequence[str] = tuple(FILTER_FIELDS)):
+        self.fields = tuple(fields)
+        self._bitmaps: Dict[str, Dict[str, int]] = {field: defaultdict(int) for field in self.fields}
+        self._rows: Dict[str, int] = {}
+        self._ids: List[Optional[str]] = []
+        self._free: List[int] = []
+        self._alive = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def supports(self, filter_metadata: Optional[Dict]) -> bool:
+        return bool(filter_metadata) and all(field in self.fields for field in filter_metadata)
+
+    def add(self, ids: Sequence[str], metadatas: Sequence[dict]):
+        with self._lock:
+            for doc_id, metadata in zip(ids, metadatas):
+                if doc_id in self._rows:
+                    self._remove(doc_id)
+                if self._free:
+                    row = heapq.heappop(self._free)
+                    self._ids[row] = doc_id
+                else:
+                    row = len(self._ids)
+                    self._ids.append(doc_id)
+                self._rows[doc_id] = row
+                bit = 1 << row
+                self._alive |= bit
+                for field in self.fields:
+                    value = metadata.get(field)
+                    if value is not None:
+                        self._bitmaps[field][value] |= bit
+
+    def remove(self, ids: Iterable[str]):
+        with self._lock:
+            for doc_id in ids:
+                if doc_id in self._rows:
+                    self._remove(doc_id)
+
+    def _remove(self, doc_id: str):
+        row = self._rows.pop(doc_id)
+        self._ids[row] = None
+        mask = ~(1 << row)
+        self._alive &= mask
+        # 행을 재사용할 때 이전 문서의 값이 남지 않도록 모든 값 비트맵에서 지운다
+        for bitmaps in self._bitmaps.values():
+            for value in [value for value, bitmap in bitmaps.items() if bitmap & ~mask]:
+                bitmaps[value] &= mask
+                if not bitmaps[value]:
+                    del bitmaps[value]
+        heapq.heappush(self._free, row)
+
+    def _bitmap(self, filter_metadata: Dict) -> int:
+        bitmap = self._alive
+        for field, value in filter_metadata.items():
+            bitmap &= self._bitmaps[field].get(value, 0)
+            if not bitmap:
+                break
+        return bitmap
+
+    def count(self, filter_metadata: Dict) -> int:
+        with self._lock:
+            return self._bitmap(filter_metadata).bit_count()
+
+    def candidates(self, filter_metadata: Dict) -> List[str]:
+        """필터를 만족하는 문서 id 목록"""
+        with self._lock:
+            bitmap = self._bitmap(filter_metadata)
+            if not bitmap:
+                return []
+            raw = np.frombuffer(bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little"), dtype=np.uint8)
+            rows = np.flatnonzero(np.unpackbits(raw, bitorder="little"))
+            return [self._ids[row] for row in rows]
+
+    def selectivity(self, filter_metadata: Dict) -> float:
+        total = len(self)
+        return self.count(filter_metadata) / total if total else 0.0
@@ -0,0 +1,130 @@
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence
+
+
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 32, 64)
+TOKEN_BUCKETS = (64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384)
+COST_BUCKETS = (0.00001, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05)
+
+
+class Histogram:
+    """Prometheus 방식의 누적 버킷 히스토그램"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # 마지막은 +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[int]:
+        total, result = 0, []
+        for count in self.counts:
+            total += count
+            result.append(total)
+        return result
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _escape(label: str) -> str:
+    return label.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class LLMMetrics:
+    """
+    체인 이름("section resume", "refine json" 등)별 LLM 호출 지표
+
+    지연 시간, 첫 토큰 시간(TTFT), 입력/출력 토큰 수, 비용을 히스토그램으로 집계하고
+    Prometheus 텍스트 포맷으로 내보낸다.
+    """
+
+    histograms = {
+        "llm_latency_seconds": ("LLM 호출 전체 시간(초)", LATENCY_BUCKETS),
+        "llm_time_to_first_token_seconds": ("첫 토큰까지 걸린 시간(초)", LATENCY_BUCKETS),
+        "llm_input_tokens": ("입력 토큰 수", TOKEN_BUCKETS),
+        "llm_output_tokens": ("출력 토큰 수", TOKEN_BUCKETS),
+        "llm_cost_usd": ("호출당 비용(USD)", COST_BUCKETS),
+        "llm_input_tokens_saved": ("입력 압축으로 줄인 토큰 수(이력서당)", TOKEN_BUCKETS),
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data: Dict[str, Dict[str, Histogram]] = {
+            metric: {} for metric in self.histograms
+        }
+        self._errors: Dict[str, int] = defaultdict(int)
+
+    def _observe(self, metric: str, chain: str, value: Optional[float]):
+        if value is None:
+            return
+        series = self._data[metric]
+        if chain not in series:
+            series[chain] = Histogram(self.histograms[metric][1])
+        series[chain].observe(value)
+
+    def observe(
+        self,
+        chain: str,
+        latency: float,
+        ttft: Optional[float] = None,
+        input_tokens: Optional[int] = None,
+        output_tokens: Optional[int] = None,
+        cost: Optional[float] = None,
+    ):
+        with self._lock:
+            self._observe("llm_latency_seconds", chain, latency)
+            self._observe("llm_time_to_first_token_seconds", chain, ttft)
+            self._observe("llm_input_tokens", chain, input_tokens)
+            self._observe("llm_output_tokens", chain, output_tokens)
+            self._observe("llm_cost_usd", chain, cost)
+
+    def observe_tokens_saved(self, chain: str, tokens_saved: int):
+        with self._lock:
+            self._observe("llm_input_tokens_saved", chain, tokens_saved)
+
+    def observe_error(self, chain: str):
+        with self._lock:
+            self._errors[chain] += 1
+
+    def reset(self):
+        """모든 지표를 비운다 (테스트 격리용)"""
+        with self._lock:
+            for series in self._data.values():
+                series.clear()
+            self._errors.clear()
+
+    def snapshot(self, metric: str, chain: str) -> Optional[Histogram]:
+        return self._data[metric].get(chain)
+
+    def render_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            for metric, (description, _) in self.histograms.items():
+                lines.append(f"# HELP {metric} {description}")
+                lines.append(f"# TYPE {metric} histogram")
+                for chain, histogram in sorted(self._data[metric].items()):
+                    label = f'chain="{_escape(chain)}"'
+                    bounds = [_format_value(bucket) for bucket in histogram.buckets] + ["+Inf"]
+                    for bound, count in zip(bounds, histogram.cumulative()):
+                        lines.append(f'{metric}_bucket{{{label},le="{bound}"}} {count}')
+                    lines.append(f"{metric}_sum{{{label}}} {_format_value(histogram.sum)}")
+                    lines.append(f"{metric}_count{{{label}}} {histogram.count}")
+
+            lines.append("# HELP llm_errors_total 실패한 LLM 호출 수")
+            lines.append("# TYPE llm_errors_total counter")
+            for chain, count in sorted(self._errors.items()):
+                lines.append(f'llm_errors_total{{chain="{_escape(chain)}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+# 프로세스 공용 지표 저장소
+LLM_METRICS = LLMMetrics()
@@ -0,0 +1,83 @@
+import re
+from typing import Dict, Optional
+
+from schemas.enums import JobCategory, YearsOfExperience, ProgrammingLanguage
+
+
+# 영문 키워드는 앞뒤가 영문자가 아닐 때만 매칭 (java/javascript, ai/email 구분)
+def _word(keyword: str) -> str:
+    return rf"(?<![a-z]){keyword}(?![a-z])"
+
+
+JOB_CATEGORY_PATTERNS = [
+    (JobCategory.FULLSTACK, [r"풀\s?스택", _word(r"full[\s-]?stack")]),
+    (JobCategory.FRONTEND, [r"프론트", r"프런트", _word(r"front[\s-]?end"), _word("react"), _word("vue")]),
+    (JobCategory.BACKEND, [r"백엔드", r"백앤드", r"서버\s?개발", _word(r"back[\s-]?end"), _word("spring")]),
+    (JobCategory.AI, [r"인공지능", r"머신\s?러닝", r"딥\s?러닝", _word("ai"), _word("ml"), _word("llm")]),
+]
+
+LANGUAGE_PATTERNS = [
+    (ProgrammingLanguage.TYPESCRIPT, [r"타입\s?스크립트", _word("typescript"), _word("ts")]),
+    (ProgrammingLanguage.JAVASCRIPT, [r"자바\s?스크립트", _word("javascript"), _word("js"), _word(r"node(\.?js)?")]),
+    (ProgrammingLanguage.KOTLIN, [r"코틀린", _word("kotlin")]),
+    (ProgrammingLanguage.PYTHON, [r"파이썬", _word("python")]),
+    (ProgrammingLanguage.CPLUSPLUS, [r"(?<![a-z])c\+\+", _word("cpp")]),
+    (ProgrammingLanguage.JAVA, [r"자바(?!\s?스크립트)", _word("java")]),
+    # 단독 "c"는 앞뒤가 영문자/숫자/기호(-, ., +, #)가 아닐 때만 ("c-level", "c.f." 제외)
+    (ProgrammingLanguage.C, [r"(?<![a-z])c\s?언어", r"(?<![a-z0-9+#.-])c(?![a-z0-9+#.-])"]),
+]
+
+SENIORITY_PATTERNS = [
+    (YearsOfExperience.JUNIOR, [r"신입", r"주니어", _word("junior")]),
+    (YearsOfExperience.MIDLEVEL, [r"미들", r"중급", _word("mid[\s-]?level")]),
+    # "리드"/"고급"은 다른 단어의 일부("그리드", "최고급")가 아닐 때만
+    (YearsOfExperience.SENIOR, [
+        r"시니어", r"(?<![가-힣])고급", r"테크\s?리드", r"(?<![가-힣])리드(?:급)?(?![가-힣])",
+        _word("senior"), _word("lead"),
+    ]),
+]
+
+# 연도("2023년")의 일부는 경력으로 보지 않는다. MAX_YEARS를 넘는 값도 무시
+YEARS_PATTERN = re.compile(r"(?<![\d.])(\d{1,2})\s*(?:년|years?|yrs?)")
+MAX_YEARS = 40
+
+
+def normalize_query(query: str) -> str:
+    """캐시 키와 규칙 매칭에 쓰는 정규화: 소문자, 공백 정리, 앞뒤 문장부호 제거"""
+    return re.sub(r"\s+", " ", query.lower()).strip(" .,!?")
+
+
+def years_to_enum(years: int) -> YearsOfExperience:
+    if years < 3:
+        return YearsOfExperience.JUNIOR
+    if years < 7:
+        return YearsOfExperience.MIDLEVEL
+    return YearsOfExperience.SENIOR
+
+
+def _first_match(query: str, table) -> Optional[object]:
+    for value, patterns in table:
+        if any(re.search(pattern, query) for pattern in patterns):
+            return value
+    return None
+
+
+def match_query_rules(query: str) -> Dict[str, Optional[object]]:
+    """
+    LLM 호출 없이 명확한 키워드("백엔드", "Kotlin", "시니어", "3년")를
+    JobCategory / YearsOfExperience / ProgrammingLanguage로 매핑
+    """
+    query = normalize_query(query)
+
+    years = None
+    years_match = YEARS_PATTERN.search(query)
+    if years_match and int(years_match.group(1)) <= MAX_YEARS:
+        years = years_to_enum(int(years_match.group(1)))
+    else:
+        years = _first_match(query, SENIORITY_PATTERNS)
+
+    return {
+        "job_category": _first_match(query, JOB_CATEGORY_PATTERNS),
+        "years": years,
+        "language": _first_match(query, LANGUAGE_PATTERNS),
+    }
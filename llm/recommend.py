@@ -13,12 +13,14 @@ from langchain_openai import ChatOpenAI
 from pydantic import BaseModel, Field
 from langchain.output_parsers import PydanticOutputParser
 from llm.result_filter import ResultFilter, NoFilter, RerankFilter, SearchResult
+from llm.cache import LRUCache
+from llm.query_rules import match_query_rules, normalize_query
 load_dotenv()
 
 
 
 class QueryInfoExtractor:
-    def __init__(self, llm, result_filter: ResultFilter = NoFilter()):
+    def __init__(self, llm, result_filter: ResultFilter = NoFilter(), cache_size: int = 1024):
         # 새로운 방식으로 구현
         parser = PydanticOutputParser(pydantic_object=ResumeFilter)
         
@@ -30,10 +32,25 @@ class QueryInfoExtractor:
         
         self.chain = prompt | llm | parser
         self.result_filter = result_filter
+        # 정규화된 질의 -> 필터 캐시
+        self.filter_cache = LRUCache(maxsize=cache_size)
 
     def select_fit_resumes(self, query: str, vector_store: VectorStoreManager) -> List[dict]:
-        response = self.chain.invoke({"query": query})
-        filter_metadata = self.extract(query)
+        search_results = self.retrieve(query, vector_store)
+        
+        # 4. Reranking 수행
+        reranked_results = self.rerank(query, search_results)
+        
+        # 5. 메타데이터만 반환
+        return [result.metadata for result in reranked_results]
+
+    def retrieve(self, query: str, vector_store: VectorStoreManager) -> List[SearchResult]:
+        # 1. 질의 이해 (LLM 최대 1회)
+        filter_metadata = {
+            key: value.value
+            for key, value in self.extract(query).items()
+            if value is not None
+        }
         
         # 2. 초기 검색 (더 많은 후보)
         initial_results = vector_store.search_resumes(
@@ -43,46 +60,44 @@ class QueryInfoExtractor:
         )
         
         # 3. SearchResult 객체로 변환
-        search_results = [
+        return [
             SearchResult(
                 metadata=doc.metadata,
                 content=doc.page_content
             )
             for doc in initial_results
         ]
-        
-        # 4. Reranking 수행
-        reranked_results = self.result_filter.filter(search_results)
-        
-        # 5. 메타데이터만 반환
-        return [result.metadata for result in reranked_results]
+
+    def rerank(self, query: str, search_results: List[SearchResult]) -> List[SearchResult]:
+        return self.result_filter.filter(search_results, query=query)
     
 
-    def extract(self, message: str) -> Dict[str, Optional[str]]:
-        try:
-            # LLM으로부터 응답 받기
-            response = self.chain.invoke(message)
-            
-            # 응답 파싱
-            result = {}
-            for line in response.strip().split('\n'):
-                key, value = line.split(': ')
-                value = value.strip()
-                
-                # Enum 매핑
-                if key == 'job_category':
-                    result[key] = getattr(JobCategory, value) if value != 'NONE' else None
-                elif key == 'years':
-                    result[key] = getattr(YearsOfExperience, value) if value != 'NONE' else None
-                elif key == 'language':
-                    result[key] = getattr(ProgrammingLanguage, value) if value != 'NONE' else None
-                    
-            return result
-            
-        except Exception as e:
-            # 에러 발생시 모든 필드에 None 반환
-            return {
-                'job_category': None,
-                'years': None,
-                'language': None
-            }
+    def extract(self, message: str) -> Dict[str, Optional[Any]]:
+        normalized = normalize_query(message)
+        cached = self.filter_cache.get(normalized)
+        if cached is not None:
+            return dict(cached)
+
+        # 명확한 키워드로 찾은 필드는 규칙 결과를 쓰고, 규칙이 못 찾은 필드만 LLM으로 채운다
+        result = match_query_rules(normalized)
+        missing = [key for key, value in result.items() if value is None]
+        if missing:
+            try:
+                extracted = self._extract_with_llm(message)
+            except Exception as e:
+                # 일시적인 오류 결과(빈 필터)는 캐시하지 않아 다음 요청에서 다시 시도한다
+                print(f"질의 분석 중 오류 발생: {e}")
+                return dict(result)
+            result.update({key: extracted[key] for key in missing})
+
+        self.filter_cache.put(normalized, result)
+        return dict(result)
+
+    def _extract_with_llm(self, message: str) -> Dict[str, Optional[Any]]:
+        # LLM 응답을 ResumeFilter로 바로 파싱. 실패하면 예외를 그대로 올린다
+        response: ResumeFilter = self.chain.invoke({"query": message})
+        return {
+            'job_category': response.job_category,
+            'years': response.years,
+            'language': response.language,
+        }
@@ -0,0 +1,149 @@
+import hashlib
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Optional, Sequence, Tuple
+
+from sentence_transformers import CrossEncoder
+
+
+# 양자화된 ONNX 가중치 (sentence-transformers 허브 모델에 함께 배포되는 파일명)
+ONNX_QUANTIZED_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+
+
+def load_cross_encoder(model_name: str, backend: str = "torch", onnx_file_name: Optional[str] = None) -> CrossEncoder:
+    """
+    Cross-Encoder 로드
+
+    backend:
+        torch: 기본 PyTorch
+        onnx: ONNX Runtime (CPU). onnx_file_name으로 양자화 가중치 지정 가능
+        onnx-quantized: 양자화된 ONNX 가중치(ONNX_QUANTIZED_FILE) 사용
+    """
+    if backend == "torch":
+        return CrossEncoder(model_name)
+    if backend == "onnx":
+        model_kwargs = {"file_name": onnx_file_name} if onnx_file_name else None
+        return CrossEncoder(model_name, backend="onnx", model_kwargs=model_kwargs)
+    if backend == "onnx-quantized":
+        return CrossEncoder(
+            model_name,
+            backend="onnx",
+            model_kwargs={"file_name": onnx_file_name or ONNX_QUANTIZED_FILE},
+        )
+    raise ValueError(f"Unknown rerank backend: {backend}")
+
+
+class RerankBatcher:
+    """
+    동시에 들어온 여러 요청의 (query, 문서) 쌍을 모아 한 번의 forward pass로 점수 계산
+
+    첫 요청이 도착한 뒤 max_wait_ms 동안, 또는 모인 쌍이 max_batch_size가 될 때까지
+    다른 요청을 기다렸다가 한꺼번에 model.predict를 호출한다.
+    close() 뒤나 워커 스레드가 죽은 뒤의 요청은 바로 RuntimeError를 내고,
+    결과는 timeout초까지만 기다린다.
+    """
+
+    _STOP = object()
+
+    def __init__(self, model, max_batch_size: int = 64, max_wait_ms: float = 5.0, timeout: float = 30.0):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.timeout = timeout
+        self.forward_passes = 0
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name="rerank-batcher", daemon=True)
+        self._worker.start()
+
+    def score(self, pairs: Sequence[Tuple[str, str]]) -> List[float]:
+        if not pairs:
+            return []
+        future: Future = Future()
+        with self._lock:
+            if self._closed or not self._worker.is_alive():
+                raise RuntimeError("RerankBatcher is closed")
+            self._queue.put((list(pairs), future))
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            # 아직 배치에 들어가지 않았다면 워커가 건너뛰도록 취소
+            future.cancel()
+            raise
+
+    def _collect(self, first) -> list:
+        jobs = [first]
+        size = len(first[0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                job = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if job is self._STOP:
+                self._queue.put(job)
+                break
+            jobs.append(job)
+            size += len(job[0])
+        return jobs
+
+    def _run(self):
+        try:
+            self._serve()
+        finally:
+            # 워커가 예상치 못하게 끝나도 대기 중인 요청이 멈추지 않도록 실패 처리
+            with self._lock:
+                self._closed = True
+            while True:
+                try:
+                    job = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if job is not self._STOP and job[1].set_running_or_notify_cancel():
+                    job[1].set_exception(RuntimeError("RerankBatcher is closed"))
+
+    def _serve(self):
+        while True:
+            first = self._queue.get()
+            if first is self._STOP:
+                return
+            # 기다리다 타임아웃으로 취소된 요청은 빼고 계산
+            jobs = [job for job in self._collect(first) if job[1].set_running_or_notify_cancel()]
+            if not jobs:
+                continue
+
+            pairs = [pair for job_pairs, _ in jobs for pair in job_pairs]
+            try:
+                scores = self.model.predict(pairs, batch_size=self.max_batch_size)
+                self.forward_passes += 1
+            except Exception as e:
+                for _, future in jobs:
+                    future.set_exception(e)
+                continue
+            except BaseException:
+                for _, future in jobs:
+                    future.set_exception(RuntimeError("RerankBatcher worker stopped"))
+                raise
+
+            offset = 0
+            for job_pairs, future in jobs:
+                future.set_result([float(score) for score in scores[offset:offset + len(job_pairs)]])
+                offset += len(job_pairs)
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(self._STOP)
+        self._worker.join(timeout=1)
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
@@ -1,6 +1,8 @@
 from typing import Protocol, List
 from dataclasses import dataclass
-from sentence_transformers import CrossEncoder
+
+from llm.cache import LRUCache
+from llm.rerank_service import RerankBatcher, content_hash, load_cross_encoder
 
 @dataclass
 class SearchResult:
@@ -9,29 +11,50 @@ class SearchResult:
     score: float = 0.0
 
 class ResultFilter(Protocol):
-    def filter(self, result: List[SearchResult]) -> List[SearchResult]:
+    def filter(self, result: List[SearchResult], query: str = "", top_k: int = 5) -> List[SearchResult]:
         pass
 
 class NoFilter:
-    def filter(self, result: List[SearchResult], top_k: int = 5) -> List[SearchResult]:
+    def filter(self, result: List[SearchResult], query: str = "", top_k: int = 5) -> List[SearchResult]:
         return result[:top_k]
 
 
 class RerankFilter: # CrossEncoderReranker
-    def __init__(self, model_name: str = 'cross-encoder/ms-marco-MiniLM-L-6-v2'):
-        self.model = CrossEncoder(model_name)
-    
+    def __init__(self,
+                 model_name: str = 'cross-encoder/ms-marco-MiniLM-L-6-v2',
+                 backend: str = 'torch',
+                 max_batch_size: int = 64,
+                 max_wait_ms: float = 5.0,
+                 cache_size: int = 10000,
+                 model=None):
+        self.model = model if model is not None else load_cross_encoder(model_name, backend)
+        # 동시 요청의 쌍을 모아 한 번에 계산하는 배처와 (query, resume_id, 내용 해시) 점수 캐시
+        self.batcher = RerankBatcher(self.model, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+        self.score_cache = LRUCache(maxsize=cache_size)
+
+    def filter(self, result: List[SearchResult], query: str = "", top_k: int = 5) -> List[SearchResult]:
+        return self.rerank(query, result, top_k)
+
     def rerank(self, query: str, results: List[SearchResult], k: int) -> List[SearchResult]:
-        # 쿼리-문서 쌍 생성
-        pairs = [(query, result.content) for result in results]
-        
-        # Cross-Encoder로 점수 계산
-        scores = self.model.predict(pairs)
-        
+        # 캐시에 없는 쌍만 Cross-Encoder로 점수 계산
+        keys = [
+            (query, result.metadata.get('resume_id'), content_hash(result.content))
+            for result in results
+        ]
+        scores = [self.score_cache.get(key) for key in keys]
+        missing = [i for i, score in enumerate(scores) if score is None]
+
+        computed = self.batcher.score([(query, results[i].content) for i in missing])
+        for i, score in zip(missing, computed):
+            scores[i] = score
+            self.score_cache.put(keys[i], score)
+
         # 점수 업데이트
         for result, score in zip(results, scores):
             result.score = score
-        
+
         # 점수로 정렬하고 상위 k개 반환
         return sorted(results, key=lambda x: x.score, reverse=True)[:k]
 
+    def close(self):
+        self.batcher.close()
@@ -0,0 +1,137 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+from typing import List, Optional, Union
+
+from schemas.response import ResumeInfoResponse
+
+
+@dataclass
+class CachedResumeResult:
+    summary: Union[str, List[str]]
+    resume_info: ResumeInfoResponse
+    embedding: List[float]
+
+
+class ResumeResultCache:
+    """
+    PDF 내용(바이트) 해시를 키로 이력서 처리 결과를 저장하는 디스크 캐시
+
+    같은 PDF가 다시 들어오면 파싱, LLM 추출, 임베딩 호출 없이 저장된
+    요약(summary), 추출 정보(resume_info), 임베딩 벡터를 돌려준다.
+    저장 용량이 max_size_bytes를 넘으면 가장 오래 사용되지 않은 항목부터 삭제한다.
+    """
+
+    def __init__(self, db_path: str = "db/resume_cache.sqlite3", max_size_bytes: int = 256 * 1024 * 1024):
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.db_path = db_path
+        self.max_size_bytes = max_size_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS resume_cache (
+                content_hash TEXT PRIMARY KEY,
+                summary TEXT NOT NULL,
+                resume_info TEXT NOT NULL,
+                embedding BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_resume_cache_last_access ON resume_cache (last_access)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def content_hash(pdf_bytes: bytes) -> str:
+        return hashlib.sha256(pdf_bytes).hexdigest()
+
+    def get(self, content_hash: str) -> Optional[CachedResumeResult]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT summary, resume_info, embedding FROM resume_cache WHERE content_hash = ?",
+                (content_hash,),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE resume_cache SET last_access = ? WHERE content_hash = ?",
+                (time.time(), content_hash),
+            )
+            self._conn.commit()
+
+        summary, resume_info, embedding = row
+        return CachedResumeResult(
+            summary=json.loads(summary),
+            resume_info=ResumeInfoResponse.model_validate_json(resume_info),
+            embedding=array("d", embedding).tolist(),
+        )
+
+    def put(
+        self,
+        content_hash: str,
+        summary: Union[str, List[str]],
+        resume_info: ResumeInfoResponse,
+        embedding: List[float],
+    ):
+        summary_json = json.dumps(summary, ensure_ascii=False)
+        resume_info_json = resume_info.model_dump_json()
+        embedding_blob = array("d", embedding).tobytes()
+        size = len(summary_json.encode("utf-8")) + len(resume_info_json) + len(embedding_blob)
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO resume_cache VALUES (?, ?, ?, ?, ?, ?)",
+                (content_hash, summary_json, resume_info_json, embedding_blob, size, time.time()),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """총 용량이 한도를 넘으면 오래 사용되지 않은 항목부터 삭제"""
+        (total_size,) = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM resume_cache").fetchone()
+        if total_size <= self.max_size_bytes:
+            return
+
+        rows = self._conn.execute(
+            "SELECT content_hash, size FROM resume_cache ORDER BY last_access ASC"
+        ).fetchall()
+        expired = []
+        for content_hash, size in rows:
+            if total_size <= self.max_size_bytes:
+                break
+            expired.append((content_hash,))
+            total_size -= size
+        self._conn.executemany("DELETE FROM resume_cache WHERE content_hash = ?", expired)
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM resume_cache"
+            ).fetchone()
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": entries,
+            "size_bytes": size,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,197 @@
+import atexit
+import csv
+import os
+import queue
+import threading
+import time
+from typing import List, Optional, Protocol
+
+import toml
+
+
+def get_version_from_pyproject(file_path: str = "pyproject.toml") -> str:
+    try:
+        # pyproject.toml 파일 읽기
+        with open(file_path, "r", encoding="utf-8") as file:
+            pyproject_data = toml.load(file)
+
+        # 버전 정보 추출
+        version = pyproject_data.get("tool", {}).get("poetry", {}).get("version")
+        if version:
+            return version
+        else:
+            raise KeyError("Version 정보가 pyproject.toml에 없습니다.")
+    except FileNotFoundError:
+        raise FileNotFoundError(f"'{file_path}' 파일을 찾을 수 없습니다.")
+    except Exception as e:
+        raise RuntimeError(f"버전 정보를 읽는 중 오류 발생: {e}")
+
+
+class TelemetrySink(Protocol):
+    def write(self, records: List[dict]):
+        pass
+
+
+class CsvSink:
+    """로그 레코드를 CSV 파일에 배치 단위로 추가"""
+
+    def __init__(self, file_path: str = "qna_log.csv"):
+        self.file_path = file_path
+
+    def write(self, records: List[dict]):
+        file_exists = os.path.isfile(self.file_path)
+        with open(self.file_path, mode="a", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            if not file_exists:
+                writer.writerow(records[0].keys())
+            writer.writerows(record.values() for record in records)
+
+
+class GoogleSheetSink:
+    """
+    Google Sheets에 로그 레코드를 배치 단위로 추가
+
+    인증과 워크시트 조회는 첫 write에서 한 번만 수행하고 이후에는 재사용한다.
+    """
+
+    scope = [
+        "https://spreadsheets.google.com/feeds",
+        "https://www.googleapis.com/auth/drive",
+    ]
+
+    def __init__(self, keyfile_path: str = "./log-llm-3316e43cc23b.json", spreadsheet_name: str = "QnA_Log"):
+        self.keyfile_path = keyfile_path
+        self.spreadsheet_name = spreadsheet_name
+        self._worksheet = None
+        self._has_header = False
+
+    def _open_worksheet(self):
+        import gspread
+        from oauth2client.service_account import ServiceAccountCredentials
+
+        # 서비스 계정 인증
+        creds = ServiceAccountCredentials.from_json_keyfile_name(self.keyfile_path, self.scope)
+        client = gspread.authorize(creds)
+        # 스프레드시트 및 첫 번째 시트 열기
+        worksheet = client.open(self.spreadsheet_name).get_worksheet(0)
+        self._has_header = bool(worksheet.row_values(1))
+        return worksheet
+
+    def write(self, records: List[dict]):
+        if self._worksheet is None:
+            self._worksheet = self._open_worksheet()
+
+        rows = [list(record.values()) for record in records]
+        if not self._has_header:
+            rows.insert(0, list(records[0].keys()))
+            self._has_header = True
+        self._worksheet.append_rows(rows)
+
+
+class TelemetryPipeline:
+    """
+    LLM 로그 레코드를 메모리 큐에 넣고 백그라운드 스레드에서 배치로 싱크에 기록
+
+    emit은 큐에 넣기만 하므로 LLM 호출 경로에서 파일/네트워크 I/O가 발생하지 않는다.
+    batch_size개가 모이거나 flush_interval초가 지나면 모든 싱크에 한 번에 기록한다.
+    """
+
+    _FLUSH = object()
+    _STOP = object()
+
+    def __init__(
+        self,
+        sinks: List[TelemetrySink],
+        batch_size: int = 50,
+        flush_interval: float = 2.0,
+        max_queue_size: int = 10000,
+    ):
+        self.sinks = sinks
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name="telemetry", daemon=True)
+        self._worker.start()
+
+    def emit(self, record: dict):
+        if self._closed:
+            self.dropped += 1
+            return
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            # 로깅 때문에 요청이 막히지 않도록 큐가 가득 차면 버린다
+            self.dropped += 1
+
+    def flush(self, timeout: float = 5.0):
+        """지금까지 넣은 레코드를 모두 기록할 때까지 대기"""
+        if self._closed:
+            return
+        done = threading.Event()
+        self._queue.put((self._FLUSH, done))
+        done.wait(timeout)
+
+    def close(self, timeout: float = 5.0):
+        """큐에 남은 레코드를 모두 기록하고 워커 스레드를 종료"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(self._STOP)
+        self._worker.join(timeout)
+
+    def _run(self):
+        buffer = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                item = None
+
+            if item is self._STOP:
+                self._write(buffer)
+                return
+            if isinstance(item, tuple) and item and item[0] is self._FLUSH:
+                self._write(buffer)
+                buffer = []
+                item[1].set()
+            elif item is not None:
+                buffer.append(item)
+
+            if len(buffer) >= self.batch_size or time.monotonic() >= deadline:
+                self._write(buffer)
+                buffer = []
+                deadline = time.monotonic() + self.flush_interval
+
+    def _write(self, records: List[dict]):
+        if not records:
+            return
+        for sink in self.sinks:
+            try:
+                sink.write(records)
+            except Exception as e:
+                print(f"{type(sink).__name__} 저장 중 오류 발생: {e}")
+
+
+_default_pipeline: Optional[TelemetryPipeline] = None
+_default_lock = threading.Lock()
+
+
+def get_default_pipeline() -> TelemetryPipeline:
+    """
+    프로세스 공용 텔레메트리 파이프라인
+
+    CSV 싱크는 항상 사용하고, 서비스 계정 키 파일이 있을 때만 Google Sheets 싱크를 추가한다.
+    """
+    global _default_pipeline
+    with _default_lock:
+        if _default_pipeline is None:
+            sinks: List[TelemetrySink] = [CsvSink(os.getenv("LLM_LOG_CSV_PATH", "qna_log.csv"))]
+            keyfile_path = os.getenv("LLM_LOG_SHEET_KEYFILE", "./log-llm-3316e43cc23b.json")
+            if os.path.isfile(keyfile_path):
+                sinks.append(GoogleSheetSink(keyfile_path))
+            _default_pipeline = TelemetryPipeline(sinks)
+            atexit.register(_default_pipeline.close)
+        return _default_pipeline
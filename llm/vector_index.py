@@ -0,0 +1,449 @@
+import fcntl
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+from schemas.enums import JobCategory, YearsOfExperience, ProgrammingLanguage
+
+
+# 벡터화된 마스크로 거르는 메타데이터 컬럼 (값은 enum 순서 코드로 저장)
+FILTER_FIELDS = {
+    "job_category": list(JobCategory),
+    "years": list(YearsOfExperience),
+    "language": list(ProgrammingLanguage),
+}
+MISSING_CODE = 255
+# codes 행렬의 마지막 컬럼: 1이면 유효한 행, 0이면 삭제된 행(tombstone)
+ALIVE_COLUMN = len(FILTER_FIELDS)
+# 추가/삭제마다 1씩 올리는 쓰기 버전. 다른 워커는 이 값이 바뀌면 BM25/비트맵 색인을 다시 만든다
+VERSION_KEY = "write_version"
+
+
+def top_k_rows(scores: np.ndarray, k: int) -> np.ndarray:
+    """점수 상위 k개 위치를 내림차순으로. 전체 정렬 대신 argpartition 사용"""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+@contextmanager
+def file_lock(path: str):
+    """프로세스 간 쓰기 직렬화용 파일 잠금"""
+    with open(path, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def where_clause(filter_metadata: Optional[Dict]) -> Optional[Dict]:
+    """filter_metadata를 Chroma where 절로 변환. 여러 조건은 $and로 결합"""
+    if not filter_metadata:
+        return None
+    if len(filter_metadata) > 1:
+        return {"$and": [{key: value} for key, value in filter_metadata.items()]}
+    return dict(filter_metadata)
+
+
+class VectorIndex(Protocol):
+    def add(self, ids: Sequence[str], embeddings: Sequence[Sequence[float]], documents: Sequence[Document]) -> int:
+        """추가 후의 쓰기 버전을 반환"""
+        pass
+
+    def search(self, embedding: Sequence[float], k: int, filter_metadata: Optional[Dict] = None) -> List[Document]:
+        pass
+
+    def search_candidates(self, embedding: Sequence[float], ids: Sequence[str], k: int) -> List[Document]:
+        pass
+
+    def get(self, filter_metadata: Dict) -> List[Document]:
+        pass
+
+    def delete(self, ids: Sequence[str]) -> int:
+        """삭제 후의 쓰기 버전을 반환"""
+        pass
+
+    def write_version(self) -> int:
+        pass
+
+    def iter_documents(self, page_size: int = 1000) -> Iterator[Tuple[List[str], List[Document]]]:
+        pass
+
+    def count(self) -> int:
+        pass
+
+    def warm_up(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class ChromaVectorIndex:
+    """
+    langchain Chroma(HNSW + SQLite) 위의 VectorIndex 구현
+
+    쓰기 버전은 컬렉션 메타데이터에 두고, lock_path 파일 잠금 안에서 읽고 올린다.
+    """
+
+    def __init__(self, vector_store, lock_path: str):
+        self.vector_store = vector_store
+        self._collection = vector_store._collection
+        self._lock_path = lock_path
+
+    def _collection_metadata(self) -> dict:
+        # self._collection.metadata는 이 프로세스의 캐시이므로 다른 워커의 변경을 보려면 다시 조회한다
+        return dict(self.vector_store._client.get_collection(self._collection.name).metadata or {})
+
+    def write_version(self) -> int:
+        return self._collection_metadata().get(VERSION_KEY, 0)
+
+    def _bump_version(self) -> int:
+        with file_lock(self._lock_path):
+            metadata = self._collection_metadata()
+            metadata[VERSION_KEY] = metadata.get(VERSION_KEY, 0) + 1
+            self._collection.modify(metadata=metadata)
+            return metadata[VERSION_KEY]
+
+    def add(self, ids, embeddings, documents):
+        self._collection.add(
+            ids=list(ids),
+            embeddings=[list(embedding) for embedding in embeddings],
+            metadatas=[doc.metadata for doc in documents],
+            documents=[doc.page_content for doc in documents],
+        )
+        return self._bump_version()
+
+    def search(self, embedding, k, filter_metadata=None):
+        # similarity_search는 문서 id를 돌려주지 않으므로 컬렉션을 직접 조회한다
+        result = self._collection.query(
+            query_embeddings=[list(embedding)],
+            n_results=k,
+            where=where_clause(filter_metadata),
+            include=["documents", "metadatas"],
+        )
+        return [
+            Document(id=doc_id, page_content=content or "", metadata=metadata or {})
+            for doc_id, content, metadata in zip(
+                result["ids"][0], result["documents"][0], result["metadatas"][0]
+            )
+        ]
+
+    def search_candidates(self, embedding, ids, k):
+        """후보 id들의 임베딩만 가져와 정확한 코사인 점수로 상위 k개를 고른다"""
+        if not ids:
+            return []
+        result = self._collection.get(ids=list(ids), include=["embeddings", "documents", "metadatas"])
+        vectors = normalize_rows(np.asarray(result["embeddings"], dtype=np.float32))
+        scores = vectors @ normalize_rows(np.asarray(embedding, dtype=np.float32))
+        return [
+            Document(id=result["ids"][row], page_content=result["documents"][row] or "",
+                     metadata=result["metadatas"][row] or {})
+            for row in top_k_rows(scores, k)
+        ]
+
+    def get(self, filter_metadata):
+        result = self.vector_store.get(where=where_clause(filter_metadata))
+        return [
+            Document(id=doc_id, page_content=content or "", metadata=metadata or {})
+            for doc_id, content, metadata in zip(result["ids"], result["documents"], result["metadatas"])
+        ]
+
+    def iter_documents(self, page_size=1000):
+        offset = 0
+        while True:
+            batch = self._collection.get(include=["documents", "metadatas"], limit=page_size, offset=offset)
+            if not batch["ids"]:
+                return
+            yield batch["ids"], [
+                Document(id=doc_id, page_content=content or "", metadata=metadata or {})
+                for doc_id, content, metadata in zip(batch["ids"], batch["documents"], batch["metadatas"])
+            ]
+            offset += len(batch["ids"])
+
+    def delete(self, ids):
+        if not ids:
+            return self.write_version()
+        self._collection.delete(ids=list(ids))
+        return self._bump_version()
+
+    def count(self):
+        return self._collection.count()
+
+    def warm_up(self):
+        """컬렉션과 HNSW 인덱스를 미리 메모리에 올려 첫 요청의 지연을 없앤다"""
+        sample = self._collection.peek(limit=1)
+        if sample["embeddings"] is not None and len(sample["embeddings"]):
+            self._collection.query(query_embeddings=[sample["embeddings"][0]], n_results=1)
+
+    def close(self):
+        """Chroma 클라이언트가 잡고 있는 SQLite 연결과 인덱스 정리"""
+        self.vector_store._client.clear_system_cache()
+
+
+class MemmapVectorIndex:
+    """
+    메모리 맵 .npy 행렬 위의 정확한(brute-force) 벡터 인덱스
+
+    수만 건 규모에서는 정규화된 float32 행렬 하나에 대한 행렬곱 + argpartition이
+    HNSW보다 빠르고 결과도 정확하다. 파일 구성은 다음과 같다.
+
+    - vectors.{generation}.npy: (capacity, dim) float32, 행 단위 L2 정규화
+    - codes.{generation}.npy: (capacity, len(FILTER_FIELDS) + 1) uint8, 메타데이터 enum 코드와 유효 여부
+    - records.jsonl: 행 순서대로 id/본문/메타데이터 (append-only)
+    - meta.json: dim, count, deleted, capacity, generation, write_version
+
+    쓰기는 append-only(삭제는 유효 컬럼을 0으로 바꾸는 tombstone)이고 파일 잠금으로 프로세스 간 직렬화한다. 용량이 차면 두 배 크기의
+    새 generation 파일로 옮긴다. 읽기 쪽(다른 uvicorn 워커)은 meta.json이 바뀌었을 때만
+    다시 매핑하므로 같은 페이지 캐시를 공유한다.
+    """
+
+    def __init__(self, directory: str, initial_capacity: int = 1024):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.initial_capacity = initial_capacity
+        self._meta_path = os.path.join(directory, "meta.json")
+        self._records_path = os.path.join(directory, "records.jsonl")
+        self._lock_path = os.path.join(directory, "write.lock")
+        self._lock = threading.RLock()
+
+        self._meta = {"dim": None, "count": 0, "deleted": 0, "capacity": 0, "generation": 0, VERSION_KEY: 0}
+        self._vectors: Optional[np.ndarray] = None
+        self._codes: Optional[np.ndarray] = None
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._documents: List[str] = []
+        self._metadatas: List[dict] = []
+        self._records_offset = 0
+        self._refresh()
+
+    def _path(self, name: str, generation: int) -> str:
+        return os.path.join(self.directory, f"{name}.{generation}.npy")
+
+    def _file_lock(self):
+        return file_lock(self._lock_path)
+
+    def _write_meta(self):
+        tmp_path = self._meta_path + ".tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(self._meta, file)
+        os.replace(tmp_path, self._meta_path)
+
+    def _refresh(self):
+        """다른 프로세스가 추가한 행이 있으면 매핑과 레코드를 갱신"""
+        with self._lock:
+            # mtime은 해상도가 거칠어 연속 쓰기를 놓칠 수 있으므로 작은 meta.json을 매번 읽는다
+            try:
+                with open(self._meta_path) as file:
+                    meta = json.load(file)
+            except FileNotFoundError:
+                return
+            if self._vectors is not None and meta == self._meta:
+                return
+
+            if self._vectors is None or meta["generation"] != self._meta["generation"]:
+                self._vectors = np.load(self._path("vectors", meta["generation"]), mmap_mode="r+")
+                self._codes = np.load(self._path("codes", meta["generation"]), mmap_mode="r+")
+            self._meta = meta
+            self._load_records(meta["count"])
+
+    def _load_records(self, count: int):
+        if len(self._ids) >= count:
+            return
+        with open(self._records_path, "rb") as file:
+            file.seek(self._records_offset)
+            while len(self._ids) < count:
+                line = file.readline()
+                if not line.endswith(b"\n"):
+                    break
+                record = json.loads(line)
+                self._rows[record["id"]] = len(self._ids)
+                self._ids.append(record["id"])
+                self._documents.append(record["document"])
+                self._metadatas.append(record["metadata"])
+                self._records_offset += len(line)
+
+    def _grow(self, required: int, dim: int):
+        capacity = max(required, self._meta["capacity"] * 2, self.initial_capacity)
+        generation = self._meta["generation"] + 1
+        count = self._meta["count"]
+
+        vectors = np.lib.format.open_memmap(
+            self._path("vectors", generation), mode="w+", dtype=np.float32, shape=(capacity, dim)
+        )
+        codes = np.lib.format.open_memmap(
+            self._path("codes", generation), mode="w+", dtype=np.uint8, shape=(capacity, len(FILTER_FIELDS) + 1)
+        )
+        if self._vectors is not None:
+            vectors[:count] = self._vectors[:count]
+            codes[:count] = self._codes[:count]
+        vectors.flush()
+        codes.flush()
+
+        old_generation = self._meta["generation"] if self._vectors is not None else None
+        self._vectors, self._codes = vectors, codes
+        self._meta.update(dim=dim, capacity=capacity, generation=generation)
+        self._write_meta()
+        # 이전 파일을 매핑 중인 프로세스는 unlink 후에도 그대로 읽을 수 있다
+        if old_generation is not None:
+            for name in ("vectors", "codes"):
+                os.remove(self._path(name, old_generation))
+
+    @staticmethod
+    def _encode(field: str, value) -> int:
+        members = FILTER_FIELDS[field]
+        for code, member in enumerate(members):
+            if member.value == value or member == value:
+                return code
+        return MISSING_CODE
+
+    def add(self, ids, embeddings, documents):
+        if not ids:
+            return self.write_version()
+        vectors = normalize_rows(np.asarray(embeddings, dtype=np.float32))
+        with self._lock, self._file_lock():
+            self._refresh()
+            dim = self._meta["dim"] or vectors.shape[1]
+            if vectors.shape[1] != dim:
+                raise ValueError(f"임베딩 차원이 인덱스({dim})와 다릅니다: {vectors.shape[1]}")
+
+            start = self._meta["count"]
+            end = start + len(ids)
+            if end > self._meta["capacity"]:
+                self._grow(end, dim)
+
+            self._vectors[start:end] = vectors
+            self._codes[start:end] = [
+                [self._encode(field, doc.metadata.get(field)) for field in FILTER_FIELDS] + [1]
+                for doc in documents
+            ]
+            self._vectors.flush()
+            self._codes.flush()
+
+            # 레코드를 먼저 쓰고 meta.json의 count를 마지막에 올려야 읽기 쪽이 반쯤 쓴 행을 보지 않는다
+            with open(self._records_path, "ab") as file:
+                for doc_id, doc in zip(ids, documents):
+                    file.write(json.dumps(
+                        {"id": doc_id, "document": doc.page_content, "metadata": doc.metadata},
+                        ensure_ascii=False,
+                        default=str,
+                    ).encode("utf-8") + b"\n")
+            self._meta["count"] = end
+            self._meta[VERSION_KEY] = self._meta.get(VERSION_KEY, 0) + 1
+            self._write_meta()
+            self._load_records(end)
+            return self._meta[VERSION_KEY]
+
+    def delete(self, ids):
+        with self._lock, self._file_lock():
+            self._refresh()
+            rows = [self._rows[doc_id] for doc_id in ids if doc_id in self._rows]
+            rows = [row for row in rows if self._codes[row, ALIVE_COLUMN]]
+            if not rows:
+                return self._meta.get(VERSION_KEY, 0)
+            self._codes[rows, ALIVE_COLUMN] = 0
+            self._codes.flush()
+            self._meta["deleted"] += len(rows)
+            self._meta[VERSION_KEY] = self._meta.get(VERSION_KEY, 0) + 1
+            self._write_meta()
+            return self._meta[VERSION_KEY]
+
+    def _mask(self, filter_metadata: Optional[Dict], count: int) -> Optional[np.ndarray]:
+        if not filter_metadata and not self._meta["deleted"]:
+            return None
+        mask = self._codes[:count, ALIVE_COLUMN] == 1
+        columns = list(FILTER_FIELDS)
+        for field, value in (filter_metadata or {}).items():
+            if field in FILTER_FIELDS:
+                mask &= self._codes[:count, columns.index(field)] == self._encode(field, value)
+            else:
+                mask &= np.fromiter(
+                    (metadata.get(field) == value for metadata in self._metadatas[:count]),
+                    dtype=bool,
+                    count=count,
+                )
+        return mask
+
+    def _document(self, row: int) -> Document:
+        return Document(id=self._ids[row], page_content=self._documents[row], metadata=self._metadatas[row])
+
+    def search(self, embedding, k, filter_metadata=None):
+        self._refresh()
+        with self._lock:
+            count = self._meta["count"]
+            if count == 0 or k <= 0:
+                return []
+            query = normalize_rows(np.asarray(embedding, dtype=np.float32))
+
+            mask = self._mask(filter_metadata, count)
+            if mask is None:
+                rows = None
+                scores = self._vectors[:count] @ query
+            else:
+                rows = np.flatnonzero(mask)
+                if len(rows) == 0:
+                    return []
+                scores = self._vectors[rows] @ query
+
+            top = top_k_rows(scores, k)
+            if rows is not None:
+                top = rows[top]
+            return [self._document(row) for row in top]
+
+    def search_candidates(self, embedding, ids, k):
+        self._refresh()
+        with self._lock:
+            rows = np.array([self._rows[doc_id] for doc_id in ids if doc_id in self._rows], dtype=np.int64)
+            rows = rows[self._codes[rows, ALIVE_COLUMN] == 1]
+            if len(rows) == 0:
+                return []
+            scores = self._vectors[rows] @ normalize_rows(np.asarray(embedding, dtype=np.float32))
+            return [self._document(row) for row in rows[top_k_rows(scores, k)]]
+
+    def get(self, filter_metadata):
+        self._refresh()
+        with self._lock:
+            if self._meta["count"] == 0:
+                return []
+            mask = self._mask(filter_metadata, self._meta["count"])
+            rows = range(self._meta["count"]) if mask is None else np.flatnonzero(mask)
+            return [self._document(row) for row in rows]
+
+    def iter_documents(self, page_size=1000):
+        self._refresh()
+        count = self._meta["count"]
+        for start in range(0, count, page_size):
+            end = min(start + page_size, count)
+            rows = start + np.flatnonzero(self._codes[start:end, ALIVE_COLUMN] == 1)
+            yield [self._ids[row] for row in rows], [self._document(row) for row in rows]
+
+    def count(self):
+        self._refresh()
+        return self._meta["count"] - self._meta["deleted"]
+
+    def write_version(self):
+        self._refresh()
+        return self._meta.get(VERSION_KEY, 0)
+
+    def warm_up(self):
+        """행렬 페이지를 미리 읽어 첫 검색에서 디스크 I/O가 생기지 않게 한다"""
+        if self._vectors is not None:
+            float(self._vectors[: self._meta["count"]].sum())
+
+    def close(self):
+        with self._lock:
+            self._vectors = None
+            self._codes = None
@@ -1,22 +1,107 @@
 from langchain_community.vectorstores import Chroma
 from langchain_core.documents import Document
+from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_openai import OpenAIEmbeddings
 from dotenv import load_dotenv
+import asyncio
+import hashlib
+import json
 import os
-from typing import List, Dict
-from uuid import UUID
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import List, Dict, Optional, Union
+from uuid import UUID, uuid4
 from schemas.enums import JobCategory, YearsOfExperience, ProgrammingLanguage
+from llm.lexical_index import BM25Index, reciprocal_rank_fusion
+from llm.vector_index import ChromaVectorIndex, MemmapVectorIndex, VectorIndex
+from llm.metadata_index import MetadataBitmapIndex
+
+
+# 마지막 검색 계획은 요청(스레드/태스크 컨텍스트)마다 따로 둔다. 공유 싱글톤 속성에 두면 동시 요청끼리 덮어쓴다
+_search_plan: ContextVar[Optional[Dict]] = ContextVar("search_plan", default=None)
+
+
+def resume_content_hash(content: Union[str, List[str]], metadata: Dict) -> str:
+    """요약과 메타데이터가 같으면 같은 값. upsert 시 변경 여부 판단에 사용"""
+    payload = json.dumps([content, metadata], ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def aggregate_by_resume(docs: List[Document], k: int, method: str = "max", top_n: int = 3) -> List[Document]:
+    """
+    순위가 매겨진 청크 검색 결과를 이력서 단위로 묶는다
+
+    청크 점수는 순위 기반(1 / (60 + rank))으로 두고, 이력서 점수는 가장 좋은 청크(max) 또는
+    상위 top_n개 청크 점수의 합(sum_top_n)으로 계산한다. 이력서마다 가장 잘 맞는 청크 하나만
+    남기므로 같은 이력서가 여러 번 나오지 않고, 재정렬기에도 후보당 한 쌍만 넘어간다.
+    """
+    chunk_scores: Dict[str, List[float]] = defaultdict(list)
+    best_chunk: Dict[str, Document] = {}
+    for rank, doc in enumerate(docs):
+        resume_id = str(doc.metadata.get("resume_id", doc.id))
+        chunk_scores[resume_id].append(1 / (60 + rank + 1))
+        best_chunk.setdefault(resume_id, doc)
+
+    if method == "sum_top_n":
+        scores = {resume_id: sum(values[:top_n]) for resume_id, values in chunk_scores.items()}
+    else:
+        scores = {resume_id: values[0] for resume_id, values in chunk_scores.items()}
+    ranked = sorted(scores, key=lambda resume_id: scores[resume_id], reverse=True)
+    return [best_chunk[resume_id] for resume_id in ranked[:k]]
 
 
 class VectorStoreManager:
     def __init__(self, 
                  embeddings, 
-                 persist_directory: str = "db/chroma.sqlite3"):
+                 persist_directory: str = "db/chroma.sqlite3",
+                 search_mode: str = "hybrid",
+                 lexical_sync_interval: float = 5.0,
+                 backend: str = "chroma",
+                 exact_search_threshold: int = 2000,
+                 debug: bool = False,
+                 index_granularity: str = "resume",
+                 chunk_size: int = 500,
+                 chunk_overlap: int = 50,
+                 chunk_aggregation: str = "max",
+                 chunk_top_n: int = 3,
+                 chunk_fanout: int = 4):
         load_dotenv()
 
         self.embeddings = embeddings
         self.persist_directory = persist_directory
-        self.vector_store = self._load_or_create_vector_store()
+        # chroma(HNSW) | memmap(메모리 맵 행렬에 대한 정확한 brute-force 검색)
+        self.backend = backend
+        self.index: VectorIndex = self._create_index(backend)
+        # dense | lexical | hybrid(BM25 + 임베딩 검색을 RRF로 결합)
+        self.search_mode = search_mode
+        # BM25 색인과 메타데이터 비트맵은 벡터 인덱스에 저장된 문서로부터 만들고,
+        # 이후 추가분은 쓰기 경로에서 바로 반영한다
+        self.lexical_index = BM25Index()
+        self.metadata_index = MetadataBitmapIndex()
+        self.lexical_sync_interval = lexical_sync_interval
+        self._lexical_synced_at = 0.0
+        # 색인이 반영하고 있는 벡터 인덱스의 쓰기 버전
+        self._index_version = 0
+        self._lexical_lock = threading.Lock()
+        # 같은 resume_id에 대한 조회-쓰기-삭제(upsert)를 한 번에 하나씩 수행
+        self._write_lock = threading.RLock()
+        self._rebuild_lexical_index()
+        # 필터 후보가 이 수 이하면 후보만 정확히 점수 계산, 넘으면 ANN(where 절) 검색
+        self.exact_search_threshold = exact_search_threshold
+        self.debug = debug
+        # resume: 이력서 하나를 문서 하나로 저장 / chunk: 청크마다 resume_id와 함께 저장하고 검색 시 이력서 단위로 집계
+        self.chunked = index_granularity == "chunk"
+        self.text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            separators=["\n\n", "\n", ".", "!", "?", ",", " ", "\n\n\n"],
+        )
+        self.chunk_aggregation = chunk_aggregation
+        self.chunk_top_n = chunk_top_n
+        # 청크 모드에서 이력서 k개를 얻기 위해 더 가져올 청크 배수
+        self.chunk_fanout = chunk_fanout
 
     def _load_or_create_vector_store(self) -> Chroma:
         try:
@@ -31,6 +116,28 @@ class VectorStoreManager:
                 persist_directory=self.persist_directory,
             )
 
+    def _create_index(self, backend: str) -> VectorIndex:
+        if backend == "chroma":
+            self.vector_store = self._load_or_create_vector_store()
+            return ChromaVectorIndex(self.vector_store, os.path.join(self.persist_directory, "write.lock"))
+        if backend == "memmap":
+            return MemmapVectorIndex(os.path.join(self.persist_directory, "memmap"))
+        raise ValueError(f"Unknown vector store backend: {backend}")
+
+    def warm_up(self):
+        """인덱스를 미리 메모리에 올려 첫 요청의 지연을 없앤다"""
+        self.index.warm_up()
+
+    def count(self) -> int:
+        return self.index.count()
+
+    def close(self):
+        """인덱스가 잡고 있는 연결과 매핑 정리"""
+        try:
+            self.index.close()
+        except Exception as e:
+            print(f"Vector store 종료 중 오류 발생: {e}")
+
     def create_resume_document(
         self,
         content: str,
@@ -56,92 +163,314 @@ class VectorStoreManager:
 
         return Document(page_content=content, metadata=metadata)
 
+    @staticmethod
+    def _as_text(content: Union[str, List[str]]) -> str:
+        # split_chain은 요약을 청크 리스트로 돌려준다
+        return content if isinstance(content, str) else "\n".join(content)
+
+    def create_resume_documents(
+        self,
+        content: Union[str, List[str]],
+        resume_id: UUID,
+        applicant_name: str,
+        job_category: JobCategory,
+        years: YearsOfExperience,
+        language: ProgrammingLanguage,
+        additional_metadata: Dict = None,
+    ) -> List[Document]:
+        """저장 단위(이력서 또는 청크)별 Document 목록 생성. 모든 문서에 이력서 내용 해시를 기록한다"""
+        base = self.create_resume_document(
+            self._as_text(content), resume_id, applicant_name, job_category, years, language,
+            additional_metadata,
+        )
+        content_hash = resume_content_hash(content, base.metadata)
+        if not self.chunked:
+            base.metadata["content_hash"] = content_hash
+            return [base]
+
+        chunks = self.text_splitter.split_text(content) if isinstance(content, str) else list(content)
+        return [
+            Document(
+                page_content=chunk,
+                metadata={
+                    **base.metadata,
+                    "chunk_index": chunk_index,
+                    "chunk_count": len(chunks),
+                    "content_hash": content_hash,
+                },
+            )
+            for chunk_index, chunk in enumerate(chunks)
+        ]
+
     def add_resume(
         self,
-        content: str,
+        content: Union[str, List[str]],
         resume_id: UUID,
         applicant_name: str,
         job_category: JobCategory,
         years: YearsOfExperience,
         language: ProgrammingLanguage,
         additional_metadata: Dict = None,
+        embedding: Optional[List[float]] = None,
     ):
-        """단일 이력서 추가"""
-        doc = self.create_resume_document(
-            content=content,
-            resume_id=resume_id,
-            applicant_name=applicant_name,
-            job_category=job_category,
-            years=years,
-            language=language,
-            additional_metadata=additional_metadata,
+        """단일 이력서 추가. 같은 resume_id가 이미 있으면 upsert_resume과 같이 교체한다"""
+        self.upsert_resume(
+            content, resume_id, applicant_name, job_category, years, language, additional_metadata, embedding
         )
 
-        self.vector_store.add_documents([doc])
-        self.vector_store.persist()
-
     async def add_resume_async(
         self,
-        content: str,
+        content: Union[str, List[str]],
         resume_id: UUID,
         applicant_name: str,
         job_category: JobCategory,
         years: YearsOfExperience,
         language: ProgrammingLanguage,
         additional_metadata: Dict = None,
+        embedding: Optional[List[float]] = None,
     ):
-        """단일 이력서 추가"""
-        doc = self.create_resume_document(
-            content=content,
-            resume_id=resume_id,
-            applicant_name=applicant_name,
-            job_category=job_category,
-            years=years,
-            language=language,
-            additional_metadata=additional_metadata,
+        """단일 이력서 추가. 같은 resume_id가 이미 있으면 upsert_resume_async와 같이 교체한다"""
+        await self.upsert_resume_async(
+            content, resume_id, applicant_name, job_category, years, language, additional_metadata, embedding
+        )
+
+    def upsert_resume(
+        self,
+        content: Union[str, List[str]],
+        resume_id: UUID,
+        applicant_name: str,
+        job_category: JobCategory,
+        years: YearsOfExperience,
+        language: ProgrammingLanguage,
+        additional_metadata: Dict = None,
+        embedding: Optional[List[float]] = None,
+    ) -> str:
+        """
+        resume_id 기준 upsert. 결과는 "inserted" / "updated" / "unchanged"
+
+        저장된 내용 해시와 같으면 임베딩 계산과 쓰기를 모두 건너뛰고,
+        다르면 새 문서를 쓴 뒤 이전 문서(청크)를 삭제한다.
+        """
+        docs = self.create_resume_documents(
+            content, resume_id, applicant_name, job_category, years, language, additional_metadata
+        )
+        with self._write_lock:
+            existing = self.index.get({"resume_id": resume_id})
+            if self._is_unchanged(existing, docs):
+                return "unchanged"
+            # 청크 모드에서는 이력서 전체 임베딩을 쓸 수 없으므로 청크마다 새로 계산한다(임베딩 캐시 적용)
+            use_embedding = embedding is not None and not self.chunked
+            self._write_documents(docs, [embedding] if use_embedding else None)
+            self._delete_documents([doc.id for doc in existing])
+        return "updated" if existing else "inserted"
+
+    async def upsert_resume_async(
+        self,
+        content: Union[str, List[str]],
+        resume_id: UUID,
+        applicant_name: str,
+        job_category: JobCategory,
+        years: YearsOfExperience,
+        language: ProgrammingLanguage,
+        additional_metadata: Dict = None,
+        embedding: Optional[List[float]] = None,
+    ) -> str:
+        """upsert_resume의 비동기 버전. 임베딩은 비동기 클라이언트로, 인덱스 작업은 스레드로 넘긴다"""
+        docs = self.create_resume_documents(
+            content, resume_id, applicant_name, job_category, years, language, additional_metadata
+        )
+        existing = await asyncio.to_thread(self.index.get, {"resume_id": resume_id})
+        if self._is_unchanged(existing, docs):
+            return "unchanged"
+
+        if self.chunked:
+            embeddings = await self.embeddings.aembed_documents([doc.page_content for doc in docs])
+        else:
+            embeddings = [embedding if embedding is not None else await self.aembed_content(content)]
+        return await asyncio.to_thread(self._replace_resume, resume_id, docs, embeddings)
+
+    def _replace_resume(self, resume_id, docs: List[Document], embeddings: List[List[float]]) -> str:
+        with self._write_lock:
+            # 임베딩을 계산하는 동안 다른 요청이 같은 이력서를 바꿨을 수 있으므로 다시 조회한다
+            existing = self.index.get({"resume_id": resume_id})
+            if self._is_unchanged(existing, docs):
+                return "unchanged"
+            self._write_documents(docs, embeddings)
+            self._delete_documents([doc.id for doc in existing])
+        return "updated" if existing else "inserted"
+
+    def delete_resume(self, resume_id: UUID) -> int:
+        """resume_id의 모든 문서(청크)를 삭제하고 삭제한 문서 수를 반환"""
+        with self._write_lock:
+            existing = self.index.get({"resume_id": resume_id})
+            self._delete_documents([doc.id for doc in existing])
+        return len(existing)
+
+    @staticmethod
+    def _is_unchanged(existing: List[Document], docs: List[Document]) -> bool:
+        content_hash = docs[0].metadata["content_hash"] if docs else None
+        return (
+            len(existing) == len(docs)
+            and all(doc.metadata.get("content_hash") == content_hash for doc in existing)
         )
 
-        self.vector_store.add_documents([doc])
-        self.vector_store.persist()
+    def _delete_documents(self, ids: List[str]):
+        if not ids:
+            return
+        version = self.index.delete(ids)
+        self.lexical_index.remove(ids)
+        self.metadata_index.remove(ids)
+        self._note_write(version)
+
+    def embed_content(self, content: Union[str, List[str]]) -> List[float]:
+        """저장 전에 임베딩을 미리 계산 (결과 캐시에 함께 저장하기 위함)"""
+        return self.embeddings.embed_documents([self._as_text(content)])[0]
+
+    async def aembed_content(self, content: Union[str, List[str]]) -> List[float]:
+        return (await self.embeddings.aembed_documents([self._as_text(content)]))[0]
+
+    def _write_documents(self, docs: List[Document], embeddings: Optional[List[List[float]]] = None) -> List[str]:
+        """모든 쓰기 경로가 거치는 곳. 벡터 인덱스에 저장한 뒤 같은 id로 BM25 색인과 비트맵도 갱신한다"""
+        ids = [str(uuid4()) for _ in docs]
+        if embeddings is None:
+            embeddings = self.embeddings.embed_documents([doc.page_content for doc in docs])
+        version = self.index.add(ids, embeddings, docs)
+        self.lexical_index.add(ids, docs)
+        self.metadata_index.add(ids, [doc.metadata for doc in docs])
+        self._note_write(version)
+        return ids
 
-        
     def add_resumes(self, resumes: List[Dict]):
-        """여러 이력서 일괄 추가"""
-        docs = []
-        for resume in resumes:
-            doc = self.create_resume_document(
-                content=resume["content"],
-                resume_id=resume["resume_id"],
-                applicant_name=resume["applicant_name"],
-                job_category=JobCategory(resume["job_category"]),
-                years=YearsOfExperience(resume["years"]),
-                language=ProgrammingLanguage(resume["language"]),
-                additional_metadata=resume.get("additional_metadata"),
+        """여러 이력서 일괄 upsert. 바뀐 이력서만 한 번에 임베딩해 쓰고 이전 문서를 삭제한다"""
+        # 한 배치 안에 같은 resume_id가 여러 번 있으면 마지막 것만 쓴다 (둘 다 쓰면 중복 문서가 남는다)
+        resumes = list({resume["resume_id"]: resume for resume in resumes}.values())
+        docs, stale_ids = [], []
+        with self._write_lock:
+            for resume in resumes:
+                resume_docs = self.create_resume_documents(
+                    content=resume["content"],
+                    resume_id=resume["resume_id"],
+                    applicant_name=resume["applicant_name"],
+                    job_category=JobCategory(resume["job_category"]),
+                    years=YearsOfExperience(resume["years"]),
+                    language=ProgrammingLanguage(resume["language"]),
+                    additional_metadata=resume.get("additional_metadata"),
+                )
+                existing = self.index.get({"resume_id": resume["resume_id"]})
+                if self._is_unchanged(existing, resume_docs):
+                    continue
+                docs.extend(resume_docs)
+                stale_ids.extend(doc.id for doc in existing)
+
+            if docs:
+                self._write_documents(docs)
+            self._delete_documents(stale_ids)
+
+    def _rebuild_lexical_index(self, page_size: int = 1000):
+        """벡터 인덱스에 저장된 문서 전체로 BM25 색인과 메타데이터 비트맵을 다시 만든다"""
+        # 다시 만드는 동안 들어온 쓰기는 다음 동기화에서 잡히도록 시작 시점의 버전을 기록한다
+        version = self.index.write_version()
+        index = BM25Index(k1=self.lexical_index.k1, b=self.lexical_index.b)
+        metadata_index = MetadataBitmapIndex()
+        for ids, docs in self.index.iter_documents(page_size):
+            index.add(ids, docs)
+            metadata_index.add(ids, [doc.metadata for doc in docs])
+        self.lexical_index = index
+        self.metadata_index = metadata_index
+        self._index_version = version
+        self._lexical_synced_at = time.monotonic()
+
+    def _sync_lexical_index(self):
+        """
+        다른 워커 프로세스가 쓰기(추가/삭제)를 했으면 색인을 다시 만든다
+
+        문서 수는 upsert(새 문서 쓰기 + 이전 문서 삭제)에서 그대로이므로 쓰기 버전으로 비교한다.
+        """
+        if time.monotonic() - self._lexical_synced_at < self.lexical_sync_interval:
+            return
+        with self._lexical_lock:
+            if self.index.write_version() != self._index_version:
+                self._rebuild_lexical_index()
+            self._lexical_synced_at = time.monotonic()
+
+    def _note_write(self, version: int):
+        """이 프로세스의 쓰기로 버전이 하나만 올랐으면 색인은 최신. 그 사이 다른 워커가 썼으면 다음 동기화에서 다시 만든다"""
+        with self._lexical_lock:
+            if version == self._index_version + 1:
+                self._index_version = version
+
+    @property
+    def last_search_plan(self) -> Optional[Dict]:
+        """현재 컨텍스트(요청)에서 마지막으로 실행한 dense 검색의 계획"""
+        return _search_plan.get()
+
+    def plan_search(self, filter_metadata: Optional[Dict]) -> Dict:
+        """
+        비트맵으로 후보 집합을 먼저 구하고 검색 전략을 고른다
+
+        - empty: 조건을 만족하는 문서가 없어 임베딩 호출 없이 빈 결과
+        - exact: 후보가 적으면 후보 임베딩만 가져와 정확히 점수 계산
+        - ann: 후보가 많으면 인덱스의 필터 검색(Chroma where 절 / memmap 마스크)
+        """
+        total = len(self.metadata_index)
+        plan = {"strategy": "ann", "candidates": total, "total": total, "selectivity": 1.0, "ids": None}
+        if self.metadata_index.supports(filter_metadata):
+            ids = self.metadata_index.candidates(filter_metadata)
+            plan.update(candidates=len(ids), selectivity=len(ids) / total if total else 0.0)
+            if not ids:
+                plan["strategy"] = "empty"
+            elif len(ids) <= self.exact_search_threshold:
+                plan.update(strategy="exact", ids=ids)
+        return plan
+
+    def _dense_search(self, query: str, k: int, filter_metadata: Optional[Dict]) -> List[Document]:
+        plan = self.plan_search(filter_metadata)
+        _search_plan.set({key: value for key, value in plan.items() if key != "ids"})
+        if self.debug:
+            print(
+                f"search plan: {plan['strategy']} "
+                f"(candidates={plan['candidates']}/{plan['total']}, selectivity={plan['selectivity']:.4f}, "
+                f"filter={filter_metadata})"
             )
-            docs.append(doc)
 
-        self.vector_store.add_documents(docs)
-        self.vector_store.persist()
+        if plan["strategy"] == "empty":
+            return []
+        embedding = self.embeddings.embed_query(query)
+        if plan["strategy"] == "exact":
+            return self.index.search_candidates(embedding, plan["ids"], k)
+        return self.index.search(embedding, k, filter_metadata)
 
     def search_resumes(
-        self, query: str, k: int = 5, filter_metadata: Dict = None
+        self, query: str, k: int = 5, filter_metadata: Dict = None, mode: Optional[str] = None
     ) -> List[Document]:
-        if filter_metadata:
-            # 여러 조건을 $and로 결합
-            where_clause = (
-                {"$and": [{key: value} for key, value in filter_metadata.items()]}
-                if len(filter_metadata.items()) > 1
-                else filter_metadata
-            )
+        """이력서 단위 검색 결과. 같은 이력서는 한 번만, 가장 잘 맞는 문서(청크)로 반환"""
+        mode = mode or self.search_mode
+        self._sync_lexical_index()
+        fetch_k = k * self.chunk_fanout if self.chunked else k
+
+        if mode == "dense":
+            results = self._dense_search(query, fetch_k, filter_metadata)
         else:
-            where_clause = None
+            lexical_results = self.lexical_index.search(query, k=fetch_k, filter_metadata=filter_metadata)
+            # "Spring Boot Kafka MSA"처럼 색인에 있는 키워드만으로 된 질의는 임베딩 호출 없이 BM25 결과만 쓴다
+            if mode == "lexical" or (
+                len(lexical_results) >= fetch_k and self.lexical_index.is_keyword_query(query)
+            ):
+                results = lexical_results
+            else:
+                dense_results = self._dense_search(query, fetch_k, filter_metadata)
+                results = reciprocal_rank_fusion([dense_results, lexical_results])
 
-        return self.vector_store.similarity_search(
-            query=query, k=k, filter=where_clause
-        )
+        return aggregate_by_resume(results, k, method=self.chunk_aggregation, top_n=self.chunk_top_n)
 
-    def get_resume_info(self, resume_id: int) -> Document:
-        return self.vector_store.get(where={"resume_id": resume_id})
+    def get_resume_info(self, resume_id: int) -> Dict:
+        docs = self.index.get({"resume_id": resume_id})
+        docs.sort(key=lambda doc: doc.metadata.get("chunk_index", 0))
+        return {
+            "ids": [doc.id for doc in docs],
+            "documents": [doc.page_content for doc in docs],
+            "metadatas": [doc.metadata for doc in docs],
+        }
 
 
 # 사용 예시
@@ -1,38 +1,62 @@
 from fastapi import FastAPI, APIRouter, BackgroundTasks, HTTPException, Depends
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from uuid import UUID
-from langchain_openai import OpenAIEmbeddings
 from llm.model import llm
 from llm.vector_store import VectorStoreManager
-from llm.generate_question import generate_question
+from llm.generate_question import generate_question, astream_questions
 from llm.extract import ContentExtractor, section_chain, split_chain, summarize_chain
 from llm.recommend import QueryInfoExtractor
+from llm.ingest import BulkIngestor, collect_local_pdfs
+from llm.resume_cache import ResumeResultCache
+from llm.metrics import LLM_METRICS
 
 from containers import Container
 from dependency_injector.wiring import inject, Provide
 
-from preprocess.load_pdf import PDFLoader
-from preprocess.parse_pdf import PyPDFParser
+from preprocess.load_pdf import PDFLoader, InvalidPDFError
+from preprocess.pdf_engine import ParallelPDFParser
 
-from schemas.request import ResumeRecommendRequest, ResumeExtractRequest
+from schemas.request import ResumeRecommendRequest, ResumeExtractRequest, ResumeBulkIngestRequest
 from schemas.response import RecommendedResumeResponse, ResumeInfoResponse, InterviewQuestionResponse
+from schemas.enums import QuestionType
 
 from dotenv import load_dotenv
+from contextlib import asynccontextmanager
+import asyncio
+import json
 import os
+import time
 
 container = Container()
 container.config.chain_type.override("section")
 
 load_dotenv()
 
-app = FastAPI()
-app.llm = llm
-app.pdf_loader = PDFLoader(storage_type="local")
-app.pdf_parser = PyPDFParser()
-app.content_extractor = ContentExtractor(section_chain)
-app.query_info_extractor = QueryInfoExtractor(llm=app.llm)
 
-app.embeddings = OpenAIEmbeddings(openai_api_key=os.getenv("OPENAI_API_KEY"))
-app.vector_store = VectorStoreManager(embeddings=app.embeddings, persist_directory="db")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 엔드포인트가 모두 정의된 뒤에 주입을 연결하고,
+    # 임베딩 클라이언트, 벡터 스토어를 시작 시점에 한 번 열고 워밍업
+    container.wire(modules=[__name__])
+    container.init_resources()
+    container.query_info_extractor()
+    yield
+    container.shutdown_resources()
+    app.pdf_parser.close()
+
+
+app = FastAPI(lifespan=lifespan)
+app.llm = llm
+app.pdf_loader = PDFLoader(storage_type="local", max_bytes=container.config.pdf_max_bytes())
+# PDF 파싱은 CPU 작업이라 페이지 단위로 나눠 별도 프로세스 풀에서 시간 제한을 두고 실행
+app.pdf_parser = ParallelPDFParser(
+    backend=container.config.pdf_backend(),
+    workers=container.config.parse_workers(),
+    max_pages=container.config.pdf_max_pages(),
+    page_timeout=container.config.pdf_page_timeout(),
+    document_timeout=container.config.pdf_document_timeout(),
+)
+app.content_extractor = container.content_extractor()
 
 
 ai_router = APIRouter(
@@ -48,9 +72,43 @@ ai_router = APIRouter(
                 )
 @inject
 def recommend_resumes(req: ResumeRecommendRequest, 
-                      container: Container = Depends(Provide(Container))
+                      container: Container = Depends(Provide[Container])
                       ) -> list[RecommendedResumeResponse]:
-    return container.query_info_extractor.select_fit_resumes(req.message, container.vector_store_manager)
+    return container.query_info_extractor().select_fit_resumes(req.message, container.vector_store_manager())
+
+
+
+@ai_router.post('/recommend/stream',
+                summary="질문을 기반으로 적합한 이력서 추천 (SSE)",
+                description="검색된 후보를 먼저 보내고(retrieved), 재정렬 점수가 계산되면 후보(candidate)를 순서대로 전송",
+                response_description="text/event-stream",
+                )
+@inject
+async def recommend_resumes_stream(req: ResumeRecommendRequest,
+                                   container: Container = Depends(Provide[Container])
+                                   ) -> StreamingResponse:
+    query_info_extractor = container.query_info_extractor()
+    vector_store_manager = container.vector_store_manager()
+
+    async def events():
+        timer = StreamTimer()
+        try:
+            search_results = await asyncio.to_thread(
+                query_info_extractor.retrieve, req.message, vector_store_manager
+            )
+            yield timer.event("retrieved", {"candidates": [result.metadata for result in search_results]})
+
+            reranked_results = await asyncio.to_thread(
+                query_info_extractor.rerank, req.message, search_results
+            )
+            for result in reranked_results:
+                yield timer.event("candidate", {**result.metadata, "score": float(result.score)})
+        except Exception as e:
+            print(e)
+            yield timer.event("error", {"detail": "이력서 추천 중 오류가 발생했습니다"})
+        yield timer.done()
+
+    return StreamingResponse(events(), media_type="text/event-stream")
 
 
 
@@ -62,16 +120,122 @@ def recommend_resumes(req: ResumeRecommendRequest,
 )
 @inject
 def generate_questions(resume_id: str,
-                       container: Container = Depends(Provide(Container))
+                       container: Container = Depends(Provide[Container])
                        ) -> list[InterviewQuestionResponse]:
 
-    resume_info = container.vector_store_manager.get_resume_info(resume_id) 
-    questions = generate_question(''.join(resume_info['documents']))
+    summary = load_resume_summary(container, resume_id)
+
+    # 같은 이력서(요약)를 다시 조회하면 LLM 호출 없이 캐시된 질문 반환
+    question_cache = container.question_cache()
+    questions = question_cache.get(resume_id, summary)
+    if questions is None:
+        questions = generate_question(summary, mode=container.config.question_mode())
+        question_cache.put(resume_id, summary, questions)
 
     return questions
 
 
 
+@ai_router.post(
+    "/resumes/{resume_id}/generate-questions/stream",
+    summary="이력서를 기반으로 질문 생성 (SSE)",
+    description="질문 유형별 체인이 끝나는 대로 질문(question) 이벤트를 전송",
+    response_description="text/event-stream",
+)
+@inject
+async def generate_questions_stream(resume_id: str,
+                                    container: Container = Depends(Provide[Container])
+                                    ) -> StreamingResponse:
+    question_cache = container.question_cache()
+    # 없는 이력서는 스트림을 열기 전에 비스트리밍 엔드포인트와 같은 404로 응답
+    summary = await asyncio.to_thread(load_resume_summary, container, resume_id)
+
+    async def events():
+        timer = StreamTimer()
+        try:
+            questions = question_cache.get(resume_id, summary)
+            if questions is not None:
+                for question in questions:
+                    yield timer.event("question", question.model_dump(mode="json"))
+            else:
+                questions = []
+                async for question in astream_questions(summary):
+                    questions.append(question)
+                    yield timer.event("question", question.model_dump(mode="json"))
+                # 완료 순서가 아닌 질문 유형 순서로 캐시해 비스트리밍 엔드포인트와 같은 순서로 반환
+                order = list(QuestionType)
+                questions.sort(key=lambda question: order.index(question.question_type))
+                question_cache.put(resume_id, summary, questions)
+        except Exception as e:
+            print(e)
+            yield timer.event("error", {"detail": "질문 생성 중 오류가 발생했습니다"})
+        yield timer.done()
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@ai_router.delete(
+    "/resumes/{resume_id}",
+    summary="이력서 삭제",
+    description="벡터DB 문서(청크), 문서 저장소의 요약, 생성 질문 캐시를 함께 삭제",
+    response_description="삭제한 벡터DB 문서 수",
+)
+@inject
+def delete_resume(resume_id: str,
+                  container: Container = Depends(Provide[Container])
+                  ) -> dict:
+    # 벡터 인덱스를 먼저 지워야 질문 생성 요청이 벡터 인덱스에서 요약을 다시 옮겨 오지 않는다
+    deleted = container.vector_store_manager().delete_resume(resume_id)
+    stored = container.document_store().delete(resume_id)
+    container.question_cache().invalidate(resume_id)
+    if not deleted and not stored:
+        raise HTTPException(status_code=404, detail="이력서를 찾을 수 없습니다")
+    return {"status": "deleted", "documents": deleted}
+
+
+def load_resume_summary(container: Container, resume_id: str) -> str:
+    """문서 저장소에서 요약을 조회. 저장소 도입 전에 저장된 이력서는 벡터 인덱스에서 한 번 읽어 옮겨 둔다"""
+    document_store = container.document_store()
+    stored = document_store.get(resume_id)
+    if stored is not None:
+        return stored.summary_text
+
+    resume_info = container.vector_store_manager().get_resume_info(resume_id)
+    if not resume_info['documents']:
+        raise HTTPException(status_code=404, detail="이력서를 찾을 수 없습니다")
+    summary = ''.join(resume_info['documents'])
+    metadata = resume_info['metadatas'][0]
+    document_store.put(resume_id, summary, ResumeInfoResponse(
+        resume_id=resume_id,
+        applicant_name=metadata['applicant_name'],
+        job_category=metadata['job_category'],
+        years=metadata['years'],
+        language=metadata['language'],
+    ))
+    return summary
+
+
+class StreamTimer:
+    """SSE 이벤트 포맷팅과 요청 시작 기준 경과 시간(첫 이벤트 시간 포함) 기록"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.first_event_ms = None
+
+    def elapsed_ms(self) -> float:
+        return round((time.perf_counter() - self.start) * 1000, 1)
+
+    def event(self, event: str, data: dict) -> str:
+        elapsed_ms = self.elapsed_ms()
+        if self.first_event_ms is None:
+            self.first_event_ms = elapsed_ms
+        payload = json.dumps({**data, "elapsed_ms": elapsed_ms}, ensure_ascii=False, default=str)
+        return f"event: {event}\ndata: {payload}\n\n"
+
+    def done(self) -> str:
+        return self.event("done", {"first_event_ms": self.first_event_ms})
+
+
 @ai_router.post(
     "/process-resume",
     summary="전달받은 이력서를 전처리(PDF->텍스트)하고, 필요한 정보 추출 및 벡터DB에 저장",
@@ -79,40 +243,150 @@ def generate_questions(resume_id: str,
     response_description="",
 )
 @inject
-def process_resume(req: ResumeExtractRequest,  background_tasks: BackgroundTasks,
-                   container: Container = Depends(Provide(Container))
-                   ) -> ResumeInfoResponse:
+async def process_resume(req: ResumeExtractRequest,  background_tasks: BackgroundTasks,
+                         container: Container = Depends(Provide[Container])
+                         ) -> ResumeInfoResponse:
     
     try:
-        pdf_data = app.pdf_loader.load_pdf(req.file_path)
-        parsed_documents = app.pdf_parser.parse_pdf(pdf_data)
-        content = app.content_extractor.extract_content(parsed_documents['documents'])
-        
+        # 로컬 PDF는 mmap으로 열어 해시에 복사 없이 넘기고(파서 워커에는 경로만 전달), 블록을 벗어나면 바로 해제
+        with app.pdf_loader.open_pdf(req.file_path) as pdf_data:
+            # 같은 PDF가 다시 들어오면 파싱/LLM/임베딩 호출 없이 캐시 결과 사용
+            resume_cache = container.resume_cache()
+            content_hash = resume_cache.content_hash(pdf_data)
+            cached = await asyncio.to_thread(resume_cache.get, content_hash)
+
+            if cached is None:
+                parsed_documents = await asyncio.to_thread(app.pdf_parser.parse_pdf, pdf_data)
+
+        if cached is not None:
+            resume_info, summary, embedding = cached.resume_info, cached.summary, cached.embedding or None
+        else:
+            content = await app.content_extractor.aextract_content(parsed_documents)
+            resume_info, summary, embedding = content['resume_info'], content['summary'], None
+
         response = ResumeInfoResponse(
             resume_id=req.resume_id,
-            applicant_name=content['resume_info'].applicant_name,
-            job_category=content['resume_info'].job_category,
-            years=content['resume_info'].years,
-            language=content['resume_info'].language,
+            applicant_name=resume_info.applicant_name,
+            job_category=resume_info.job_category,
+            years=resume_info.years,
+            language=resume_info.language,
         )
+
+        # 질문 생성은 벡터 인덱스 대신 문서 저장소에서 요약을 읽는다 (임베딩 저장 완료 전에도 조회 가능)
+        await asyncio.to_thread(container.document_store().put, req.resume_id, summary, response)
+
+        # 재처리된 이력서는 이전에 생성한 질문을 더 이상 쓰지 않는다
+        container.question_cache().invalidate(req.resume_id)
         
         background_tasks.add_task(
-            container.vector_store_manager.add_resume_async, 
-            content['summary'],
-            req.resume_id, 
-            response.applicant_name,
-            response.job_category,
-            response.years,
-            response.language
+            store_resume,
+            container.vector_store_manager(),
+            resume_cache,
+            content_hash,
+            summary,
+            response,
+            embedding,
         )
 
         return response
-        
+
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="이력서 파일을 찾을 수 없습니다")
+    except InvalidPDFError as e:
+        print(e)
+        raise HTTPException(status_code=422, detail="PDF 파일이 아니거나 허용 크기를 넘었습니다")
     except Exception as e:
         print(e)
         raise HTTPException(status_code=422, detail="이력서 분석 중 오류가 발생했습니다")
 
 
+async def store_resume(vector_store_manager: VectorStoreManager,
+                       resume_cache: ResumeResultCache,
+                       content_hash: str,
+                       summary: str | list[str],
+                       resume_info: ResumeInfoResponse,
+                       embedding: list[float] | None = None):
+    """임베딩 계산 후 결과 캐시와 벡터DB에 저장. 캐시 히트면 저장된 임베딩을 그대로 사용"""
+    if embedding is None:
+        # 청크 모드는 청크별 임베딩을 저장 시점에 계산하므로(임베딩 캐시 적용) 요약 전체 임베딩은 만들지 않는다
+        if not vector_store_manager.chunked:
+            embedding = await vector_store_manager.aembed_content(summary)
+        await asyncio.to_thread(resume_cache.put, content_hash, summary, resume_info, embedding or [])
+
+    await vector_store_manager.add_resume_async(
+        summary,
+        resume_info.resume_id,
+        resume_info.applicant_name,
+        resume_info.job_category,
+        resume_info.years,
+        resume_info.language,
+        embedding=embedding,
+    )
+
+
+def resolve_ingest_directory(directory: str, root: str) -> str | None:
+    """directory를 ingest_root 기준으로 해석. 심볼릭 링크/..를 풀었을 때 root 밖이면 None"""
+    root = os.path.realpath(root)
+    resolved = os.path.realpath(os.path.join(root, directory))
+    if os.path.commonpath([root, resolved]) != root:
+        return None
+    return resolved
+
+
+@ai_router.post(
+    "/ingest",
+    summary="이력서 PDF 대량 적재",
+    description="로컬 디렉토리 또는 S3 키 목록의 이력서를 파싱/추출하여 배치 단위로 벡터DB에 저장. 적재는 백그라운드로 실행",
+    response_description="적재 대상 이력서 수",
+)
+@inject
+def ingest_resumes(req: ResumeBulkIngestRequest, background_tasks: BackgroundTasks,
+                   container: Container = Depends(Provide[Container])
+                   ) -> dict:
+    if req.directory:
+        storage_type = "local"
+        directory = resolve_ingest_directory(req.directory, container.config.ingest_root())
+        if directory is None:
+            raise HTTPException(status_code=403, detail="적재 가능한 디렉토리가 아닙니다")
+        try:
+            file_paths = collect_local_pdfs(directory)
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="디렉토리를 찾을 수 없습니다")
+    elif req.file_paths:
+        storage_type, file_paths = "s3", req.file_paths
+    else:
+        raise HTTPException(status_code=422, detail="directory 또는 file_paths가 필요합니다")
+
+    ingestor = BulkIngestor(
+        content_extractor=app.content_extractor,
+        vector_store_manager=container.vector_store_manager(),
+        storage_type=storage_type,
+        document_store=container.document_store(),
+        s3_fetcher=container.s3_fetcher() if storage_type == "s3" else None,
+        # 요청 처리와 같은 시간 제한/페이지 상한의 파서 풀을 같이 쓴다
+        pdf_parser=app.pdf_parser,
+    )
+    background_tasks.add_task(ingestor.ingest, file_paths)
+
+    return {"status": "accepted", "total": len(file_paths)}
+
+
+@ai_router.get("/cache-stats")
+@inject
+def cache_stats(container: Container = Depends(Provide[Container])):
+    return {
+        "embeddings": container.embeddings().stats(),
+        "resume_result": container.resume_cache().stats(),
+        "documents": container.document_store().stats(),
+    }
+
+
+@ai_router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """체인별 LLM 지연/TTFT/토큰/비용 히스토그램 (Prometheus 텍스트 포맷)"""
+    return PlainTextResponse(LLM_METRICS.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
 @ai_router.get("/healthcheck")
 def healthcheck():
     return {"status": "ok"}
@@ -0,0 +1,200 @@
+import math
+import re
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from typing import List, Optional
+
+from langchain.schema import Document
+
+
+# 줄 바꿈 없이 폭만 차지하는 공백/제로폭 문자
+SPACE_CHARS = re.compile(r"[\u00a0\u2000-\u200a\u202f\u3000\t\f\v]")
+ZERO_WIDTH_CHARS = re.compile(r"[\u200b-\u200d\u2060\ufeff]")
+SPACE_RUN = re.compile(r" {2,}")
+# PyPDF2가 문장 부호/괄호 앞뒤에 넣는 공백 ("입니다 .", "(1 년 )")
+SPACE_BEFORE_PUNCT = re.compile(r"(?<=\S) +([.,!?;:)\]}])")
+SPACE_AFTER_BRACKET = re.compile(r"([(\[{]) +")
+
+PAGE_NUMBER = re.compile(
+    r"^(?:-\s*\d+\s*-|\d+\s*/\s*\d+|page\s*\d+(?:\s*(?:of|/)\s*\d+)?|\d+\s*(?:페이지|쪽))$",
+    re.IGNORECASE,
+)
+# 숫자만 있는 줄은 연도/기간일 수도 있어서 쪽 번호와 맞을 때만 지운다 (_remove_boilerplate)
+BARE_NUMBER = re.compile(r"^\d+$")
+BULLET = re.compile(r"^(?:[-–•·*▪◦○●■□▶►※✔✓]|\d+[.)]|[가-힣A-Za-z][.)]\s)")
+SENTENCE_END = re.compile(r"(?:[.!?:;。)\]]|[다요음함됨])$")
+DIGITS = re.compile(r"\d+")
+
+
+def normalize_line(line: str) -> str:
+    line = ZERO_WIDTH_CHARS.sub("", SPACE_CHARS.sub(" ", line))
+    line = SPACE_RUN.sub(" ", line).strip()
+    line = SPACE_BEFORE_PUNCT.sub(r"\1", line)
+    return SPACE_AFTER_BRACKET.sub(r"\1", line)
+
+
+class TokenCounter:
+    """
+    tiktoken으로 토큰 수를 세고 자른다
+
+    인코딩 파일을 받을 수 없는 환경(오프라인)에서는 UTF-8 4바이트 ≈ 1토큰으로 근사한다.
+    """
+
+    def __init__(self, encoding_name: str = "o200k_base"):
+        self.encoding_name = encoding_name
+        try:
+            import tiktoken
+            self.encoding = tiktoken.get_encoding(encoding_name)
+        except Exception as e:
+            print(f"tiktoken encoding {encoding_name} unavailable, using byte estimate: {type(e).__name__}")
+            self.encoding = None
+
+    def count(self, text: str) -> int:
+        if self.encoding is not None:
+            return len(self.encoding.encode(text, disallowed_special=()))
+        return math.ceil(len(text.encode("utf-8")) / 4)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        if self.encoding is not None:
+            tokens = self.encoding.encode(text, disallowed_special=())
+            if len(tokens) <= max_tokens:
+                return text
+            # 잘린 멀티바이트 문자는 버린다
+            return self.encoding.decode_bytes(tokens[:max_tokens]).decode("utf-8", errors="ignore")
+        return text.encode("utf-8")[:max_tokens * 4].decode("utf-8", errors="ignore")
+
+
+@dataclass
+class CompactionReport:
+    pages: int
+    original_tokens: int
+    compacted_tokens: int
+    removed_lines: int
+    truncated: bool
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.original_tokens - self.compacted_tokens
+
+
+class ResumeCompactor:
+    """
+    파싱된 페이지를 LLM 입력용 텍스트로 압축하는 결정적 전처리
+
+    1. 공백/유니코드 정규화 (NFC, 제로폭 문자, 연속 공백, 문장 부호 앞 공백)
+    2. 여러 페이지의 위/아래 edge_lines 줄에 반복되는 머리글/바닥글(첫 등장은 유지)과 쪽 번호 제거.
+       숫자만 있는 줄은 쪽 순서와 같거나, 여러 페이지에서 쪽 순서와 같은 간격으로 늘어날 때만 쪽 번호로 본다
+    3. 폭 때문에 끊긴 줄 이어 붙이기 (본문 폭을 채운 줄에서 문장이 끝나지 않았고 다음 줄이 글머리표가 아닐 때)
+    4. max_tokens 토큰 예산을 넘으면 줄 단위로 자르기
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 6000,
+        encoding_name: str = "o200k_base",
+        edge_lines: int = 3,
+        repeat_ratio: float = 0.5,
+        wrap_width: int = 30,
+        token_counter: Optional[TokenCounter] = None,
+    ):
+        self.max_tokens = max_tokens
+        self.edge_lines = edge_lines
+        self.repeat_ratio = repeat_ratio
+        self.wrap_width = wrap_width
+        self.token_counter = token_counter or TokenCounter(encoding_name)
+
+    def compact(self, documents: List[Document]) -> tuple[str, CompactionReport]:
+        original = "".join(doc.page_content for doc in documents)
+        pages = [
+            [normalize_line(line) for line in unicodedata.normalize("NFC", doc.page_content).splitlines()]
+            for doc in documents
+        ]
+        pages = [[line for line in page if line] for page in pages]
+
+        pages, removed_lines = self._remove_boilerplate(pages)
+        text = "\n\n".join("\n".join(self._join_wrapped(page)) for page in pages if page)
+
+        truncated = False
+        if self.max_tokens and self.token_counter.count(text) > self.max_tokens:
+            text = self._truncate(text)
+            truncated = True
+
+        report = CompactionReport(
+            pages=len(documents),
+            original_tokens=self.token_counter.count(original),
+            compacted_tokens=self.token_counter.count(text),
+            removed_lines=removed_lines,
+            truncated=truncated,
+        )
+        return text, report
+
+    def _edge_indexes(self, page: List[str]) -> set:
+        edge = min(self.edge_lines, len(page))
+        return set(range(edge)) | set(range(len(page) - edge, len(page)))
+
+    def _remove_boilerplate(self, pages: List[List[str]]) -> tuple[List[List[str]], int]:
+        # 쪽 번호가 바뀌어도 같은 머리글로 보도록 숫자는 묶어서 비교
+        # 숫자만 있는 줄은 (값 - 쪽 순서) 간격으로 센다. 표지에 번호가 없어 한 칸 밀린 쪽 번호도 같은 간격으로 묶인다
+        signatures, offsets = Counter(), Counter()
+        for page_index, page in enumerate(pages):
+            edge = [page[i] for i in self._edge_indexes(page)]
+            signatures.update({DIGITS.sub("#", line) for line in edge if not BARE_NUMBER.match(line)})
+            offsets.update({int(line) - page_index - 1 for line in edge if BARE_NUMBER.match(line)})
+        min_pages = max(2, math.ceil(len(pages) * self.repeat_ratio))
+        repeated = {signature for signature, count in signatures.items() if count >= min_pages}
+        page_offsets = {0} | {offset for offset, count in offsets.items() if count >= min_pages}
+
+        seen, removed, result = set(), 0, []
+        for page_index, page in enumerate(pages):
+            edge_indexes = self._edge_indexes(page)
+            kept = []
+            for i, line in enumerate(page):
+                if i in edge_indexes:
+                    if BARE_NUMBER.match(line):
+                        if int(line) - page_index - 1 in page_offsets:
+                            removed += 1
+                            continue
+                        kept.append(line)
+                        continue
+                    signature = DIGITS.sub("#", line)
+                    if PAGE_NUMBER.match(line) or (signature in repeated and signature in seen):
+                        removed += 1
+                        continue
+                    seen.add(signature)
+                kept.append(line)
+            result.append(kept)
+        return result, removed
+
+    def _join_wrapped(self, lines: List[str]) -> List[str]:
+        joined: List[str] = []
+        previous = ""
+        # 긴 줄(상위 10%) 길이를 본문 폭으로 보고, 그 폭을 거의 채운 줄만 줄바꿈 후보로 본다 (URL 한 줄에 휘둘리지 않도록)
+        lengths = sorted(map(len, lines))
+        width = max(self.wrap_width, int(lengths[int(len(lengths) * 0.9)] * 0.8)) if lengths else self.wrap_width
+        for line in lines:
+            if joined and self._is_wrapped(previous, line, width):
+                if previous.endswith("-") and previous[-2:-1].isalpha() and line[:1].islower():
+                    # 영문 하이픈 줄바꿈 ("develop-" + "ment")
+                    joined[-1] = joined[-1][:-1] + line
+                else:
+                    joined[-1] = f"{joined[-1]} {line}"
+            else:
+                joined.append(line)
+            previous = line
+        return joined
+
+    def _is_wrapped(self, previous: str, line: str, width: int) -> bool:
+        """앞 줄이 폭을 거의 채웠는데 문장이 끝나지 않았으면 줄바꿈으로 본다. 짧은 제목 줄("경력")은 잇지 않는다"""
+        return (
+            len(previous) >= width
+            and not SENTENCE_END.search(previous)
+            and not BULLET.match(line)
+            and (len(line) > 12 or bool(SENTENCE_END.search(line)))
+        )
+
+    def _truncate(self, text: str) -> str:
+        truncated = self.token_counter.truncate(text, self.max_tokens)
+        # 줄 중간에서 끊기지 않도록 마지막 줄바꿈까지만 남긴다
+        cut = truncated.rfind("\n")
+        return truncated[:cut] if cut > len(truncated) // 2 else truncated
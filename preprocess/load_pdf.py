@@ -1,11 +1,15 @@
 import enum
+import mmap
 import os
+from contextlib import contextmanager
 from io import BytesIO
+from typing import Iterator, Optional, Union
 
-from PyPDF2 import PdfReader
-from langchain_community.document_loaders import PyPDFLoader
-from langchain.schema import Document
-import boto3
+from preprocess.s3_fetch import ObjectTooLargeError, S3PDFFetcher
+
+
+PDF_MAGIC = b"%PDF-"
+DEFAULT_MAX_PDF_BYTES = 20 * 1024 * 1024
 
 
 class StorageType(enum.Enum):
@@ -13,40 +17,82 @@ class StorageType(enum.Enum):
     S3 = "s3"
 
 
+class InvalidPDFError(ValueError):
+    """파싱 전에 거부된 업로드 (크기 초과, PDF 시그니처 불일치)"""
+
+
+class MappedPDF(mmap.mmap):
+    """읽기 전용으로 매핑한 로컬 PDF. 다른 프로세스에는 바이트 대신 path를 넘겨 각자 열게 한다"""
+
+    path: str
+
+
 class PDFLoader:
-    def __init__(self, storage_type: StorageType):
-        self.s3_client = boto3.client('s3',
-                                      aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-                                      aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-                                      region_name=os.getenv('AWS_REGION'))
-        
-        self.bucket_name = os.getenv('AWS_S3_BUCKET')
-        self.storage_type = storage_type
-        self.handler = {'local': self._load_local_pdf, 
-                        's3': self._load_s3_pdf}
+    def __init__(
+        self,
+        storage_type: Union[StorageType, str],
+        max_bytes: int = DEFAULT_MAX_PDF_BYTES,
+        s3_fetcher: Optional[S3PDFFetcher] = None,
+    ):
+        # S3 캐시(연결 풀 + 디스크 캐시)는 S3를 쓸 때 처음 한 번만 만든다
+        self._s3_fetcher = s3_fetcher
+        self.storage_type = StorageType(storage_type).value
+        self.max_bytes = max_bytes
+        self.handler = {'local': self._open_local_pdf,
+                        's3': self._open_s3_pdf}
 
     def load_pdf(self, file_path: str) -> BytesIO:
-        """로컬 PDF 파일 로드"""
-        return self.handler[self.storage_type](file_path)
-    
-    def _load_local_pdf(self, file_path: str) -> BytesIO:
+        """PDF 전체를 메모리로 읽어 반환. 파일 핸들은 반환 전에 닫힌다"""
+        with self.open_pdf(file_path) as pdf_data:
+            return BytesIO(pdf_data.read())
+
+    @contextmanager
+    def open_pdf(self, file_path: str) -> Iterator[MappedPDF]:
+        """
+        크기/시그니처를 검사한 PDF를 읽기 전용 스트림으로 연다
+
+        로컬 파일은 mmap으로 매핑해 복사 없이 파서(read/seek) 또는 해시(버퍼 프로토콜)에 넘기고,
+        with 블록을 벗어나면 매핑과 파일 핸들을 바로 해제한다. 프로세스 풀 파서(ParallelPDFParser)는
+        매핑의 path만 워커에 넘긴다.
+        """
+        with self.handler[self.storage_type](file_path) as pdf_data:
+            yield pdf_data
+
+    def _check_size(self, file_path: str, size: int):
+        if size > self.max_bytes:
+            raise InvalidPDFError(f"PDF too large: {file_path} ({size} > {self.max_bytes} bytes)")
+
+    @staticmethod
+    def _check_magic(file_path: str, header: bytes):
+        if not header.startswith(PDF_MAGIC):
+            raise InvalidPDFError(f"Not a PDF file: {file_path}")
+
+    @contextmanager
+    def _open_local_pdf(self, file_path: str) -> Iterator[MappedPDF]:
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
-        file_stream = open(file_path, 'rb')
-        return file_stream
-        
-
-    def _load_s3_pdf(self, file_path: str) -> BytesIO:
-        if not hasattr(self, 's3_client'):
-            raise ValueError("AWS credentials not provided")
-        
-        
-        response = self.s3_client.get_object(
-            Bucket=self.bucket_name,
-            Key=file_path
-        )
-        
-        pdf_stream = BytesIO(response['Body'].read())
-    
-        
-        return pdf_stream
\ No newline at end of file
+
+        with open(file_path, 'rb') as file:
+            self._check_size(file_path, os.fstat(file.fileno()).st_size)
+            # 빈 파일은 mmap 할 수 없으므로 시그니처를 먼저 읽어 거른다
+            self._check_magic(file_path, file.read(len(PDF_MAGIC)))
+            with MappedPDF(file.fileno(), 0, access=mmap.ACCESS_READ) as pdf_map:
+                pdf_map.path = os.path.abspath(file_path)
+                yield pdf_map
+
+    @property
+    def s3_fetcher(self) -> S3PDFFetcher:
+        if self._s3_fetcher is None:
+            self._s3_fetcher = S3PDFFetcher()
+        return self._s3_fetcher
+
+    @contextmanager
+    def _open_s3_pdf(self, file_path: str) -> Iterator[MappedPDF]:
+        """디스크 캐시로 스트리밍 다운로드(ETag 일치 시 재사용)한 뒤 로컬 파일처럼 mmap으로 연다"""
+        try:
+            local_path = self.s3_fetcher.fetch(file_path, max_bytes=self.max_bytes)
+        except ObjectTooLargeError as e:
+            raise InvalidPDFError(str(e)) from e
+
+        with self._open_local_pdf(local_path) as pdf_map:
+            yield pdf_map
@@ -0,0 +1,359 @@
+import itertools
+import math
+import mmap
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from io import BytesIO
+from typing import Dict, List, Optional, Union
+
+from langchain.schema import Document
+
+from preprocess.load_pdf import MappedPDF
+from preprocess.parse_pdf import BasePDFParser
+
+# 워커에 넘기는 PDF: 파일 경로(워커가 직접 연다) 또는 바이트
+PDFSource = Union[str, bytes]
+
+
+class PyPDF2Backend:
+    def open(self, source: PDFSource):
+        from PyPDF2 import PdfReader
+        return PdfReader(source if isinstance(source, str) else BytesIO(source))
+
+    def page_count(self, document) -> int:
+        return len(document.pages)
+
+    def extract_text(self, document, page_number: int) -> str:
+        return document.pages[page_number].extract_text() or ""
+
+
+class PyPDFBackend(PyPDF2Backend):
+    def open(self, source: PDFSource):
+        from pypdf import PdfReader
+        return PdfReader(source if isinstance(source, str) else BytesIO(source))
+
+
+class PdfiumBackend:
+    """pypdfium2(PDFium 바인딩). 설치되어 있을 때만 사용 가능"""
+
+    def open(self, source: PDFSource):
+        import pypdfium2
+        return pypdfium2.PdfDocument(source)
+
+    def page_count(self, document) -> int:
+        return len(document)
+
+    def extract_text(self, document, page_number: int) -> str:
+        return document[page_number].get_textpage().get_text_range()
+
+
+class PyMuPDFBackend:
+    """PyMuPDF(MuPDF 바인딩). 설치되어 있을 때만 사용 가능"""
+
+    def open(self, source: PDFSource):
+        import fitz
+        return fitz.open(source) if isinstance(source, str) else fitz.open(stream=source, filetype="pdf")
+
+    def page_count(self, document) -> int:
+        return len(document)
+
+    def extract_text(self, document, page_number: int) -> str:
+        return document[page_number].get_text()
+
+
+PDF_BACKENDS = {
+    "pypdf2": PyPDF2Backend(),
+    "pypdf": PyPDFBackend(),
+    "pypdfium2": PdfiumBackend(),
+    "pymupdf": PyMuPDFBackend(),
+}
+
+
+@dataclass
+class PageResult:
+    page: int
+    text: str
+    elapsed_ms: float
+    error: Optional[str] = None
+
+
+@dataclass
+class ParseReport:
+    backend: str
+    page_count: int = 0
+    elapsed_ms: float = 0.0
+    truncated: bool = False
+    pages: List[PageResult] = field(default_factory=list)
+
+    @property
+    def failed_pages(self) -> Dict[int, str]:
+        return {page.page: page.error for page in self.pages if page.error}
+
+
+class PageTimeoutError(Exception):
+    pass
+
+
+class DocumentTimeoutError(TimeoutError):
+    """문서를 여는 데(페이지 수 확인 포함) document_timeout초를 넘긴 경우"""
+
+
+# 풀이 깨졌을 때(다른 요청의 시간 초과로 종료 등) 작업을 새 풀에서 다시 시도하는 횟수
+MAX_BROKEN_RETRIES = 2
+# 작업 완료/시간 초과를 확인하는 간격(초)
+POLL_INTERVAL = 0.05
+
+# 워커 프로세스: 작업을 시작할 때 (task_id, pid, 시작 시각)을 부모에게 알리는 큐
+_started_queue = None
+
+
+def _init_worker(started_queue):
+    global _started_queue
+    _started_queue = started_queue
+
+
+def _report_start(task_id: Optional[int]):
+    # 시간 제한은 큐에서 기다린 시간을 빼고 워커가 작업을 시작한 시점부터 잰다 (monotonic은 프로세스 간 공유)
+    if task_id is not None and _started_queue is not None:
+        _started_queue.put((task_id, os.getpid(), time.monotonic()))
+
+
+def _raise_page_timeout(signum, frame):
+    raise PageTimeoutError()
+
+
+def _count_pages(source: PDFSource, backend_name: str, task_id: Optional[int] = None) -> int:
+    """워커 프로세스에서 PDF를 열어 페이지 수만 반환 (요청 스레드에서 열지 않도록)"""
+    _report_start(task_id)
+    backend = PDF_BACKENDS[backend_name]
+    return backend.page_count(backend.open(source))
+
+
+def _extract_pages(source: PDFSource, backend_name: str, page_numbers: List[int], page_timeout: float,
+                   task_id: Optional[int] = None) -> List[PageResult]:
+    """
+    워커 프로세스에서 PDF를 한 번 열고 맡은 페이지들을 추출
+
+    페이지마다 SIGALRM 타이머를 걸어 page_timeout초를 넘기면 해당 페이지만 비우고 다음 페이지로 넘어간다.
+    """
+    _report_start(task_id)
+    backend = PDF_BACKENDS[backend_name]
+    document = backend.open(source)
+    use_alarm = hasattr(signal, "setitimer") and page_timeout > 0
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _raise_page_timeout)
+
+    results = []
+    for page_number in page_numbers:
+        start = time.perf_counter()
+        text, error = "", None
+        try:
+            if use_alarm:
+                signal.setitimer(signal.ITIMER_REAL, page_timeout)
+            text = backend.extract_text(document, page_number)
+        except PageTimeoutError:
+            error = "page_timeout"
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        finally:
+            if use_alarm:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+        results.append(PageResult(page_number, text, round((time.perf_counter() - start) * 1000, 2), error))
+    return results
+
+
+class ParallelPDFParser(BasePDFParser):
+    """
+    프로세스 풀에서 페이지를 나눠 추출하는 시간 제한 PDF 파서
+
+    - 최대 max_pages 페이지까지만 추출 (넘으면 report.truncated)
+    - 페이지마다 page_timeout초, 문서 전체(열기/페이지 수 확인 포함) document_timeout초 제한
+    - backend: pypdf2 | pypdf | pypdfium2 | pymupdf
+    - 페이지별 소요 시간은 Document.metadata["elapsed_ms"]와 ParseReport에 기록
+
+    시간 초과/실패한 페이지는 빈 Document로 남겨 페이지 순서를 유지한다.
+    파일 경로나 PDFLoader.open_pdf의 매핑(MappedPDF)을 받으면 워커에는 경로만 넘기고 각 워커가 직접 연다.
+    SIGALRM은 네이티브 백엔드(pypdfium2, pymupdf) 호출을 끊지 못하므로, 워커가 작업을 시작한 뒤
+    document_timeout을 넘기면 멈춘 워커 프로세스를 종료하고 새 풀을 만든다 (큐 대기 시간은 세지 않는다).
+    """
+
+    def __init__(
+        self,
+        backend: str = "pypdf2",
+        workers: int = 2,
+        max_pages: int = 30,
+        page_timeout: float = 5.0,
+        document_timeout: float = 30.0,
+    ):
+        if backend not in PDF_BACKENDS:
+            raise ValueError(f"Unknown PDF backend: {backend}")
+        self.backend = backend
+        self.workers = workers
+        self.max_pages = max_pages
+        self.page_timeout = page_timeout
+        self.document_timeout = document_timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._started_queue = multiprocessing.SimpleQueue()
+        self._started: Dict[int, tuple[int, float]] = {}  # task_id -> (워커 pid, 시작 시각)
+        self._task_ids = itertools.count()
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker, initargs=(self._started_queue,)
+            )
+        return self._executor
+
+    def _submit(self, fn, *args) -> tuple[Future, int, ProcessPoolExecutor]:
+        """작업을 제출하고 task_id, 들어간 풀과 함께 반환 (시간 초과 시 그 풀의 멈춘 워커만 종료하기 위해)"""
+        task_id = next(self._task_ids)
+        with self._lock:
+            try:
+                return self.executor.submit(fn, *args, task_id), task_id, self.executor
+            except BrokenProcessPool:
+                self._executor = None
+                return self.executor.submit(fn, *args, task_id), task_id, self.executor
+
+    def _started_tasks(self) -> Dict[int, tuple[int, float]]:
+        with self._lock:
+            while not self._started_queue.empty():
+                task_id, pid, started_at = self._started_queue.get()
+                self._started[task_id] = (pid, started_at)
+            return dict(self._started)
+
+    def _forget(self, task_id: int):
+        with self._lock:
+            self._started.pop(task_id, None)
+
+    def _terminate(self, executor: ProcessPoolExecutor, pid: int):
+        """
+        멈춘 워커 프로세스를 강제로 종료. future.cancel()은 실행 중인 작업을 멈추지 못하고,
+        SIGALRM은 네이티브 백엔드 호출을 끊지 못한다
+
+        풀은 깨진 상태가 되므로 새 작업은 새 풀로 보낸다. 같은 풀에서 실행 중이던 다른 요청의 작업은
+        BrokenProcessPool로 끝나고 _run_tasks가 새 풀에서 다시 시도한다.
+        """
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run_tasks(self, fn, task_args: List[tuple], timeout: float) -> list:
+        """
+        task_args마다 fn을 풀에서 실행하고 결과(실패하면 예외 객체)를 같은 순서로 반환
+
+        워커가 작업을 시작한 뒤 timeout초를 넘긴 작업은 그 워커를 종료하고 DocumentTimeoutError를 돌려준다.
+        BrokenProcessPool로 끝난 작업은 MAX_BROKEN_RETRIES번까지 새 풀에서 다시 실행한다.
+        """
+        results: list = [None] * len(task_args)
+        retries = [0] * len(task_args)
+        pending: Dict[Future, tuple[int, int, ProcessPoolExecutor]] = {}
+
+        def submit(index: int):
+            future, task_id, executor = self._submit(fn, *task_args[index])
+            pending[future] = (index, task_id, executor)
+
+        for index in range(len(task_args)):
+            submit(index)
+        while pending:
+            done, _ = wait(pending, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, task_id, _ = pending.pop(future)
+                self._forget(task_id)
+                try:
+                    results[index] = future.result()
+                except BrokenProcessPool as e:
+                    if retries[index] < MAX_BROKEN_RETRIES:
+                        retries[index] += 1
+                        submit(index)
+                        continue
+                    results[index] = e
+                except Exception as e:
+                    results[index] = e
+
+            started, now = self._started_tasks(), time.monotonic()
+            for future, (index, task_id, executor) in list(pending.items()):
+                if task_id in started and now - started[task_id][1] > timeout:
+                    del pending[future]
+                    self._forget(task_id)
+                    self._terminate(executor, started[task_id][0])
+                    results[index] = DocumentTimeoutError(f"PDF parsing timed out after {timeout}s")
+        return results
+
+    def parse_pdf(self, pdf_object: Union[bytes, BytesIO, MappedPDF, str]) -> list[Document]:
+        return self.parse_with_report(pdf_object)[0]
+
+    def parse_with_report(
+        self, pdf_object: Union[bytes, BytesIO, MappedPDF, str]
+    ) -> tuple[list[Document], ParseReport]:
+        start = time.perf_counter()
+        source = self._source(pdf_object)
+        report = ParseReport(backend=self.backend)
+
+        # 손상된 PDF에서 열기가 멈출 수 있으므로 페이지 수 확인도 워커에서 시간 제한을 두고 한다
+        (page_count,) = self._run_tasks(_count_pages, [(source, self.backend)], self.document_timeout)
+        if isinstance(page_count, Exception):
+            raise page_count
+        report.page_count = page_count
+        page_numbers = list(range(min(report.page_count, self.max_pages)))
+        report.truncated = report.page_count > len(page_numbers)
+
+        # 워커 수만큼 연속된 페이지 묶음으로 나눠 PDF를 여는 횟수(바이트면 전송 횟수)를 줄인다
+        group_size = max(1, math.ceil(len(page_numbers) / self.workers))
+        groups = [page_numbers[i:i + group_size] for i in range(0, len(page_numbers), group_size)]
+        group_results = self._run_tasks(
+            _extract_pages, [(source, self.backend, group, self.page_timeout) for group in groups],
+            self.document_timeout,
+        )
+
+        results: Dict[int, PageResult] = {}
+        for group, pages in zip(groups, group_results):
+            if isinstance(pages, DocumentTimeoutError):
+                pages = [PageResult(page_number, "", 0.0, "document_timeout") for page_number in group]
+            elif isinstance(pages, Exception):
+                pages = [PageResult(page_number, "", 0.0, f"{type(pages).__name__}: {pages}") for page_number in group]
+            for page in pages:
+                results[page.page] = page
+
+        report.pages = [results[page_number] for page_number in page_numbers]
+        report.elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
+        documents = [
+            Document(
+                page_content=page.text,
+                metadata={"page": page.page, "elapsed_ms": page.elapsed_ms, "backend": self.backend,
+                          **({"error": page.error} if page.error else {})},
+            )
+            for page in report.pages
+        ]
+        return documents, report
+
+    @staticmethod
+    def _source(pdf_object: Union[bytes, BytesIO, MappedPDF, str]) -> PDFSource:
+        """경로로 열 수 있으면 경로를, 아니면 워커에 피클링해 보낼 바이트를 반환"""
+        if isinstance(pdf_object, str):
+            return pdf_object
+        if isinstance(pdf_object, MappedPDF):
+            return pdf_object.path
+        if isinstance(pdf_object, bytes):
+            return pdf_object
+        if isinstance(pdf_object, (bytearray, memoryview, mmap.mmap)):
+            return bytes(pdf_object)
+        return pdf_object.read()
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
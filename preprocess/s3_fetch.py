@@ -0,0 +1,264 @@
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, Optional
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+
+class ObjectTooLargeError(ValueError):
+    pass
+
+
+def create_s3_client(max_pool_connections: int = 32):
+    """요청 간 연결을 재사용하도록 커넥션 풀과 재시도를 조정한 S3 클라이언트"""
+    config = Config(
+        max_pool_connections=max_pool_connections,
+        retries={"max_attempts": 5, "mode": "adaptive"},
+        tcp_keepalive=True,
+        connect_timeout=5,
+        read_timeout=30,
+    )
+    return boto3.client('s3',
+                        aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
+                        aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
+                        region_name=os.getenv('AWS_REGION'),
+                        endpoint_url=os.getenv('AWS_S3_ENDPOINT_URL'),
+                        config=config)
+
+
+class S3PDFFetcher:
+    """
+    S3 객체를 로컬 디스크에 내려받아 ETag로 검증하며 재사용하는 캐시
+
+    - 본문은 chunk_size 단위로 임시 파일에 스트리밍한 뒤 원자적으로 교체 (메모리에 통째로 올리지 않음)
+    - 캐시된 객체는 If-None-Match 조건부 GET으로 확인하고, 바뀌지 않았으면(304) 본문 없이 재사용
+    - revalidate_after초 안에 확인한 항목은 요청 없이 바로 사용 (prefetch 직후 워커 조회 등)
+    - 전체 용량이 max_cache_bytes를 넘으면 가장 오래 사용되지 않은 파일부터 삭제
+      (pinned 항목은 제외. 고정은 인덱스 DB에 기록하므로 같은 cache_dir을 쓰는 모든 프로세스가 지킨다)
+    """
+
+    def __init__(
+        self,
+        bucket: Optional[str] = None,
+        cache_dir: str = "db/s3_cache",
+        max_cache_bytes: int = 1024 * 1024 * 1024,
+        max_pool_connections: int = 32,
+        prefetch_workers: int = 16,
+        chunk_size: int = 1024 * 1024,
+        revalidate_after: float = 300.0,
+        pin_ttl: float = 6 * 3600.0,
+        client=None,
+    ):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.bucket = bucket or os.getenv('AWS_S3_BUCKET')
+        self.cache_dir = cache_dir
+        self.max_cache_bytes = max_cache_bytes
+        self.prefetch_workers = prefetch_workers
+        self.chunk_size = chunk_size
+        self.revalidate_after = revalidate_after
+        self.pin_ttl = pin_ttl
+        self.client = client or create_s3_client(max_pool_connections)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(cache_dir, "index.sqlite3"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS s3_cache (
+                key TEXT PRIMARY KEY,
+                etag TEXT NOT NULL,
+                path TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                validated_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_s3_cache_last_access ON s3_cache (last_access)")
+        # 고정한 프로세스가 비정상 종료해도 expires_at이 지나면 다시 삭제 대상이 된다
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS s3_pins (
+                key TEXT NOT NULL,
+                token TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                PRIMARY KEY (key, token)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def fetch(self, key: str, max_bytes: Optional[int] = None) -> str:
+        """key 객체의 로컬 파일 경로를 반환. 캐시가 없거나 ETag가 바뀌었으면 내려받는다"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, path, validated_at FROM s3_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is not None and os.path.exists(row[1]):
+            etag, path, validated_at = row
+            if time.time() - validated_at < self.revalidate_after:
+                self._touch(key, validated=False)
+                return path
+
+            try:
+                response = self.client.get_object(Bucket=self.bucket, Key=key, IfNoneMatch=etag)
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") not in ("304", "NotModified"):
+                    raise
+                self._touch(key, validated=True)
+                return path
+            # ETag가 바뀌어 새 본문이 왔으면 그대로 받아서 교체
+            return self._store(key, response, max_bytes)
+
+        return self._store(key, self.client.get_object(Bucket=self.bucket, Key=key), max_bytes)
+
+    def prefetch(self, keys: Iterable[str], max_bytes: Optional[int] = None) -> Dict[str, str]:
+        """여러 객체를 동시에 캐시에 받아두고, 실패한 키와 오류 메시지를 반환"""
+        def fetch_one(key: str) -> Optional[str]:
+            try:
+                self.fetch(key, max_bytes)
+            except Exception as e:
+                return f"{type(e).__name__}: {e}"
+            return None
+
+        keys = list(dict.fromkeys(keys))
+        with ThreadPoolExecutor(max_workers=self.prefetch_workers) as executor:
+            errors = executor.map(fetch_one, keys)
+            return {key: error for key, error in zip(keys, errors) if error is not None}
+
+    @contextmanager
+    def pinned(self, keys: Iterable[str]) -> Iterator[None]:
+        """
+        with 블록 동안 keys 항목을 LRU 삭제 대상에서 제외
+
+        max_cache_bytes보다 큰 prefetch 배치에서 방금 받은 파일이 적재 전에 지워지지 않도록
+        적재가 끝날 때까지 고정한다. 그동안은 용량이 한도를 넘을 수 있고, 블록을 벗어날 때 정리한다.
+        고정은 인덱스 DB에 pin_ttl초 동안 기록되어 같은 캐시를 쓰는 다른 프로세스의 삭제도 막는다.
+        """
+        keys = list(dict.fromkeys(keys))
+        token = uuid.uuid4().hex
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO s3_pins VALUES (?, ?, ?)", [(key, token, time.time() + self.pin_ttl) for key in keys]
+            )
+            self._conn.commit()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._conn.execute("DELETE FROM s3_pins WHERE token = ?", (token,))
+                expired = self._evict()
+                self._conn.commit()
+            self._unlink(expired)
+
+    def _store(self, key: str, response: dict, max_bytes: Optional[int]) -> str:
+        body = response['Body']
+        try:
+            size = response['ContentLength']
+            if max_bytes is not None and size > max_bytes:
+                raise ObjectTooLargeError(f"S3 object too large: {key} ({size} > {max_bytes} bytes)")
+
+            etag = response['ETag']
+            path = os.path.join(
+                self.cache_dir, hashlib.sha1(f"{key}\0{etag}".encode("utf-8")).hexdigest() + ".pdf"
+            )
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".part")
+            try:
+                with os.fdopen(fd, "wb") as file:
+                    for chunk in body.iter_chunks(self.chunk_size):
+                        file.write(chunk)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        finally:
+            body.close()
+
+        now = time.time()
+        with self._lock:
+            self.misses += 1
+            old = self._conn.execute("SELECT path FROM s3_cache WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO s3_cache VALUES (?, ?, ?, ?, ?, ?)",
+                (key, etag, path, size, now, now),
+            )
+            expired = self._evict()
+            self._conn.commit()
+
+        if old is not None and old[0] != path:
+            expired.append(old[0])
+        self._unlink(expired)
+        return path
+
+    @staticmethod
+    def _unlink(paths: list):
+        for path in paths:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+    def _touch(self, key: str, validated: bool):
+        now = time.time()
+        with self._lock:
+            self.hits += 1
+            if validated:
+                self._conn.execute(
+                    "UPDATE s3_cache SET validated_at = ?, last_access = ? WHERE key = ?", (now, now, key)
+                )
+            else:
+                self._conn.execute("UPDATE s3_cache SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+
+    def _evict(self) -> list:
+        """총 용량이 한도를 넘으면 오래 사용되지 않은 항목부터 인덱스에서 지우고 삭제할 파일 경로를 반환"""
+        now = time.time()
+        self._conn.execute("DELETE FROM s3_pins WHERE expires_at <= ?", (now,))
+        (total_size,) = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM s3_cache").fetchone()
+        if total_size <= self.max_cache_bytes:
+            return []
+
+        rows = self._conn.execute(
+            """
+            SELECT key, path, size FROM s3_cache
+            WHERE key NOT IN (SELECT key FROM s3_pins)
+            ORDER BY last_access ASC
+            """
+        ).fetchall()
+        expired = []
+        for key, path, size in rows:
+            if total_size <= self.max_cache_bytes:
+                break
+            expired.append((key, path))
+            total_size -= size
+        self._conn.executemany("DELETE FROM s3_cache WHERE key = ?", [(key,) for key, _ in expired])
+        return [path for _, path in expired]
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM s3_cache"
+            ).fetchone()
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": entries,
+            "size_bytes": size,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
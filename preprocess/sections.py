@@ -0,0 +1,167 @@
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from preprocess.compact import normalize_line
+
+
+# section_prompt 항목 순서 (+ 언어 추출에 필요한 기술 스택)
+SECTION_ORDER = ["인적사항", "학력", "경력", "자격증", "교육", "프로젝트", "자기소개서", "기술", "기타"]
+
+HEADING_ALIASES = {
+    "인적사항": ["인적사항", "인적 사항", "기본 정보", "기본정보", "개인 정보", "개인정보", "연락처", "profile", "contact"],
+    "학력": ["학력", "학력 사항", "학력사항", "학교", "education"],
+    "경력": ["경력", "경력 사항", "경력사항", "경력 기술서", "경력기술서", "업무 경험", "경험", "work experience",
+            "experience", "career", "employment"],
+    "자격증": ["자격증", "자격 사항", "자격사항", "자격", "어학", "자격증 및 어학", "certifications", "certificates",
+             "licenses"],
+    "교육": ["교육", "교육 이수", "교육 사항", "교육사항", "교육 이력", "수료", "training"],
+    "프로젝트": ["프로젝트", "프로젝트 경험", "주요 프로젝트", "개인 프로젝트", "사이드 프로젝트", "projects", "project"],
+    "자기소개서": ["자기소개서", "자기소개", "자기 소개", "소개", "about me", "about", "introduction", "cover letter",
+              "summary"],
+    "기술": ["기술 스택", "기술스택", "기술", "보유 기술", "보유기술", "스킬", "skills", "skill", "tech stack"],
+    "기타": ["수상", "수상 내역", "수상 경력", "활동", "대외 활동", "대외활동", "포트폴리오", "awards", "activities",
+           "portfolio"],
+}
+HEADING_LOOKUP = {alias: section for section, aliases in HEADING_ALIASES.items() for alias in aliases}
+
+# 제목 앞뒤 장식: 글머리표, 번호("1.", "Ⅱ."), 괄호로 감싼 제목, 끝의 콜론/괄호 부가 설명("경력 (총 1년 5개월)")
+HEADING_PREFIX = re.compile(r"^(?:[\[【<■□▶►●•◆◇#*\-]+|\d+[.)]|[ⅠⅡⅢⅣⅤⅥⅦⅧⅨⅩ]+[.)]?)\s*")
+HEADING_SUFFIX = re.compile(r"\s*(?:[\]】>]|[:：]|\([^)]*\))*\s*$")
+MAX_HEADING_LENGTH = 20
+
+
+def heading_of(line: str) -> Optional[str]:
+    """한 줄이 섹션 제목이면 표준 섹션 이름을, 아니면 None을 반환"""
+    if len(line) > MAX_HEADING_LENGTH + 10:
+        return None
+    key = HEADING_SUFFIX.sub("", HEADING_PREFIX.sub("", line.strip())).strip().lower()
+    if not key or len(key) > MAX_HEADING_LENGTH:
+        return None
+    key = re.sub(r"\s+", " ", key)
+    if key in HEADING_LOOKUP:
+        return HEADING_LOOKUP[key]
+    # "ACTIVITIES / PROJECT", "학력 · 교육" 처럼 묶인 제목은 앞쪽부터 아는 이름을 찾는다
+    for part in re.split(r"\s*[/·&|]\s*|\s+및\s+", key):
+        if part in HEADING_LOOKUP:
+            return HEADING_LOOKUP[part]
+    return None
+
+
+@dataclass
+class SegmentResult:
+    sections: Dict[str, str] = field(default_factory=dict)
+    headings: int = 0
+    coverage: float = 0.0
+    confidence: float = 0.0
+    confident: bool = False
+
+    @property
+    def text(self) -> str:
+        """section_llm 출력과 같은 "항목: 내용" 형식의 텍스트"""
+        return "\n\n".join(
+            f"{section}:\n{self.sections[section]}" for section in SECTION_ORDER if section in self.sections
+        )
+
+
+class SectionSegmenter:
+    """
+    제목 줄을 기준으로 이력서를 섹션(학력/경력/자격증/프로젝트/자기소개서 등)으로 나누는 규칙 기반 분할기
+
+    - 제목 줄: 20자 이하의 독립된 줄이 알려진 제목(HEADING_ALIASES)과 일치 (장식/번호/부가 설명 무시)
+    - 첫 제목 앞의 내용은 인적사항으로, 같은 섹션이 여러 번 나오면 이어 붙인다
+    - 신뢰도 = 0.5 × (찾은 핵심 섹션 수 / min_sections, 최대 1) + 0.5 × (제목 아래에 들어간 본문 비율)
+
+    confidence가 threshold 이상이면 confident=True로 section LLM 없이 바로 사용할 수 있다.
+    경력/프로젝트/자기소개서 중 하나도 없으면 본문이 빠진 것으로 보고 신뢰하지 않는다.
+    """
+
+    CORE_SECTIONS = {"학력", "경력", "자격증", "교육", "프로젝트", "자기소개서", "기술"}
+    SUBSTANCE_SECTIONS = {"경력", "프로젝트", "자기소개서"}
+
+    def __init__(self, threshold: float = 0.75, min_sections: int = 4, max_preamble_ratio: float = 0.3):
+        self.threshold = threshold
+        self.min_sections = min_sections
+        self.max_preamble_ratio = max_preamble_ratio
+
+    def segment(self, resume: str) -> SegmentResult:
+        lines = [normalize_line(line) for line in resume.splitlines()]
+        lines = [line for line in lines if line]
+
+        collected: Dict[str, List[str]] = {}
+        current, headings = "인적사항", 0
+        for line in lines:
+            section = heading_of(line)
+            if section is not None:
+                current = section
+                headings += 1
+                continue
+            collected.setdefault(current, []).append(line)
+
+        sections = {section: "\n".join(body) for section, body in collected.items()}
+        total = sum(len(line) for line in lines) or 1
+        preamble = len(sections.get("인적사항", ""))
+        coverage = 1 - preamble / total
+
+        found = self.CORE_SECTIONS & sections.keys()
+        confidence = 0.5 * min(1.0, len(found) / self.min_sections) + 0.5 * coverage
+        confident = (
+            confidence >= self.threshold
+            and bool(self.SUBSTANCE_SECTIONS & found)
+            and preamble / total <= self.max_preamble_ratio
+        )
+        return SegmentResult(
+            sections=sections,
+            headings=headings,
+            coverage=round(coverage, 3),
+            confidence=round(confidence, 3),
+            confident=confident,
+        )
+
+
+# section_llm 출력의 "항목: 내용" 줄 ("- 학력:", "**경력**:", "### 프로젝트" 등)
+SECTIONED_LINE = re.compile(
+    r"^[\s\-*#>]*\**\s*(" + "|".join(SECTION_ORDER[:-2] + ["자기소개"]) + r")\s*\**\s*(?:[:：]\s*(.*))?$"
+)
+
+EMPTY_ANSWER = re.compile(r"^[\s\-*]*(?:없음|정보 없음|해당 없음|내용 없음|N/?A|None)\.?\s*$", re.IGNORECASE)
+
+
+def split_page_groups(resume: str, max_group_chars: int = 2000) -> List[str]:
+    """빈 줄로 구분된 페이지를 max_group_chars 이하 묶음으로 합친다 (한 페이지가 더 길면 단독 묶음)"""
+    groups: List[str] = []
+    for page in (page.strip() for page in resume.split("\n\n")):
+        if not page:
+            continue
+        if groups and len(groups[-1]) + len(page) + 2 <= max_group_chars:
+            groups[-1] = f"{groups[-1]}\n\n{page}"
+        else:
+            groups.append(page)
+    return groups or [resume]
+
+
+def merge_sectioned_texts(texts: List[str]) -> str:
+    """
+    페이지 묶음별 section_llm 결과를 항목별로 모아 하나의 "항목: 내용" 텍스트로 합친다
+
+    같은 항목은 페이지 순서대로 이어 붙인다. 페이지마다 반복되는 인적사항 줄과
+    해당 페이지에 없는 항목에 대한 "없음" 같은 응답은 버린다.
+    """
+    merged: Dict[str, List[str]] = {}
+    for text in texts:
+        current = "기타"
+        for line in text.splitlines():
+            match = SECTIONED_LINE.match(line)
+            if match:
+                current = "자기소개서" if match.group(1) == "자기소개" else match.group(1)
+                line = match.group(2) or ""
+            line = line.rstrip()
+            lines = merged.setdefault(current, [])
+            if not line.strip() or EMPTY_ANSWER.match(line):
+                continue
+            if current == "인적사항" and line in lines:
+                continue
+            lines.append(line)
+    return "\n".join(
+        f"{section}:\n" + "\n".join(merged[section]) for section in SECTION_ORDER if merged.get(section)
+    )
@@ -7,3 +7,7 @@ class ResumeExtractRequest(BaseModel):
     user_id: str
     resume_id: str
     file_path: str
+
+class ResumeBulkIngestRequest(BaseModel):
+    directory: str | None = None  # 로컬 PDF 디렉토리 (ingest_root 기준 상대 경로)
+    file_paths: list[str] | None = None  # S3 키 목록
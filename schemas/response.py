@@ -14,6 +14,10 @@ class InterviewQuestionResponse(BaseModel):
     question: str
 
 
+class InterviewQuestionListResponse(BaseModel):
+    questions: list[InterviewQuestionResponse]
+
+
 class ResumeInfoResponse(BaseModel):
     resume_id: str
     applicant_name: str
@@ -25,7 +29,7 @@ class ResumeInfoResponse(BaseModel):
 
 
 class ResumeFilter(BaseModel):
-    applicant_name: str | None
-    job_category: JobCategory | None
-    years: YearsOfExperience | None
-    language: ProgrammingLanguage | None
+    applicant_name: str | None = None
+    job_category: JobCategory | None = None
+    years: YearsOfExperience | None = None
+    language: ProgrammingLanguage | None = None
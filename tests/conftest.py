@@ -0,0 +1,35 @@
+import os
+
+import pytest
+
+# llm 모듈은 import 시점에 OpenAI 클라이언트를 만들기 때문에 테스트용 키를 채워둔다
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+
+from llm.metrics import LLM_METRICS
+from preprocess.compact import TokenCounter
+
+
+class CharCounter(TokenCounter):
+    """오프라인 테스트용: 글자 수를 토큰 수로 본다"""
+
+    def __init__(self):
+        self.encoding = None
+
+    def count(self, text):
+        return len(text)
+
+    def truncate(self, text, max_tokens):
+        return text[:max_tokens]
+
+
+@pytest.fixture
+def char_counter():
+    return CharCounter()
+
+
+@pytest.fixture
+def llm_metrics():
+    """프로세스 공용 LLM_METRICS를 비운 상태로 넘기고, 끝나면 다시 비워 다른 테스트에 값이 남지 않게 한다"""
+    LLM_METRICS.reset()
+    yield LLM_METRICS
+    LLM_METRICS.reset()
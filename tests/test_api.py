@@ -4,7 +4,182 @@
 /recommend: input: ResumeRecommendRequest output: list[RecommendedResumeResponse]
 /resumes/{resume_id}/generate-questions: input: resume_id output: list[InterviewQuestionResponse]
 /process-resume: input: ResumeExtractRequest output: ResumeInfoResponse
+DELETE /resumes/{resume_id}: input: resume_id output: 삭제한 문서 수
 '''
-
-def test_recommend():
-    pass
\ No newline at end of file
+import pytest
+
+
+@pytest.fixture
+def container(tmp_path):
+    '''저장 경로를 tmp_path로 옮기고 Cross-Encoder 대신 NoFilter를 쓰는 컨테이너. 테스트가 끝나면 override를 되돌린다'''
+    from llm.result_filter import NoFilter
+    import main
+
+    # yaml 설정도 override로 들어가 있으므로 되돌릴 때 다시 채운다
+    config = main.container.config()
+    main.container.config.vector_store_path.override(str(tmp_path / 'db'))
+    main.container.config.embedding_cache_path.override(str(tmp_path / 'embedding_cache.sqlite3'))
+    main.container.config.resume_cache_path.override(str(tmp_path / 'resume_cache.sqlite3'))
+    main.container.config.document_store_path.override(str(tmp_path / 'resume_documents.sqlite3'))
+    main.container.result_filter.override(NoFilter())
+    yield main.container
+
+    main.container.shutdown_resources()
+    main.container.reset_override()
+    main.container.config.from_dict(config)
+    main.container.reset_singletons()
+
+
+def test_recommend():
+    pass
+
+def test_container_resources_are_reused(container):
+    from fastapi.testclient import TestClient
+    import main
+
+    with TestClient(main.app) as client:
+        assert client.get('/api/ai/cache-stats').status_code == 200
+        assert container.vector_store_manager() is container.vector_store_manager()
+        assert container.embeddings() is container.embeddings()
+
+
+def test_recommend_stream_sends_sse_events(container):
+    from fastapi.testclient import TestClient
+    from llm.result_filter import SearchResult
+    import main
+
+    class FakeQueryInfoExtractor:
+        def retrieve(self, query, vector_store):
+            return [SearchResult(metadata={'resume_id': str(i)}, content='x' * i) for i in range(3)]
+
+        def rerank(self, query, search_results):
+            for result in search_results:
+                result.score = len(result.content)
+            return sorted(search_results, key=lambda r: r.score, reverse=True)
+
+    container.query_info_extractor.override(FakeQueryInfoExtractor())
+
+    with TestClient(main.app) as client:
+        response = client.post('/api/ai/recommend/stream', json={'message': '백엔드'})
+
+    events = [line[len('event: '):] for line in response.text.splitlines() if line.startswith('event: ')]
+    assert response.headers['content-type'].startswith('text/event-stream')
+    assert events == ['retrieved', 'candidate', 'candidate', 'candidate', 'done']
+    assert '"resume_id": "2"' in response.text.split('event: candidate')[1]
+
+
+def test_generate_questions_reads_document_store(container):
+    from fastapi.testclient import TestClient
+    from schemas.enums import JobCategory, YearsOfExperience, ProgrammingLanguage, QuestionType
+    from schemas.response import InterviewQuestionResponse, ResumeInfoResponse
+    import main
+
+    class NoVectorStore:
+        def get_resume_info(self, resume_id):
+            raise AssertionError('벡터 인덱스를 조회하면 안 됩니다')
+
+    container.vector_store_manager.override(NoVectorStore())
+    questions = [InterviewQuestionResponse(question_type=QuestionType.PROJECT, question='가장 어려웠던 프로젝트는?')]
+
+    with TestClient(main.app) as client:
+        container.document_store().put('resume-1', '백엔드 3년', ResumeInfoResponse(
+            resume_id='resume-1',
+            applicant_name='김시험',
+            job_category=JobCategory.BACKEND,
+            years=YearsOfExperience.JUNIOR,
+            language=ProgrammingLanguage.PYTHON,
+        ))
+        container.question_cache().put('resume-1', '백엔드 3년', questions)
+        response = client.post('/api/ai/resumes/resume-1/generate-questions')
+
+    assert response.status_code == 200
+    assert response.json()[0]['question'] == '가장 어려웠던 프로젝트는?'
+
+
+def test_ingest_rejects_directory_outside_root(container, tmp_path):
+    from fastapi.testclient import TestClient
+    import main
+
+    root = tmp_path / 'resumes'
+    (root / 'batch-1').mkdir(parents=True)
+    (tmp_path / 'private').mkdir()
+    (root / 'link').symlink_to(tmp_path / 'private')
+    container.config.ingest_root.override(str(root))
+
+    with TestClient(main.app) as client:
+        for directory in ['../private', str(tmp_path / 'private'), 'link', '/etc']:
+            assert client.post('/api/ai/ingest', json={'directory': directory}).status_code == 403
+        assert client.post('/api/ai/ingest', json={'directory': 'missing'}).status_code == 404
+        response = client.post('/api/ai/ingest', json={'directory': 'batch-1'})
+
+    assert response.status_code == 200
+    assert response.json()['total'] == 0
+
+
+def test_delete_resume_clears_document_store_and_question_cache(container):
+    from fastapi.testclient import TestClient
+    from schemas.enums import JobCategory, YearsOfExperience, ProgrammingLanguage, QuestionType
+    from schemas.response import InterviewQuestionResponse, ResumeInfoResponse
+    import main
+
+    class FakeVectorStore:
+        def __init__(self):
+            self.deleted = []
+
+        def delete_resume(self, resume_id):
+            self.deleted.append(resume_id)
+            return 1
+
+        def get_resume_info(self, resume_id):
+            return {'documents': [], 'metadatas': []}
+
+    vector_store = FakeVectorStore()
+    container.vector_store_manager.override(vector_store)
+    questions = [InterviewQuestionResponse(question_type=QuestionType.PROJECT, question='가장 어려웠던 프로젝트는?')]
+
+    with TestClient(main.app) as client:
+        container.document_store().put('resume-1', '백엔드 3년', ResumeInfoResponse(
+            resume_id='resume-1',
+            applicant_name='김시험',
+            job_category=JobCategory.BACKEND,
+            years=YearsOfExperience.JUNIOR,
+            language=ProgrammingLanguage.PYTHON,
+        ))
+        container.question_cache().put('resume-1', '백엔드 3년', questions)
+
+        assert client.delete('/api/ai/resumes/resume-1').json() == {'status': 'deleted', 'documents': 1}
+        assert container.document_store().get('resume-1') is None
+        assert container.question_cache().get('resume-1', '백엔드 3년') is None
+        assert client.post('/api/ai/resumes/resume-1/generate-questions').status_code == 404
+
+    assert vector_store.deleted == ['resume-1']
+
+
+def test_generate_questions_stream_caches_in_question_type_order(container, monkeypatch):
+    from fastapi.testclient import TestClient
+    from schemas.enums import JobCategory, YearsOfExperience, ProgrammingLanguage, QuestionType
+    from schemas.response import InterviewQuestionResponse, ResumeInfoResponse
+    import main
+
+    async def astream_questions(summary):
+        # 체인이 끝나는 순서는 질문 유형 순서와 다르다
+        for question_type in reversed(QuestionType):
+            yield InterviewQuestionResponse(question_type=question_type, question=question_type.value)
+
+    monkeypatch.setattr(main, 'astream_questions', astream_questions)
+
+    with TestClient(main.app) as client:
+        assert client.post('/api/ai/resumes/missing/generate-questions/stream').status_code == 404
+
+        container.document_store().put('resume-1', '백엔드 3년', ResumeInfoResponse(
+            resume_id='resume-1',
+            applicant_name='김시험',
+            job_category=JobCategory.BACKEND,
+            years=YearsOfExperience.JUNIOR,
+            language=ProgrammingLanguage.PYTHON,
+        ))
+        response = client.post('/api/ai/resumes/resume-1/generate-questions/stream')
+
+    assert response.status_code == 200
+    cached = container.question_cache().get('resume-1', '백엔드 3년')
+    assert [question.question_type for question in cached] == list(QuestionType)
@@ -0,0 +1,27 @@
+from benchmarks.bench_pipeline import run_rerank, synthetic_corpus
+from benchmarks.fakes import offline_container
+from preprocess.parse_pdf import PyPDFParser
+from schemas.response import ResumeInfoResponse
+
+
+def test_offline_container_runs_pipeline_without_network(tmp_path):
+    container = offline_container(str(tmp_path), embedding_size=8)
+    documents = PyPDFParser().parse_pdf('test.pdf')
+
+    content_extractor = container.content_extractor()
+    first = content_extractor.extract_content(documents)
+    second = content_extractor.extract_content(documents)
+    assert isinstance(first['resume_info'], ResumeInfoResponse)
+    assert first['resume_info'] == second['resume_info']  # 가짜 모델은 결정적
+    assert first['summary'] == second['summary']
+
+    resumes = synthetic_corpus([first], 3)
+    assert len({resume['content'] for resume in resumes}) == 3
+    vector_store_manager = container.vector_store_manager()
+    vector_store_manager.add_resumes(resumes)
+    assert vector_store_manager.count() == 3
+    assert len(vector_store_manager.search_resumes('Python 백엔드', k=2, mode='dense')) == 2
+
+    result = run_rerank(container.result_filter(), [first], queries=2, candidates=3)
+    assert set(result) == {'cold', 'warm'}
+    container.shutdown_resources()
@@ -0,0 +1,55 @@
+import time
+
+from langchain.schema import Document
+from langchain_core.runnables import RunnableLambda
+
+from llm.chain_router import ChainRouter
+from llm.extract import ContentExtractor
+
+
+STRUCTURED = Document(page_content='김시험\n경력\n결제 서비스 백엔드 개발 3년\n학력\n시험대학교 컴퓨터공학과\n기술 스택\nPython, Django')
+
+
+def chains():
+    return {name: RunnableLambda(lambda resume, name=name: {'summary': name}) for name in ('section', 'split', 'summarize')}
+
+
+def test_router_sends_short_structured_resume_to_split(char_counter):
+    router = ChainRouter(chains(), token_counter=char_counter)
+    decision = router.route([STRUCTURED], STRUCTURED.page_content)
+    assert (decision.chain, decision.headings) == ('split', 3)
+
+
+def test_router_sends_messy_or_long_documents_elsewhere(char_counter):
+    router = ChainRouter(chains(), token_counter=char_counter, summarize_pages=3)
+    messy = Document(page_content='김\n시\n험\n백엔드 개발자입니다')
+    assert router.route([messy], messy.page_content).chain == 'section'
+    assert router.route([STRUCTURED] * 3, STRUCTURED.page_content * 3).chain == 'section'
+    assert router.route([STRUCTURED] * 4, STRUCTURED.page_content * 4).chain == 'summarize'
+    assert router.route([STRUCTURED], STRUCTURED.page_content, truncated=True).chain == 'summarize'
+
+
+def test_content_extractor_routes_each_resume(char_counter):
+    router = ChainRouter(chains(), token_counter=char_counter)
+    extractor = ContentExtractor(chains()['section'], router=router)
+    messy = Document(page_content='김\n시\n험')
+
+    contents = extractor.extract_contents([[STRUCTURED], [messy], [STRUCTURED]])
+    assert [content['summary'] for content in contents] == ['split', 'section', 'split']
+    assert contents[1]['route'].reason == 'unstructured'
+
+
+def test_extract_contents_records_latency_per_resume(char_counter, llm_metrics):
+    def split(resume):
+        time.sleep(0.3 if '느림' in resume else 0)
+        return {'summary': 'split'}
+
+    router = ChainRouter({**chains(), 'split': RunnableLambda(split)}, token_counter=char_counter)
+    extractor = ContentExtractor(chains()['section'], router=router)
+    slow = Document(page_content=STRUCTURED.page_content + '\n느림')
+
+    extractor.extract_contents([[STRUCTURED], [slow]])
+    # 배치 전체 시간(0.3초)을 이력서마다 기록하면 합이 0.6초를 넘는다
+    histogram = llm_metrics.snapshot('llm_latency_seconds', 'route split')
+    assert histogram.count == 2
+    assert 0.3 <= histogram.sum < 0.5
@@ -0,0 +1,57 @@
+from langchain.schema import Document
+from langchain_core.runnables import RunnableLambda
+
+from llm.extract import ContentExtractor
+from preprocess.compact import ResumeCompactor
+
+
+PAGES = [
+    Document(page_content='원티드 이력서\n김시험\n백엔드  개발자\n저는  서비스를  만드는  개발자로  사용자  문제를  해결하는  것을\n좋아합니다 .\n1 / 2'),
+    Document(page_content='원티드 이력서\n경력\n- 결제  서비스  개발 (2 년 )\n2 / 2'),
+]
+
+
+def test_compactor_removes_boilerplate_and_joins_wraps(char_counter):
+    compactor = ResumeCompactor(token_counter=char_counter, wrap_width=20)
+    text, report = compactor.compact(PAGES)
+
+    assert text == (
+        '원티드 이력서\n김시험\n백엔드 개발자\n'
+        '저는 서비스를 만드는 개발자로 사용자 문제를 해결하는 것을 좋아합니다.\n\n'
+        '경력\n- 결제 서비스 개발 (2 년)'
+    )
+    assert report.removed_lines == 3
+    assert report.tokens_saved == len(''.join(page.page_content for page in PAGES)) - len(text)
+    assert not report.truncated
+
+
+def test_compactor_keeps_number_lines_that_are_not_page_numbers(char_counter):
+    compactor = ResumeCompactor(token_counter=char_counter)
+    # 한 페이지의 끝 줄에 있는 연도는 쪽 번호가 아니다
+    text, report = compactor.compact([Document(page_content='김시험\n경력\n입사\n2021\n퇴사\n2023')])
+    assert text == '김시험\n경력\n입사\n2021\n퇴사\n2023'
+    assert report.removed_lines == 0
+
+    # 표지에 번호가 없어 한 칸 밀린 쪽 번호는 여러 페이지에서 같은 간격으로 반복되므로 지운다
+    pages = [Document(page_content=content) for content in ['표지\n김시험', '경력\n결제 서비스\n1', '학력\n컴퓨터공학\n2']]
+    text, report = compactor.compact(pages)
+    assert text == '표지\n김시험\n\n경력\n결제 서비스\n\n학력\n컴퓨터공학'
+    assert report.removed_lines == 2
+
+
+def test_compactor_truncates_to_token_budget(char_counter):
+    compactor = ResumeCompactor(max_tokens=40, token_counter=char_counter)
+    text, report = compactor.compact(PAGES)
+    assert report.truncated
+    assert report.compacted_tokens <= 40
+    assert text.startswith('원티드 이력서\n김시험\n백엔드 개발자\n저는')
+
+
+def test_content_extractor_reports_compaction(char_counter):
+    extractor = ContentExtractor(
+        RunnableLambda(lambda resume: {'summary': resume}),
+        compactor=ResumeCompactor(token_counter=char_counter),
+    )
+    content = extractor.extract_content(PAGES)
+    assert '1 / 2' not in content['summary']
+    assert content['compaction'].tokens_saved > 0
@@ -0,0 +1,41 @@
+from llm.document_store import ResumeDocumentStore
+from schemas.enums import JobCategory, YearsOfExperience, ProgrammingLanguage
+from schemas.response import ResumeInfoResponse
+
+
+RESUME_INFO = ResumeInfoResponse(
+    resume_id='resume-1',
+    applicant_name='김시험',
+    job_category=JobCategory.BACKEND,
+    years=YearsOfExperience.JUNIOR,
+    language=ProgrammingLanguage.PYTHON,
+)
+
+
+def test_document_store_put_get_and_delete(tmp_path):
+    store = ResumeDocumentStore(db_path=str(tmp_path / 'documents.sqlite3'))
+    assert store.get('resume-1') is None
+
+    first = store.put('resume-1', ['경력: 백엔드 3년', '기술: Python'], RESUME_INFO)
+    second = store.put('resume-1', '경력: 백엔드 4년', RESUME_INFO)
+    assert second.created_at == first.created_at
+    assert second.updated_at >= first.updated_at
+
+    # 다른 인스턴스(다른 워커)도 같은 데이터를 본다
+    other = ResumeDocumentStore(db_path=str(tmp_path / 'documents.sqlite3'))
+    stored = other.get('resume-1')
+    assert stored.summary_text == '경력: 백엔드 4년'
+    assert stored.resume_info == RESUME_INFO
+
+    assert other.get('resume-1') is stored
+    assert other.stats()['hits'] == 1
+
+    assert store.delete('resume-1')
+    assert store.get('resume-1') is None
+
+
+def test_document_store_cache_expires(tmp_path):
+    store = ResumeDocumentStore(db_path=str(tmp_path / 'documents.sqlite3'), cache_ttl=0)
+    store.put('resume-1', ['경력: 백엔드 3년', '기술: Python'], RESUME_INFO)
+    assert store.get('resume-1').summary_text == '경력: 백엔드 3년\n기술: Python'
+    assert store.get('resume-1') is not store.get('resume-1')
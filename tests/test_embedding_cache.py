@@ -0,0 +1,43 @@
+import asyncio
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from llm.embedding_cache import CachedEmbeddings
+
+
+class CountingEmbeddings(DeterministicFakeEmbedding):
+    calls: int = 0
+
+    def embed_documents(self, texts):
+        self.calls += 1
+        return super().embed_documents(texts)
+
+    def embed_query(self, text):
+        self.calls += 1
+        return super().embed_query(text)
+
+
+def test_cached_embeddings_skip_repeated_texts(tmp_path):
+    underlying = CountingEmbeddings(size=8)
+    embeddings = CachedEmbeddings(underlying, cache_path=str(tmp_path / 'emb.sqlite3'))
+
+    first = embeddings.embed_documents(['백엔드 3년', 'Kotlin 시니어'])
+    second = embeddings.embed_documents(['Kotlin 시니어', '백엔드 3년'])
+    query = embeddings.embed_query('백엔드 3년')
+
+    assert underlying.calls == 1
+    assert second == [first[1], first[0]]
+    assert query == first[0]
+    assert embeddings.stats()['misses'] == 2
+
+
+def test_cached_embeddings_persist_to_disk(tmp_path):
+    cache_path = str(tmp_path / 'emb.sqlite3')
+    CachedEmbeddings(CountingEmbeddings(size=8), cache_path=cache_path).embed_query('Spring Boot')
+
+    underlying = CountingEmbeddings(size=8)
+    embeddings = CachedEmbeddings(underlying, cache_path=cache_path)
+    asyncio.run(embeddings.aembed_query('Spring Boot'))
+
+    assert underlying.calls == 0
+    assert embeddings.stats()['disk_hits'] == 1
@@ -1,6 +1,7 @@
 from preprocess.load_pdf import PDFLoader
 from preprocess.parse_pdf import PyPDFParser
 from llm.extract import ContentExtractor, section_chain, split_chain, summarize_chain
+from schemas.response import ResumeInfoResponse
 
 '''
 텍스트 추출 방법 3가지 테스트
@@ -21,7 +22,11 @@ def test_extract_summary():
     split_contents = split_extractor.extract_content(documents)
     section_contents = section_extractor.extract_content(documents)
 
-    assert isinstance(summary_contents, str)
-    assert isinstance(split_contents, str)
-    assert isinstance(section_contents, str)
+    # 체인은 요약(split은 청크 리스트)과 추출 정보를 함께 돌려준다
+    for contents in (summary_contents, split_contents, section_contents):
+        assert isinstance(contents, dict)
+        assert isinstance(contents['resume_info'], ResumeInfoResponse)
+    assert isinstance(summary_contents['summary'], str)
+    assert isinstance(split_contents['summary'], list)
+    assert isinstance(section_contents['summary'], str)
 
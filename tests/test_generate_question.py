@@ -0,0 +1,56 @@
+from llm.generate_question import QuestionCache
+from schemas.enums import QuestionType
+from schemas.response import InterviewQuestionResponse
+
+
+QUESTIONS = [
+    InterviewQuestionResponse(question_type=question_type, question=f'{question_type} 예시')
+    for question_type in QuestionType
+]
+
+
+def test_question_cache_hit_requires_same_summary():
+    cache = QuestionCache()
+    cache.put('resume-1', '백엔드 3년', QUESTIONS)
+
+    assert cache.get('resume-1', '백엔드 3년') == QUESTIONS
+    assert cache.get('resume-1', '백엔드 5년') is None
+    assert cache.get('resume-2', '백엔드 3년') is None
+
+
+def test_question_cache_invalidate():
+    cache = QuestionCache()
+    cache.put('resume-1', '백엔드 3년', QUESTIONS)
+    cache.invalidate('resume-1')
+
+    assert cache.get('resume-1', '백엔드 3년') is None
+
+
+def test_batch_mode_fills_missing_and_duplicate_types(monkeypatch):
+    from langchain_core.runnables import RunnableLambda
+    import llm.generate_question as generate_question_module
+    from schemas.response import InterviewQuestionListResponse
+
+    # 일괄 응답: 경험 질문이 두 번, 프로젝트 질문은 없음
+    batch = InterviewQuestionListResponse(questions=[
+        InterviewQuestionResponse(question_type=QuestionType.JOB_SPECIFIC, question='직군 질문'),
+        InterviewQuestionResponse(question_type=QuestionType.EXPERIENCE, question='경험 질문 1'),
+        InterviewQuestionResponse(question_type=QuestionType.CULTURE_FIT, question='컬쳐핏 질문'),
+        InterviewQuestionResponse(question_type=QuestionType.EXPERIENCE, question='경험 질문 2'),
+    ])
+    single_calls = []
+
+    def single(prompt):
+        subject = next(question_type for question_type in QuestionType if question_type.value in prompt.to_string())
+        single_calls.append(subject)
+        return InterviewQuestionResponse(question_type=subject, question=f'{subject} 개별 생성')
+
+    monkeypatch.setattr(generate_question_module, 'question_list_llm_with_schema', RunnableLambda(lambda _: batch))
+    monkeypatch.setattr(generate_question_module, 'question_llm_with_schema', RunnableLambda(single))
+
+    questions = generate_question_module.generate_question('백엔드 3년', mode='batch')
+
+    assert [question.question_type for question in questions] == list(QuestionType)
+    assert questions[2].question == '경험 질문 1'
+    assert questions[3].question == '프로젝트 질문 개별 생성'
+    assert single_calls == [QuestionType.PROJECT]
@@ -0,0 +1,97 @@
+import shutil
+import signal
+import time
+
+from langchain_core.runnables import RunnableLambda
+
+from llm.extract import ContentExtractor
+from llm.ingest import BulkIngestor, resume_id_from_path
+from preprocess.pdf_engine import PDF_BACKENDS, ParallelPDFParser, PyPDF2Backend
+from schemas.enums import JobCategory, YearsOfExperience, ProgrammingLanguage
+from schemas.response import ResumeInfoResponse
+
+
+class RecordingVectorStore:
+    def __init__(self):
+        self.batches = []
+
+    def add_resumes(self, resumes):
+        self.batches.append(resumes)
+
+
+def fake_chain(resume: str):
+    return {
+        "resume_info": ResumeInfoResponse(
+            resume_id="0",
+            applicant_name="강태경",
+            job_category=JobCategory.BACKEND,
+            years=YearsOfExperience.JUNIOR,
+            language=ProgrammingLanguage.PYTHON,
+        ),
+        "summary": resume[:100],
+    }
+
+
+def test_bulk_ingest_batches_vector_store_writes():
+    vector_store = RecordingVectorStore()
+    ingestor = BulkIngestor(
+        content_extractor=ContentExtractor(RunnableLambda(fake_chain)),
+        vector_store_manager=vector_store,
+        parse_workers=2,
+        batch_size=2,
+    )
+
+    report = ingestor.ingest(['test.pdf', 'test.pdf', 'test.pdf', 'missing.pdf'])
+
+    assert report.total == 4
+    assert report.ingested == 3
+    assert list(report.failed) == ['missing.pdf']
+    # 3개의 이력서가 배치 크기 2 기준으로 두 번에 나뉘어 저장
+    assert [len(batch) for batch in vector_store.batches] == [2, 1]
+    assert vector_store.batches[0][0]['resume_id'] == resume_id_from_path('test.pdf')
+
+
+class HangOnOpenBackend(PyPDF2Backend):
+    """파일 이름에 hang이 있으면 SIGALRM으로도 끊기지 않게 열기에서 멈춘다"""
+
+    def open(self, source):
+        if 'hang' in source:
+            signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGALRM})
+            time.sleep(60)
+        return super().open(source)
+
+
+def test_bulk_ingest_bounds_parsing_time(tmp_path, monkeypatch):
+    monkeypatch.setitem(PDF_BACKENDS, 'hang-open', HangOnOpenBackend())
+    for name in ['ok.pdf', 'hang.pdf']:
+        shutil.copy('test.pdf', tmp_path / name)
+    pdf_parser = ParallelPDFParser(backend='hang-open', workers=1, document_timeout=1.0)
+    ingestor = BulkIngestor(
+        content_extractor=ContentExtractor(RunnableLambda(fake_chain)),
+        vector_store_manager=RecordingVectorStore(),
+        pdf_parser=pdf_parser,
+    )
+    try:
+        start = time.perf_counter()
+        report = ingestor.ingest([str(tmp_path / 'ok.pdf'), str(tmp_path / 'hang.pdf')])
+    finally:
+        pdf_parser.close()
+
+    # 멈춘 PDF는 document_timeout 뒤에 실패로 기록되고 적재는 끝난다
+    assert time.perf_counter() - start < 10
+    assert report.ingested == 1
+    assert report.failed[str(tmp_path / 'hang.pdf')].startswith('DocumentTimeoutError')
+
+
+def test_resume_id_from_path_normalizes_local_paths(tmp_path, monkeypatch):
+    (tmp_path / 'batch').mkdir()
+    (tmp_path / 'batch' / 'a.pdf').write_bytes(b'%PDF')
+    (tmp_path / 'link').symlink_to(tmp_path / 'batch')
+    monkeypatch.chdir(tmp_path)
+
+    expected = resume_id_from_path(str(tmp_path / 'batch' / 'a.pdf'))
+    for path in ['batch/a.pdf', './batch/../batch/a.pdf', 'link/a.pdf']:
+        assert resume_id_from_path(path) == expected
+    # S3 키는 로컬 경로로 해석하지 않는다
+    assert resume_id_from_path('batch/a.pdf', 's3') != expected
+    assert resume_id_from_path('batch/a.pdf', 's3') == resume_id_from_path('batch/a.pdf', 's3')
@@ -0,0 +1,81 @@
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from llm.lexical_index import BM25Index, reciprocal_rank_fusion, tokenize, words
+from llm.vector_store import VectorStoreManager
+from schemas.enums import JobCategory, YearsOfExperience, ProgrammingLanguage
+
+
+class CountingEmbedding(DeterministicFakeEmbedding):
+    query_calls: int = 0
+
+    def embed_query(self, text):
+        self.query_calls += 1
+        return super().embed_query(text)
+
+
+def test_tokenize_korean_and_tech_terms():
+    assert words('Spring Boot와 Kafka를 사용한 MSA 경험') == ['spring', 'boot', 'kafka', '사용한', 'msa', '경험']
+    assert 'c++' in words('C++ 개발자')
+    assert 'node.js' in words('Node.js 서버')
+    # 복합어도 bigram으로 매칭된다
+    assert '백엔' in tokenize('백엔드개발자')
+
+
+def test_bm25_add_remove_and_filter():
+    index = BM25Index()
+    index.add(['a', 'b'], [
+        Document(page_content='Spring Boot Kafka 백엔드', metadata={'job_category': 'backend'}),
+        Document(page_content='React TypeScript 프론트엔드', metadata={'job_category': 'frontend'}),
+    ])
+
+    assert [doc.id for doc in index.search('kafka')] == ['a']
+    assert index.search('kafka', filter_metadata={'job_category': 'frontend'}) == []
+    assert index.is_keyword_query('Spring Kafka')
+    assert not index.is_keyword_query('협업을 잘하는 사람')
+
+    index.remove(['a'])
+    assert index.search('kafka') == []
+    assert len(index) == 1
+
+
+def test_reciprocal_rank_fusion():
+    a, b, c = (Document(id=i, page_content=i) for i in 'abc')
+    fused = reciprocal_rank_fusion([[a, b], [b, c]])
+    assert [doc.id for doc in fused] == ['b', 'a', 'c']
+
+
+def test_hybrid_search_skips_embedding_for_keyword_query(tmp_path):
+    embeddings = CountingEmbedding(size=8)
+    manager = VectorStoreManager(embeddings=embeddings, persist_directory=str(tmp_path))
+    manager.add_resumes([
+        {
+            'content': 'Spring Boot와 Kafka 기반 MSA 백엔드 개발',
+            'resume_id': 'r1',
+            'applicant_name': '김백엔드',
+            'job_category': 'backend',
+            'years': '3-7',
+            'language': 'java',
+        },
+        {
+            'content': 'React와 TypeScript로 대시보드 개발',
+            'resume_id': 'r2',
+            'applicant_name': '이프론트',
+            'job_category': 'frontend',
+            'years': '0-3',
+            'language': 'typescript',
+        },
+    ])
+
+    results = manager.search_resumes('Spring Kafka', k=1)
+    assert results[0].metadata['resume_id'] == 'r1'
+    assert embeddings.query_calls == 0
+
+    results = manager.search_resumes('대규모 트래픽을 처리해 본 개발자', k=2)
+    assert {doc.metadata['resume_id'] for doc in results} == {'r1', 'r2'}
+    assert embeddings.query_calls == 1
+
+    # 재시작 시 Chroma에 저장된 문서로 BM25 색인을 복원한다
+    reopened = VectorStoreManager(embeddings=embeddings, persist_directory=str(tmp_path))
+    assert len(reopened.lexical_index) == 2
+    assert reopened.search_resumes('Kafka', k=1, mode='lexical')[0].metadata['resume_id'] == 'r1'
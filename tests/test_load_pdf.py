@@ -1,9 +1,30 @@
-from preprocess.load_pdf import PDFLoader
-from langchain.schema import Document
+import pytest
+from io import BytesIO
+
+from preprocess.load_pdf import PDFLoader, InvalidPDFError
+from preprocess.parse_pdf import PyPDFParser
 
 def test_load_pdf():
     pdf_loader = PDFLoader(storage_type='local')
     pdf_data = pdf_loader.load_pdf('test.pdf')
 
-    assert isinstance(pdf_data, list)
-    assert isinstance(pdf_data[0], Document)
+    assert isinstance(pdf_data, BytesIO)
+    assert pdf_data.read(5) == b'%PDF-'
+
+
+def test_open_pdf_releases_mapping():
+    pdf_loader = PDFLoader(storage_type='local')
+    with pdf_loader.open_pdf('test.pdf') as pdf_data:
+        assert pdf_data[:5] == b'%PDF-'
+        assert len(PyPDFParser().parse_pdf(pdf_data)) > 0
+    assert pdf_data.closed
+
+
+@pytest.mark.parametrize('content, max_bytes', [(b'not a pdf', 1024), (b'', 1024), (b'%PDF-1.4' + b'0' * 100, 10)])
+def test_open_pdf_rejects_before_parsing(tmp_path, content, max_bytes):
+    file_path = tmp_path / 'upload.pdf'
+    file_path.write_bytes(content)
+    pdf_loader = PDFLoader(storage_type='local', max_bytes=max_bytes)
+    with pytest.raises(InvalidPDFError):
+        with pdf_loader.open_pdf(str(file_path)):
+            pass
@@ -0,0 +1,152 @@
+import asyncio
+import threading
+import time
+
+from langchain.schema import Document
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import RunnableLambda
+from pydantic import PrivateAttr
+
+from llm.extract import build_map_reduce_section_chain
+from preprocess.sections import merge_sectioned_texts, split_page_groups
+
+
+class SlowFakeChatModel(BaseChatModel):
+    """delay초 뒤에 response를 돌려주고, 받은 입력과 동시에 실행 중이던 호출 수의 최댓값을 기록"""
+
+    response: str
+    delay: float = 0.2
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _running: int = PrivateAttr(default=0)
+    peak_concurrency: int = 0
+    inputs: list = []
+
+    @property
+    def _llm_type(self):
+        return 'slow-fake'
+
+    def _enter(self, messages):
+        with self._lock:
+            self.inputs.append(messages[-1].content)
+            self._running += 1
+            self.peak_concurrency = max(self.peak_concurrency, self._running)
+
+    def _exit(self):
+        with self._lock:
+            self._running -= 1
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self._enter(messages)
+        try:
+            time.sleep(self.delay)
+        finally:
+            self._exit()
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.response))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        self._enter(messages)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self._exit()
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.response))])
+
+
+def test_split_page_groups_packs_pages_up_to_limit():
+    pages = ['a' * 900, 'b' * 900, 'c' * 900, 'd' * 3000]
+    assert [len(group) for group in split_page_groups('\n\n'.join(pages), 2000)] == [1802, 900, 3000]
+
+
+def test_merge_sectioned_texts_combines_pages():
+    merged = merge_sectioned_texts([
+        '인적사항: 김시험\n경력:\n- A사 (2021~)\n자격증: 없음',
+        '- **인적사항**: 김시험\n경력:\n- B사 (2019~2021)\n프로젝트: 추천 시스템',
+    ])
+    assert merged == '인적사항:\n김시험\n경력:\n- A사 (2021~)\n- B사 (2019~2021)\n프로젝트:\n추천 시스템'
+
+
+def test_map_reduce_sections_pages_concurrently():
+    section_model = SlowFakeChatModel(response='경력:\n- A사')
+    chain = build_map_reduce_section_chain(
+        max_group_chars=100,
+        max_concurrency=4,
+        section_model=section_model,
+        refine_model=RunnableLambda(lambda prompt: 'resume_info'),
+    )
+
+    content = asyncio.run(chain.ainvoke('\n\n'.join(['페이지 내용 ' * 10] * 4)))
+
+    assert content['summary'] == '경력:\n- A사\n- A사\n- A사\n- A사'
+    assert content['resume_info'] == 'resume_info'
+    # 네 페이지 묶음을 한 번에 동시 호출한다
+    assert section_model.peak_concurrency == 4
+
+
+def test_map_reduce_caps_each_page_group_instead_of_document(char_counter):
+    section_model = SlowFakeChatModel(response='경력:\n- A사', delay=0)
+    chain = build_map_reduce_section_chain(
+        max_group_chars=100,
+        max_concurrency=4,
+        section_model=section_model,
+        refine_model=RunnableLambda(lambda prompt: 'resume_info'),
+        max_group_tokens=50,
+        token_counter=char_counter,
+    )
+    pages = [f'{i}페이지 ' + '가' * 60 for i in range(3)] + ['긴 페이지 ' + '나' * 300]
+    chain.invoke('\n\n'.join(pages))
+
+    # 문서 전체를 예산에 맞춰 자르지 않으므로 마지막 페이지까지 전달되고, 묶음마다 50자로 제한된다
+    assert sorted(section_model.inputs) == sorted(f'Resume:\n{page[:50]}\n' for page in pages)
+
+
+def test_content_extractor_leaves_long_documents_to_map_reduce():
+    from containers import init_content_extractor
+
+    section_model = SlowFakeChatModel(response='경력:\n- A사', delay=0)
+    extractor = init_content_extractor(
+        chain_type='section', input_compaction=True, input_max_tokens=20, section_segmenter=False,
+        section_map_reduce=True, section_map_group_chars=100, section_map_concurrency=4,
+        chain_routing=True, route_split_max_pages=1, route_split_max_tokens=10,
+        section_model=section_model, summarize_model=section_model,
+        refine_model=RunnableLambda(lambda prompt: 'resume_info'),
+    )
+    pages = [Document(page_content=f'{title}\n' + char * 80) for title, char in [('경력', '가'), ('학력', '나'), ('프로젝트', '다')]]
+    content = extractor.extract_content(pages)
+
+    assert content['route'].chain == 'section'
+    assert not content['compaction'].truncated
+    # 페이지 묶음마다 한 번씩 호출된다 (문서 전체를 잘랐다면 첫 묶음만 남는다)
+    assert len(section_model.inputs) == 3
+
+
+def test_segmented_long_resume_keeps_token_budget():
+    from containers import init_content_extractor
+
+    section_model = SlowFakeChatModel(response='경력:\n- A사', delay=0)
+    prompts = []
+    extractor = init_content_extractor(
+        chain_type='section', input_compaction=True, input_max_tokens=200, section_segmenter=True,
+        section_map_reduce=True, section_map_group_chars=2000, section_map_concurrency=4,
+        chain_routing=True, route_split_max_pages=2, route_split_max_tokens=1500,
+        section_model=section_model, summarize_model=section_model,
+        refine_model=RunnableLambda(lambda prompt: prompts.append(prompt.to_string()) or 'resume_info'),
+    )
+    headings = ['인적사항', '학력', '경력', '프로젝트', '자격증', '자기소개서']
+    pages = [
+        Document(page_content=f'{heading}\n' + '\n'.join(
+            f'- {heading} 항목 {i * 100 + j}: 결제 서비스 백엔드 API 설계와 운영, 장애 대응 경험 정리' for j in range(60)
+        ))
+        for i, heading in enumerate(headings)
+    ]
+    content = extractor.extract_content(pages)
+
+    # 제목이 분명해 section LLM 없이 분할 결과를 바로 refine에 넘기더라도 토큰 예산은 지킨다
+    assert content['route'].chain == 'section'
+    assert content['route'].reason == 'long document, summarize disabled'
+    assert not section_model.inputs
+    assert len(prompts) == 1
+    counter = extractor.compactor.token_counter
+    assert counter.count(content['summary']) <= 200
+    assert content['summary'] in prompts[0]
@@ -0,0 +1,84 @@
+import threading
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from llm.metadata_index import MetadataBitmapIndex
+from llm.vector_store import VectorStoreManager
+
+
+def test_bitmap_candidates_and_selectivity():
+    index = MetadataBitmapIndex()
+    index.add(['a', 'b', 'c'], [
+        {'job_category': 'ai', 'years': '7-10', 'language': 'kotlin'},
+        {'job_category': 'ai', 'years': '0-3', 'language': 'python'},
+        {'job_category': 'backend', 'years': '7-10', 'language': 'kotlin'},
+    ])
+
+    assert index.candidates({'job_category': 'ai'}) == ['a', 'b']
+    assert index.candidates({'job_category': 'ai', 'years': '7-10', 'language': 'kotlin'}) == ['a']
+    assert index.candidates({'job_category': 'frontend'}) == []
+    assert index.selectivity({'language': 'kotlin'}) == 2 / 3
+    assert not index.supports({'applicant_name': '김시험'})
+
+    index.remove(['a'])
+    assert index.candidates({'language': 'kotlin'}) == ['c']
+    assert len(index) == 2
+
+
+
+def test_bitmap_reuses_rows_freed_by_delete_and_upsert():
+    index = MetadataBitmapIndex()
+    index.add(['a', 'b', 'c'], [{'job_category': 'ai'}, {'job_category': 'backend'}, {'job_category': 'ai'}])
+
+    # 같은 id로 다시 쓰는 upsert와 삭제 후 추가를 반복해도 행 수와 비트맵 길이가 늘지 않는다
+    for i in range(100):
+        index.add(['a'], [{'job_category': 'backend' if i % 2 else 'ai'}])
+        index.remove(['b'])
+        index.add(['b'], [{'job_category': 'frontend'}])
+    assert len(index._ids) == 3
+    assert index._alive.bit_length() == 3
+
+    # 재사용한 행에 이전 문서의 값이 남지 않는다
+    assert index.candidates({'job_category': 'ai'}) == ['c']
+    assert index.candidates({'job_category': 'backend'}) == ['a']
+    assert index.candidates({'job_category': 'frontend'}) == ['b']
+    index.remove(['a', 'b', 'c'])
+    assert len(index) == 0
+    assert all(not bitmaps for bitmaps in index._bitmaps.values())
+
+def test_search_plan_uses_exact_scoring_for_narrow_filters(tmp_path):
+    manager = VectorStoreManager(
+        embeddings=DeterministicFakeEmbedding(size=8),
+        persist_directory=str(tmp_path),
+        exact_search_threshold=2,
+    )
+    manager.add_resumes([
+        {
+            'content': f'이력서 {i}',
+            'resume_id': f'r{i}',
+            'applicant_name': f'지원자{i}',
+            'job_category': 'ai' if i == 0 else 'backend',
+            'years': '7-10',
+            'language': 'kotlin' if i == 0 else 'java',
+        }
+        for i in range(5)
+    ])
+
+    results = manager.search_resumes('시니어', k=3, mode='dense',
+                                     filter_metadata={'job_category': 'ai', 'years': '7-10', 'language': 'kotlin'})
+    assert [doc.metadata['resume_id'] for doc in results] == ['r0']
+    assert manager.last_search_plan['strategy'] == 'exact'
+    assert manager.last_search_plan['selectivity'] == 0.2
+
+    manager.search_resumes('시니어', k=3, mode='dense', filter_metadata={'job_category': 'backend'})
+    assert manager.last_search_plan['strategy'] == 'ann'
+
+    assert manager.search_resumes('시니어', k=3, mode='dense', filter_metadata={'job_category': 'frontend'}) == []
+    assert manager.last_search_plan['strategy'] == 'empty'
+
+    # 다른 요청(스레드)의 검색 계획은 보이지 않는다
+    thread = threading.Thread(target=manager.search_resumes, args=('시니어',),
+                              kwargs={'k': 3, 'mode': 'dense', 'filter_metadata': {'job_category': 'backend'}})
+    thread.start()
+    thread.join()
+    assert manager.last_search_plan['strategy'] == 'empty'
@@ -0,0 +1,72 @@
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+
+from llm.log_callback_handler import LogCallbackHandler
+from llm.metrics import LLMMetrics
+from llm.telemetry import TelemetryPipeline
+
+
+class ListSink:
+    def __init__(self):
+        self.records = []
+
+    def write(self, records):
+        self.records.extend(records)
+
+
+def llm_result(content: str, input_tokens: int) -> LLMResult:
+    message = AIMessage(
+        content=content,
+        response_metadata={'model_name': 'gpt-4o-mini-2024-07-18'},
+        usage_metadata={
+            'input_tokens': input_tokens,
+            'output_tokens': 1,
+            'total_tokens': input_tokens + 1,
+            'input_token_details': {'cache_read': 0},
+        },
+    )
+    return LLMResult(generations=[[ChatGeneration(message=message)]])
+
+
+def test_handler_tracks_concurrent_runs_separately(llm_metrics):
+    sink = ListSink()
+    pipeline = TelemetryPipeline([sink], flush_interval=60)
+    handler = LogCallbackHandler('concurrent test', telemetry=pipeline)
+
+    def call(i):
+        run_id = uuid4()
+        handler.on_chat_model_start({}, [[HumanMessage(content=f'질의 {i}')]], run_id=run_id)
+        handler.on_llm_new_token('a', run_id=run_id)
+        handler.on_llm_end(llm_result(f'답변 {i}', input_tokens=i), run_id=run_id)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(call, range(1, 33)))
+    pipeline.flush()
+
+    assert len(sink.records) == 32
+    for record in sink.records:
+        # 같은 호출의 질의/답변/토큰이 한 레코드에 짝지어져 있어야 함
+        i = int(record['질의'].split()[-1])
+        assert record['답변'] == f'답변 {i}'
+        assert record['입력토큰'] == i
+    assert handler.runs == {}
+    assert llm_metrics.snapshot('llm_latency_seconds', 'concurrent test').count == 32
+    pipeline.close()
+
+
+def test_render_prometheus():
+    metrics = LLMMetrics()
+    metrics.observe('refine json', latency=0.3, ttft=0.1, input_tokens=300, output_tokens=20, cost=0.0001)
+    metrics.observe('refine json', latency=3.0, input_tokens=100, output_tokens=20)
+    metrics.observe_error('refine json')
+    text = metrics.render_prometheus()
+
+    assert '# TYPE llm_latency_seconds histogram' in text
+    assert 'llm_latency_seconds_bucket{chain="refine json",le="0.5"} 1' in text
+    assert 'llm_latency_seconds_bucket{chain="refine json",le="+Inf"} 2' in text
+    assert 'llm_latency_seconds_count{chain="refine json"} 2' in text
+    assert 'llm_time_to_first_token_seconds_count{chain="refine json"} 1' in text
+    assert 'llm_errors_total{chain="refine json"} 1' in text
@@ -1,17 +1,18 @@
 from preprocess.parse_pdf import PyPDFParser
-from PyPDF2 import PdfReader
+from langchain.schema import Document
 
 
 def test_parse_pdf():
     '''
-    텍스트와 함께 텍스트의 위치에 대한 정보를 함께 얻는다.
-    '''    
+    페이지별 텍스트와 메타데이터를 Document로 얻는다.
+    '''
     pdf_parser = PyPDFParser()
     parsed_info = pdf_parser.parse_pdf('test.pdf')
 
 
     assert isinstance(parsed_info, list)
-    assert isinstance(parsed_info[0]['text'], str)
-    assert isinstance(parsed_info[0]['metadata'], dict)
+    assert isinstance(parsed_info[0], Document)
+    assert isinstance(parsed_info[0].page_content, str)
+    assert isinstance(parsed_info[0].metadata, dict)
 
 
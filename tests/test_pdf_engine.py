@@ -0,0 +1,152 @@
+import glob
+import os
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from preprocess.load_pdf import PDFLoader
+from preprocess.pdf_engine import PDF_BACKENDS, DocumentTimeoutError, ParallelPDFParser
+
+
+@pytest.fixture
+def pdf_path():
+    return sorted(glob.glob('pdf_data/*.pdf'))[0]
+
+
+def test_parallel_parser_keeps_page_order(pdf_path):
+    parser = ParallelPDFParser(workers=2)
+    try:
+        documents, report = parser.parse_with_report(pdf_path)
+    finally:
+        parser.close()
+
+    assert [doc.metadata['page'] for doc in documents] == list(range(report.page_count))
+    assert any(doc.page_content.strip() for doc in documents)
+    assert not report.truncated and not report.failed_pages
+    assert all(page.elapsed_ms >= 0 for page in report.pages)
+
+
+def test_parallel_parser_caps_pages(pdf_path):
+    parser = ParallelPDFParser(backend='pypdf', workers=1, max_pages=1)
+    try:
+        with open(pdf_path, 'rb') as file:
+            documents, report = parser.parse_with_report(file.read())
+    finally:
+        parser.close()
+
+    assert len(documents) == 1
+    assert documents[0].metadata['backend'] == 'pypdf'
+    assert report.truncated == (report.page_count > 1)
+
+
+def test_parallel_parser_sends_mapped_pdf_by_path(pdf_path):
+    parser = ParallelPDFParser(workers=2)
+    try:
+        with PDFLoader(storage_type='local').open_pdf(pdf_path) as pdf_data:
+            # 매핑을 바이트로 복사해 워커마다 피클링하지 않고 경로만 넘긴다
+            assert parser._source(pdf_data) == os.path.abspath(pdf_path)
+            documents = parser.parse_pdf(pdf_data)
+        assert [doc.page_content for doc in documents] == [doc.page_content for doc in parser.parse_pdf(pdf_path)]
+    finally:
+        parser.close()
+
+
+def test_parallel_parser_rejects_unknown_backend():
+    with pytest.raises(ValueError):
+        ParallelPDFParser(backend='unknown')
+
+
+class NativeHangBackend:
+    """
+    SIGALRM으로 끊기지 않는 네이티브 호출처럼 멈추는 백엔드
+
+    b'hang-open:<pid 파일>'이면 열기에서, b'pages:<pid 파일>'이면 두 번째 페이지에서 멈추고,
+    b'slow:<초>'는 열 때마다 그만큼 걸리는 한 페이지 문서
+    """
+
+    @staticmethod
+    def _hang(pid_path):
+        signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGALRM})
+        with open(pid_path, 'w') as file:
+            file.write(str(os.getpid()))
+        time.sleep(60)
+
+    def open(self, data):
+        if data.startswith(b'hang-open'):
+            self._hang(data.decode().split(':', 1)[1])
+        if data.startswith(b'slow'):
+            time.sleep(float(data.split(b':')[1]))
+        return data
+
+    def page_count(self, document):
+        return 1 if document.startswith(b'slow') else 2
+
+    def extract_text(self, document, page_number):
+        if page_number == 1:
+            self._hang(document.decode().split(':', 1)[1])
+        return 'ok'
+
+
+def _wait_for_exit(pid, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with open(f'/proc/{pid}/stat') as file:
+                if file.read().split(') ')[1][0] in 'ZX':
+                    return True
+        except FileNotFoundError:
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_document_timeout_terminates_stuck_worker(tmp_path, monkeypatch):
+    monkeypatch.setitem(PDF_BACKENDS, 'hang', NativeHangBackend())
+    pid_path = tmp_path / 'pid'
+    parser = ParallelPDFParser(backend='hang', workers=2, page_timeout=0.1, document_timeout=1.0)
+    try:
+        start = time.perf_counter()
+        documents, report = parser.parse_with_report(f'pages:{pid_path}'.encode())
+        assert time.perf_counter() - start < 5
+        assert documents[0].page_content == 'ok'
+        assert report.failed_pages == {1: 'document_timeout'}
+        # 멈춘 워커는 종료되고 다음 요청은 새 풀에서 처리된다
+        assert _wait_for_exit(int(pid_path.read_text()))
+
+        pid_path.unlink()
+        with pytest.raises(DocumentTimeoutError):
+            parser.parse_with_report(f'hang-open:{pid_path}'.encode())
+        assert _wait_for_exit(int(pid_path.read_text()))
+    finally:
+        parser.close()
+
+
+def test_document_timeout_excludes_time_queued_behind_other_documents(monkeypatch):
+    monkeypatch.setitem(PDF_BACKENDS, 'hang', NativeHangBackend())
+    parser = ParallelPDFParser(backend='hang', workers=1, page_timeout=0, document_timeout=1.0)
+    try:
+        # 워커 하나에 0.6초짜리 작업 네 개가 줄을 서므로 제출 시점부터 재면 1초를 넘는다
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            reports = list(executor.map(lambda _: parser.parse_with_report(b'slow:0.6')[1], range(2)))
+    finally:
+        parser.close()
+    assert [report.failed_pages for report in reports] == [{}, {}]
+
+
+def test_other_requests_retry_when_stuck_worker_is_terminated(tmp_path, monkeypatch):
+    monkeypatch.setitem(PDF_BACKENDS, 'hang', NativeHangBackend())
+    parser = ParallelPDFParser(backend='hang', workers=2, page_timeout=0, document_timeout=1.0)
+    try:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            stuck = executor.submit(parser.parse_with_report, f'pages:{tmp_path / "pid"}'.encode())
+            time.sleep(0.7)
+            # 페이지 수 확인이 진행 중일 때 멈춘 워커가 종료돼 풀이 깨져도 새 풀에서 다시 시도한다
+            healthy = executor.submit(parser.parse_with_report, b'slow:0.6')
+            documents, report = healthy.result()
+            assert stuck.result()[1].failed_pages == {1: 'document_timeout'}
+    finally:
+        parser.close()
+    assert documents[0].page_content == 'ok'
+    assert report.failed_pages == {}
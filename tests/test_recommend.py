@@ -0,0 +1,74 @@
+from langchain_core.language_models import FakeListLLM
+
+from llm.query_rules import match_query_rules
+from llm.recommend import QueryInfoExtractor
+from schemas.enums import JobCategory, YearsOfExperience, ProgrammingLanguage
+
+
+class CountingLLM(FakeListLLM):
+    calls: int = 0
+
+    def _call(self, *args, **kwargs):
+        self.calls += 1
+        return super()._call(*args, **kwargs)
+
+
+def test_match_query_rules():
+    assert match_query_rules('Kotlin 쓰는 시니어 백엔드 개발자') == {
+        'job_category': JobCategory.BACKEND,
+        'years': YearsOfExperience.SENIOR,
+        'language': ProgrammingLanguage.KOTLIN,
+    }
+    assert match_query_rules('자바스크립트 3년 프론트엔드')['language'] == ProgrammingLanguage.JAVASCRIPT
+    assert match_query_rules('자바스크립트 3년 프론트엔드')['years'] == YearsOfExperience.MIDLEVEL
+    assert match_query_rules('java 개발자')['language'] == ProgrammingLanguage.JAVA
+    assert match_query_rules('협업을 잘하는 사람') == {'job_category': None, 'years': None, 'language': None}
+
+
+def test_match_query_rules_ignores_look_alike_keywords():
+    # 규칙 결과는 메타데이터 필터가 되므로 비슷한 글자에 걸리면 안 된다
+    assert match_query_rules('2023년 이후 LLM 프로젝트 경험')['years'] is None
+    assert match_query_rules('c-level 보고 경험 있는 백엔드')['language'] is None
+    assert match_query_rules('그리드 시스템 프론트')['years'] is None
+    assert match_query_rules('경력 50년')['years'] is None
+    assert match_query_rules('C언어 임베디드 10년')['language'] == ProgrammingLanguage.C
+    assert match_query_rules('C/C++ 개발자')['language'] == ProgrammingLanguage.CPLUSPLUS
+    assert match_query_rules('테크 리드 백엔드')['years'] == YearsOfExperience.SENIOR
+    assert match_query_rules('리드 개발자')['years'] == YearsOfExperience.SENIOR
+
+
+def test_extract_uses_rules_before_llm():
+    llm = CountingLLM(responses=['{"job_category": "ai", "years": "3-7", "language": "java"}'])
+    extractor = QueryInfoExtractor(llm=llm)
+
+    # 규칙으로 모든 필드를 찾으면 LLM을 호출하지 않는다
+    assert extractor.extract('Kotlin 쓰는 시니어 백엔드 개발자')['language'] == ProgrammingLanguage.KOTLIN
+    assert llm.calls == 0
+
+    # 규칙이 찾은 필드는 유지하고, 비어 있는 필드만 LLM 결과로 채운다
+    result = extractor.extract('파이썬 백엔드')
+    assert result['job_category'] == JobCategory.BACKEND
+    assert result['language'] == ProgrammingLanguage.PYTHON
+    assert result['years'] == YearsOfExperience.MIDLEVEL
+    assert llm.calls == 1
+
+
+def test_extract_does_not_cache_llm_failure():
+    llm = CountingLLM(responses=['not json', '{"job_category": "ai", "years": null, "language": null}'])
+    extractor = QueryInfoExtractor(llm=llm)
+
+    assert extractor.extract('추천 시스템을 만들어 본 사람')['job_category'] is None
+    assert extractor.extract('추천 시스템을 만들어 본 사람')['job_category'] == JobCategory.AI
+    assert llm.calls == 2
+
+
+def test_extract_calls_llm_once_and_caches():
+    llm = CountingLLM(responses=['{"job_category": "ai", "years": null, "language": null, "applicant_name": null}'])
+    extractor = QueryInfoExtractor(llm=llm)
+
+    first = extractor.extract('추천 시스템을 만들어 본 사람')
+    second = extractor.extract('  추천 시스템을 만들어 본 사람! ')
+
+    assert first['job_category'] == JobCategory.AI
+    assert second == first
+    assert llm.calls == 1
@@ -0,0 +1,100 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from llm.result_filter import RerankFilter, SearchResult
+
+
+class LengthModel:
+    '''문서 길이를 점수로 쓰는 Cross-Encoder 대용'''
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, pairs, batch_size=32):
+        self.calls.append(len(pairs))
+        return [float(len(content)) for _, content in pairs]
+
+
+def make_results():
+    return [
+        SearchResult(metadata={'resume_id': str(i)}, content='x' * i)
+        for i in range(1, 6)
+    ]
+
+
+def test_rerank_orders_by_score_and_caches():
+    model = LengthModel()
+    reranker = RerankFilter(model=model)
+
+    first = reranker.filter(make_results(), query='백엔드', top_k=2)
+    second = reranker.filter(make_results(), query='백엔드', top_k=2)
+
+    assert [r.metadata['resume_id'] for r in first] == ['5', '4']
+    assert [r.metadata['resume_id'] for r in second] == ['5', '4']
+    assert model.calls == [5]  # 두 번째 요청은 캐시에서 점수 사용
+    reranker.close()
+
+
+def test_rerank_batches_concurrent_requests():
+    model = LengthModel()
+    reranker = RerankFilter(model=model, max_batch_size=100, max_wait_ms=200)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        queries = [f'query-{i}' for i in range(4)]
+        list(executor.map(lambda q: reranker.filter(make_results(), query=q), queries))
+
+    assert sum(model.calls) == 20
+    assert len(model.calls) < 4
+    reranker.close()
+
+
+def test_rerank_batcher_fails_fast_after_close():
+    from llm.rerank_service import RerankBatcher
+
+    batcher = RerankBatcher(LengthModel())
+    assert batcher.score([('q', 'abc')]) == [3.0]
+    batcher.close()
+
+    with pytest.raises(RuntimeError):
+        batcher.score([('q', 'abc')])
+
+
+class WorkerKilled(BaseException):
+    pass
+
+
+class BlockingModel:
+    '''첫 호출은 release될 때까지 멈추고, 두 번째 호출에서 워커 스레드를 종료시키는 모델'''
+    def __init__(self):
+        self.release = threading.Event()
+        self.calls = 0
+
+    def predict(self, pairs, batch_size=32):
+        self.calls += 1
+        if self.calls == 1:
+            self.release.wait()
+            return [0.0] * len(pairs)
+        raise WorkerKilled()
+
+
+@pytest.mark.filterwarnings('ignore::pytest.PytestUnhandledThreadExceptionWarning')
+def test_rerank_batcher_times_out_and_fails_after_worker_dies():
+    from llm.rerank_service import RerankBatcher
+
+    model = BlockingModel()
+    batcher = RerankBatcher(model, max_wait_ms=0, timeout=0.2)
+    # 워커가 첫 배치에 묶여 있어도 요청은 무한히 기다리지 않는다
+    with pytest.raises(TimeoutError):
+        batcher.score([('q', 'a')])
+    with pytest.raises(TimeoutError):
+        batcher.score([('q', 'b')])
+    model.release.set()
+
+    # 취소된 요청은 건너뛰고, 워커가 죽으면 처리 중이던 요청과 이후 요청 모두 바로 실패한다
+    with pytest.raises(RuntimeError):
+        batcher.score([('q', 'c')])
+    batcher._worker.join(timeout=1)
+    assert model.calls == 2
+    with pytest.raises(RuntimeError):
+        batcher.score([('q', 'd')])
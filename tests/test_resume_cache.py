@@ -0,0 +1,41 @@
+from llm.resume_cache import ResumeResultCache
+from schemas.enums import JobCategory, YearsOfExperience, ProgrammingLanguage
+from schemas.response import ResumeInfoResponse
+
+
+RESUME_INFO = ResumeInfoResponse(
+    resume_id='1',
+    applicant_name='김시험',
+    job_category=JobCategory.BACKEND,
+    years=YearsOfExperience.JUNIOR,
+    language=ProgrammingLanguage.PYTHON,
+)
+
+
+def test_resume_cache_hit_and_miss(tmp_path):
+    cache = ResumeResultCache(db_path=str(tmp_path / 'cache.sqlite3'))
+    content_hash = cache.content_hash(b'%PDF-1.4 resume')
+
+    assert cache.get(content_hash) is None
+    cache.put(content_hash, '경력: 백엔드 3년', RESUME_INFO, [0.1, 0.2, 0.3])
+    cached = cache.get(content_hash)
+
+    assert cached.summary == '경력: 백엔드 3년'
+    assert cached.resume_info == RESUME_INFO
+    assert cached.embedding == [0.1, 0.2, 0.3]
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+
+
+def test_resume_cache_evicts_least_recently_used(tmp_path):
+    cache = ResumeResultCache(db_path=str(tmp_path / 'cache.sqlite3'), max_size_bytes=2000)
+    embedding = [0.0] * 100  # 항목당 약 1KB
+
+    cache.put('a', 'a', RESUME_INFO, embedding)
+    cache.put('b', 'b', RESUME_INFO, embedding)
+    cache.get('a')  # a를 최근 사용으로 갱신
+    cache.put('c', 'c', RESUME_INFO, embedding)
+
+    assert cache.get('a') is not None
+    assert cache.get('b') is None
+    assert cache.get('c') is not None
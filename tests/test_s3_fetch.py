@@ -0,0 +1,100 @@
+import pytest
+
+moto = pytest.importorskip('moto')
+import boto3
+
+from preprocess.load_pdf import InvalidPDFError, PDFLoader
+from preprocess.s3_fetch import S3PDFFetcher
+
+
+@pytest.fixture
+def s3_client(monkeypatch):
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'testing')
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'testing')
+    with moto.mock_aws():
+        client = boto3.client('s3', region_name='us-east-1')
+        client.create_bucket(Bucket='resumes')
+        yield client
+
+
+def test_s3_fetcher_reuses_cache_until_etag_changes(tmp_path, s3_client):
+    with open('test.pdf', 'rb') as file:
+        pdf_bytes = file.read()
+    s3_client.put_object(Bucket='resumes', Key='a.pdf', Body=pdf_bytes)
+
+    fetcher = S3PDFFetcher(bucket='resumes', cache_dir=str(tmp_path), client=s3_client,
+                           chunk_size=1024, revalidate_after=0)
+    path = fetcher.fetch('a.pdf')
+    assert open(path, 'rb').read() == pdf_bytes
+    assert fetcher.fetch('a.pdf') == path
+    assert fetcher.stats()['hits'] == 1
+
+    # 객체가 바뀌면 ETag가 달라져 다시 받고 이전 파일은 지운다
+    s3_client.put_object(Bucket='resumes', Key='a.pdf', Body=pdf_bytes + b'\n')
+    new_path = fetcher.fetch('a.pdf')
+    assert new_path != path
+    assert open(new_path, 'rb').read() == pdf_bytes + b'\n'
+    assert fetcher.stats()['entries'] == 1
+
+
+def test_s3_prefetch_and_loader(tmp_path, s3_client):
+    with open('test.pdf', 'rb') as file:
+        pdf_bytes = file.read()
+    for key in ['a.pdf', 'b.pdf']:
+        s3_client.put_object(Bucket='resumes', Key=key, Body=pdf_bytes)
+
+    fetcher = S3PDFFetcher(bucket='resumes', cache_dir=str(tmp_path), client=s3_client, max_cache_bytes=len(pdf_bytes))
+    failed = fetcher.prefetch(['a.pdf', 'b.pdf', 'missing.pdf'])
+    assert list(failed) == ['missing.pdf']
+    # 용량 한도가 파일 하나 크기라서 오래된 항목은 밀려나고 하나만 남는다
+    assert fetcher.stats()['entries'] == 1
+
+    loader = PDFLoader(storage_type='s3', s3_fetcher=fetcher)
+    with loader.open_pdf('b.pdf') as pdf_data:
+        assert pdf_data[:] == pdf_bytes
+
+    with pytest.raises(InvalidPDFError):
+        with PDFLoader(storage_type='s3', max_bytes=10, s3_fetcher=fetcher).open_pdf('a.pdf'):
+            pass
+
+
+def test_s3_prefetch_keeps_pinned_batch_larger_than_cache(tmp_path, s3_client):
+    with open('test.pdf', 'rb') as file:
+        pdf_bytes = file.read()
+    keys = ['a.pdf', 'b.pdf', 'c.pdf']
+    for key in keys:
+        s3_client.put_object(Bucket='resumes', Key=key, Body=pdf_bytes)
+
+    fetcher = S3PDFFetcher(bucket='resumes', cache_dir=str(tmp_path), client=s3_client, max_cache_bytes=len(pdf_bytes))
+    with fetcher.pinned(keys):
+        assert fetcher.prefetch(keys) == {}
+        # 적재가 끝날 때까지는 한도를 넘어도 방금 받은 파일을 지우지 않는다
+        assert fetcher.stats()['entries'] == 3
+        assert all(open(fetcher.fetch(key), 'rb').read() == pdf_bytes for key in keys)
+    assert fetcher.stats()['entries'] == 1
+    assert len(list(tmp_path.glob('*.pdf'))) == 1
+
+
+def test_s3_pins_are_shared_across_fetchers_on_same_cache(tmp_path, s3_client):
+    with open('test.pdf', 'rb') as file:
+        pdf_bytes = file.read()
+    keys = ['a.pdf', 'b.pdf', 'c.pdf']
+    for key in keys:
+        s3_client.put_object(Bucket='resumes', Key=key, Body=pdf_bytes)
+
+    # 같은 cache_dir을 쓰는 다른 프로세스의 fetcher가 고정된 파일을 지우면 안 된다
+    ingest = S3PDFFetcher(bucket='resumes', cache_dir=str(tmp_path), client=s3_client, max_cache_bytes=len(pdf_bytes))
+    other = S3PDFFetcher(bucket='resumes', cache_dir=str(tmp_path), client=s3_client, max_cache_bytes=len(pdf_bytes))
+    with ingest.pinned(['a.pdf', 'b.pdf']):
+        assert ingest.prefetch(['a.pdf', 'b.pdf']) == {}
+        paths = [ingest.fetch(key) for key in ['a.pdf', 'b.pdf']]
+        other.fetch('c.pdf')
+        assert all(open(path, 'rb').read() == pdf_bytes for path in paths)
+    assert ingest.stats()['entries'] == 1
+
+    # 고정한 프로세스가 해제하지 못하고 죽어도 pin_ttl이 지나면 다시 삭제 대상이 된다
+    stale = S3PDFFetcher(bucket='resumes', cache_dir=str(tmp_path), client=s3_client,
+                         max_cache_bytes=len(pdf_bytes), pin_ttl=-1)
+    with stale.pinned(keys):
+        stale.prefetch(keys)
+        assert stale.stats()['entries'] == 1
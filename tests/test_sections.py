@@ -0,0 +1,43 @@
+from preprocess.sections import SectionSegmenter, heading_of
+
+
+RESUME = '''김시험
+010-1234-5678
+■ 학력
+시험대학교 컴퓨터공학과 (2015 ~ 2021)
+경력 (총 3년)
+시험회사 백엔드 개발 2021.03 ~ 현재
+결제 서비스 API 개발 및 운영
+[자격증]
+정보처리기사
+프로젝트
+사내 추천 시스템 개발
+경력
+이전회사 인턴 2020.07 ~ 2020.12
+자기소개서
+사용자 문제를 해결하는 개발자입니다.'''
+
+
+def test_heading_of_normalizes_decorations():
+    assert heading_of('■ 학력') == '학력'
+    assert heading_of('경력 (총 1 년 5 개월)') == '경력'
+    assert heading_of('ACTIVITIES / PROJECT') == '기타'
+    assert heading_of('EDUCATION') == '학력'
+    assert heading_of('경력기술서 _ 김시험.pdf') is None
+    assert heading_of('결제 서비스 경력 3년을 쌓았습니다') is None
+
+
+def test_segmenter_splits_well_formed_resume():
+    result = SectionSegmenter().segment(RESUME)
+
+    assert result.confident
+    assert result.headings == 6
+    assert result.sections['경력'] == '시험회사 백엔드 개발 2021.03 ~ 현재\n결제 서비스 API 개발 및 운영\n이전회사 인턴 2020.07 ~ 2020.12'
+    assert result.text.startswith('인적사항:\n김시험\n010-1234-5678\n\n학력:\n시험대학교')
+    assert result.text.index('경력:') < result.text.index('자격증:') < result.text.index('자기소개서:')
+
+
+def test_segmenter_is_not_confident_without_headings():
+    result = SectionSegmenter().segment('김시험\n백엔드 개발자\n결제 서비스를 만들었습니다.\n학력\n시험대학교')
+    assert not result.confident
+    assert result.confidence < 0.75
@@ -0,0 +1,78 @@
+import csv
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+
+from llm.log_callback_handler import LogCallbackHandler
+from llm.telemetry import CsvSink, TelemetryPipeline
+
+
+class ListSink:
+    def __init__(self):
+        self.batches = []
+
+    def write(self, records):
+        self.batches.append(records)
+
+
+def test_pipeline_writes_records_in_batches():
+    sink = ListSink()
+    pipeline = TelemetryPipeline([sink], batch_size=3, flush_interval=60)
+
+    for i in range(5):
+        pipeline.emit({'i': i})
+    pipeline.flush()
+
+    assert [len(batch) for batch in sink.batches] == [3, 2]
+    pipeline.close()
+
+
+def test_close_writes_queued_records_and_stops_worker():
+    sink = ListSink()
+    pipeline = TelemetryPipeline([sink], batch_size=100, flush_interval=60)
+
+    for i in range(5):
+        pipeline.emit({'i': i})
+    pipeline.close()
+    pipeline.emit({'i': 5})
+
+    assert [record['i'] for batch in sink.batches for record in batch] == [0, 1, 2, 3, 4]
+    assert not pipeline._worker.is_alive()
+    assert pipeline.dropped == 1
+
+
+def test_csv_sink_writes_header_once(tmp_path):
+    file_path = tmp_path / 'qna_log.csv'
+    sink = CsvSink(str(file_path))
+    sink.write([{'이름': 'a', '답변': '1'}])
+    sink.write([{'이름': 'b', '답변': '2'}, {'이름': 'c', '답변': '3'}])
+
+    with open(file_path, encoding='utf-8') as file:
+        rows = list(csv.reader(file))
+    assert rows == [['이름', '답변'], ['a', '1'], ['b', '2'], ['c', '3']]
+
+
+def test_log_callback_handler_emits_to_pipeline():
+    sink = ListSink()
+    pipeline = TelemetryPipeline([sink], flush_interval=60)
+    handler = LogCallbackHandler('section resume', telemetry=pipeline)
+
+    message = AIMessage(
+        content='요약',
+        response_metadata={'model_name': 'gpt-4o-mini-2024-07-18'},
+        usage_metadata={
+            'input_tokens': 100,
+            'output_tokens': 10,
+            'total_tokens': 110,
+            'input_token_details': {'cache_read': 0},
+        },
+    )
+    handler.on_chat_model_start({}, [[HumanMessage(content='이력서')]])
+    handler.on_llm_end(LLMResult(generations=[[ChatGeneration(message=message)]]))
+    pipeline.flush()
+
+    record = sink.batches[0][0]
+    assert record['이름'] == 'section resume'
+    assert record['입력토큰'] == 100
+    assert record['버전'] == '0.1.0'
+    pipeline.close()
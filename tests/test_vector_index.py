@@ -0,0 +1,55 @@
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from llm.vector_index import MemmapVectorIndex
+from llm.vector_store import VectorStoreManager
+from schemas.enums import JobCategory, YearsOfExperience, ProgrammingLanguage
+
+
+def make_doc(i, job_category='backend', language='python'):
+    return Document(
+        page_content=f'이력서 {i}',
+        metadata={'resume_id': f'r{i}', 'job_category': job_category, 'years': '0-3', 'language': language},
+    )
+
+
+def test_memmap_index_exact_top_k_with_filters(tmp_path):
+    index = MemmapVectorIndex(str(tmp_path), initial_capacity=2)
+    vectors = np.eye(4, dtype=np.float32)
+    index.add(['a', 'b'], vectors[:2], [make_doc(0), make_doc(1, language='kotlin')])
+    # 용량을 넘겨 새 generation 파일로 옮겨 가도 기존 행이 유지된다
+    index.add(['c', 'd'], vectors[2:], [make_doc(2, 'ai'), make_doc(3, 'ai', 'kotlin')])
+
+    assert index.count() == 4
+    assert [doc.id for doc in index.search(vectors[1], k=1)] == ['b']
+    assert [doc.id for doc in index.search(vectors[1], k=2, filter_metadata={'job_category': 'ai'})][0] in {'c', 'd'}
+    assert [doc.id for doc in index.search(
+        vectors[0], k=5, filter_metadata={'job_category': 'ai', 'language': 'kotlin'}
+    )] == ['d']
+    assert index.search(vectors[0], k=5, filter_metadata={'job_category': 'frontend'}) == []
+    assert [doc.id for doc in index.get({'resume_id': 'r2'})] == ['c']
+
+    # 다른 워커 프로세스처럼 같은 디렉터리를 새로 열면 같은 데이터를 본다
+    other = MemmapVectorIndex(str(tmp_path))
+    assert other.count() == 4
+    index.add(['e'], vectors[:1], [make_doc(4)])
+    assert other.count() == 5
+    assert other.get({'resume_id': 'r4'})[0].id == 'e'
+
+
+def test_vector_store_manager_memmap_backend(tmp_path):
+    embeddings = DeterministicFakeEmbedding(size=8)
+    manager = VectorStoreManager(embeddings=embeddings, persist_directory=str(tmp_path), backend='memmap')
+    manager.add_resume(
+        content='Python 백엔드 개발 3년 경력',
+        resume_id='r1',
+        applicant_name='김시험',
+        job_category=JobCategory.BACKEND,
+        years=YearsOfExperience.JUNIOR,
+        language=ProgrammingLanguage.PYTHON,
+    )
+
+    results = manager.search_resumes('Python 백엔드 개발 3년 경력', k=1, mode='dense')
+    assert results[0].metadata['resume_id'] == 'r1'
+    assert manager.get_resume_info('r1')['documents'] == ['Python 백엔드 개발 3년 경력']
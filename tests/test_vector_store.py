@@ -5,9 +5,14 @@ from schemas.enums import JobCategory, YearsOfExperience
 
 
 
-def test_vector_store_embedding():
-    vector_store_manager = VectorStoreManager()
-    vector_store_manager.create_resume_document(
+def test_vector_store_embedding(tmp_path):
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+    from schemas.enums import ProgrammingLanguage
+
+    vector_store_manager = VectorStoreManager(
+        embeddings=DeterministicFakeEmbedding(size=8), persist_directory=str(tmp_path)
+    )
+    document = vector_store_manager.create_resume_document(
         content="""
         이력서 내용
         - Python 백엔드 개발 3년 경력
@@ -17,7 +22,165 @@ def test_vector_store_embedding():
         resume_id='123e4567-e89b-12d3-a456-426614174000',
         applicant_name='김시험',
         job_category=JobCategory.BACKEND,
-        years=YearsOfExperience.JUNIOR
+        years=YearsOfExperience.JUNIOR,
+        language=ProgrammingLanguage.PYTHON,
     )
 
-    
+    assert 'Python 백엔드 개발' in document.page_content
+    assert document.metadata == {
+        'resume_id': '123e4567-e89b-12d3-a456-426614174000',
+        'applicant_name': '김시험',
+        'job_category': 'backend',
+        'years': '0-3',
+        'language': 'python',
+    }
+
+
+def test_add_resume_async_with_precomputed_embedding(tmp_path):
+    import asyncio
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+    from schemas.enums import ProgrammingLanguage
+
+    embeddings = DeterministicFakeEmbedding(size=8)
+    vector_store_manager = VectorStoreManager(embeddings=embeddings, persist_directory=str(tmp_path))
+
+    asyncio.run(vector_store_manager.add_resume_async(
+        content="Python 백엔드 개발 3년 경력",
+        resume_id='123e4567-e89b-12d3-a456-426614174000',
+        applicant_name='김시험',
+        job_category=JobCategory.BACKEND,
+        years=YearsOfExperience.JUNIOR,
+        language=ProgrammingLanguage.PYTHON,
+        embedding=embeddings.embed_query("Python 백엔드 개발 3년 경력"),
+    ))
+
+    results = vector_store_manager.search_resumes("Python 백엔드 개발 3년 경력", k=1)
+    assert results[0].metadata['resume_id'] == '123e4567-e89b-12d3-a456-426614174000'
+
+
+def test_chunked_index_returns_one_best_chunk_per_resume(tmp_path):
+    from langchain_core.documents import Document
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+    from llm.vector_store import aggregate_by_resume
+
+    docs = [Document(id=str(i), page_content=str(i), metadata={'resume_id': resume_id})
+            for i, resume_id in enumerate(['a', 'b', 'b', 'b', 'c'])]
+    assert [doc.page_content for doc in aggregate_by_resume(docs, k=3)] == ['0', '1', '4']
+    # 여러 청크가 맞는 이력서는 합산 방식에서 앞선다
+    assert [doc.metadata['resume_id'] for doc in aggregate_by_resume(docs, k=1, method='sum_top_n')] == ['b']
+
+    manager = VectorStoreManager(
+        embeddings=DeterministicFakeEmbedding(size=8),
+        persist_directory=str(tmp_path),
+        index_granularity='chunk',
+        chunk_size=40,
+        chunk_overlap=0,
+    )
+    manager.add_resumes([
+        {
+            'content': ['Kafka 스트림 처리 경험', 'Spring Boot 서버 개발', 'Kafka 컨슈머 튜닝'],
+            'resume_id': 'r1',
+            'applicant_name': '김백엔드',
+            'job_category': 'backend',
+            'years': '3-7',
+            'language': 'java',
+        },
+        {
+            'content': 'React 대시보드 개발\n\n' + 'TypeScript 마이그레이션 경험 ' * 3,
+            'resume_id': 'r2',
+            'applicant_name': '이프론트',
+            'job_category': 'frontend',
+            'years': '0-3',
+            'language': 'typescript',
+        },
+    ])
+
+    assert manager.count() > 2
+    results = manager.search_resumes('Kafka', k=5, mode='lexical')
+    assert [doc.metadata['resume_id'] for doc in results] == ['r1']
+    results = manager.search_resumes('경험', k=5, mode='dense')
+    assert sorted(doc.metadata['resume_id'] for doc in results) == ['r1', 'r2']
+    assert manager.get_resume_info('r1')['documents'] == [
+        'Kafka 스트림 처리 경험', 'Spring Boot 서버 개발', 'Kafka 컨슈머 튜닝'
+    ]
+
+
+@pytest.mark.parametrize('backend', ['chroma', 'memmap'])
+def test_upsert_and_delete_resume(tmp_path, backend):
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+    from schemas.enums import ProgrammingLanguage
+
+    class CountingEmbedding(DeterministicFakeEmbedding):
+        document_calls: int = 0
+
+        def embed_documents(self, texts):
+            self.document_calls += 1
+            return super().embed_documents(texts)
+
+    embeddings = CountingEmbedding(size=8)
+    manager = VectorStoreManager(embeddings=embeddings, persist_directory=str(tmp_path), backend=backend)
+    resume = dict(
+        resume_id='r1',
+        applicant_name='김시험',
+        job_category=JobCategory.BACKEND,
+        years=YearsOfExperience.JUNIOR,
+        language=ProgrammingLanguage.PYTHON,
+    )
+
+    assert manager.upsert_resume('Python 백엔드 개발', **resume) == 'inserted'
+    assert manager.upsert_resume('Python 백엔드 개발', **resume) == 'unchanged'
+    assert embeddings.document_calls == 1
+
+    assert manager.upsert_resume('Python 백엔드 개발 및 Kafka 운영', **resume) == 'updated'
+    assert manager.count() == 1
+    assert manager.get_resume_info('r1')['documents'] == ['Python 백엔드 개발 및 Kafka 운영']
+    assert [doc.metadata['resume_id'] for doc in manager.search_resumes('Kafka', k=5, mode='lexical')] == ['r1']
+
+    assert manager.delete_resume('r1') == 1
+    assert manager.count() == 0
+    assert manager.search_resumes('Kafka', k=5, mode='lexical') == []
+    assert manager.search_resumes('Python', k=5, mode='dense', filter_metadata={'job_category': 'backend'}) == []
+
+
+@pytest.mark.parametrize('backend', ['chroma', 'memmap'])
+def test_other_worker_sees_upsert_with_same_count(tmp_path, backend):
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+    from schemas.enums import ProgrammingLanguage
+
+    def make_manager():
+        return VectorStoreManager(embeddings=DeterministicFakeEmbedding(size=8), persist_directory=str(tmp_path),
+                                  backend=backend, lexical_sync_interval=0)
+
+    writer, reader = make_manager(), make_manager()
+    resume = dict(resume_id='r1', applicant_name='김시험', job_category=JobCategory.BACKEND,
+                  years=YearsOfExperience.JUNIOR, language=ProgrammingLanguage.PYTHON)
+
+    writer.upsert_resume('Kafka 운영 경험', **resume)
+    assert [doc.metadata['resume_id'] for doc in reader.search_resumes('Kafka', k=5, mode='lexical')] == ['r1']
+
+    # 문서 수는 그대로인 갱신(upsert)과 삭제 후 재추가
+    writer.upsert_resume('Python 백엔드 개발', **resume)
+    assert reader.count() == 1
+    assert reader.search_resumes('Kafka', k=5, mode='lexical') == []
+    assert [doc.metadata['resume_id'] for doc in reader.search_resumes('Python', k=5, mode='lexical')] == ['r1']
+
+    writer.delete_resume('r1')
+    writer.upsert_resume('Spring 서버 개발', **resume)
+    results = reader.search_resumes('서버', k=5, mode='dense', filter_metadata={'job_category': 'backend'})
+    assert reader.last_search_plan['strategy'] == 'exact'
+    assert [doc.page_content for doc in results] == ['Spring 서버 개발']
+
+
+@pytest.mark.parametrize('backend', ['chroma', 'memmap'])
+def test_add_resumes_keeps_last_duplicate_in_batch(tmp_path, backend):
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+    from schemas.enums import ProgrammingLanguage
+
+    manager = VectorStoreManager(embeddings=DeterministicFakeEmbedding(size=8), persist_directory=str(tmp_path),
+                                 backend=backend)
+    resume = dict(resume_id='r1', applicant_name='김시험', job_category=JobCategory.BACKEND,
+                  years=YearsOfExperience.JUNIOR, language=ProgrammingLanguage.PYTHON)
+
+    manager.add_resumes([{**resume, 'content': 'Kafka 운영 경험'}, {**resume, 'content': 'Python 백엔드 개발'}])
+    assert manager.count() == 1
+    assert manager.get_resume_info('r1')['documents'] == ['Python 백엔드 개발']